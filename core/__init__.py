@@ -17,6 +17,11 @@ from . import metadata
 MetadataParser          = metadata.MetadataParser 
 
 
+from . import layout
+# columnar layout storage
+LayoutStore             = layout.LayoutStore
+
+
 # Plugin Manager
 from . import plugins
 PluginManager           = plugins.PluginManager
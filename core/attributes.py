@@ -20,7 +20,7 @@ class Attribute(object):
         # stash argument passed to 'type' - overrides 
         # auto-type mechanism. * this will become data_type
         self._type             = kwargs.get('attr_type', None)
-        self._edges            = []
+        self._edges            = set()      # connected edge ids (src_id, dest_id)
 
         self.name              = name
         self.label             = kwargs.get('label', "") 
@@ -70,6 +70,12 @@ class Attribute(object):
                         print '# DEBUG: Attribute "%s" updating value: "%s": "%s" - "%s"' % (self.name, name, value, getattr(self, name))
                     setattr(self, name, value)
 
+        # connection flags changed, refresh the parent's connection lists
+        if self._dag is not None and ('connectable' in kwargs or 'connection_type' in kwargs):
+            dagnode = self.dagnode
+            if dagnode is not None and hasattr(dagnode, '_reindex_attrs'):
+                dagnode._reindex_attrs()
+
     @property
     def data(self):
         """
@@ -84,6 +90,8 @@ class Attribute(object):
                      'hidden', 'connectable', 'connection_type', 'locked', 'required', 'user']:
                 if hasattr(self, attr):
                     value = getattr(self, attr)
+                    if attr == '_edges':
+                        value = self.edge_strings()
                     if value or attr in self.REQUIRED:
                         #if value or attr in self.REQUIRED:
                         data[attr] = value
@@ -97,6 +105,44 @@ class Attribute(object):
         """
         return self._dag()
 
+    #- Edges ----
+    @property
+    def edges(self):
+        """
+        Returns the ids of edges connected to this attribute.
+
+        :returns: list of (src_id, dest_id) tuples.
+        :rtype: list
+        """
+        return sorted(self._edges)
+
+    def edge_strings(self):
+        """
+        Returns the connected edge ids formatted for writing.
+
+        :returns: list of "(src_id,dest_id)" strings.
+        :rtype: list
+        """
+        return ['(%s,%s)' % edge_id for edge_id in sorted(self._edges)]
+
+    def add_edge(self, src_id, dest_id):
+        """
+        Register a connected edge.
+
+        :param str src_id: source node id.
+        :param str dest_id: destination node id.
+        """
+        self._edges.add((src_id, dest_id))
+
+    def remove_edge(self, src_id, dest_id):
+        """
+        Unregister a connected edge.
+
+        :param str src_id: source node id.
+        :param str dest_id: destination node id.
+        """
+        self._edges.discard((src_id, dest_id))
+
     @property
     def attr_type(self):
         if self._type is not None:
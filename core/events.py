@@ -1,20 +1,536 @@
 #!/usr/bin/env python
+import weakref
+import threading
+import random
+import timeit
+import Queue
+import simplejson as json
+from collections import deque
+from collections import OrderedDict as dict
+from SceneGraph.core import log
+
+
+def merge_events(queue):
+    """
+    Coalesce queued event arguments into a single call. Positional
+    arguments are collected into one list (list arguments are
+    expanded, duplicates removed) and keyword arguments are 
+    merged, with the most recent value winning.
+
+    :param list queue: list of (args, kwargs) tuples.
+
+    :returns: merged (args, kwargs) tuple.
+    :rtype: tuple
+    """
+    items = []
+    seen = set()
+    kwargs = dict()
+    for qargs, qkwargs in queue:
+        for arg in qargs:
+            for item in (arg if isinstance(arg, list) else [arg]):
+                try:
+                    key = ('value', item)
+                    hash(key)
+                except TypeError:
+                    key = ('id', id(item))
+                if key in seen:
+                    continue
+                seen.add(key)
+                items.append(item)
+        kwargs.update(qkwargs)
+    args = (items,) if items else ()
+    return (args, kwargs)
+
+
+class WeakCallback(object):
+    """
+    Callback wrapper that references the instance of a bound method 
+    weakly, so that connecting to an event doesn't keep the listener 
+    alive. When the instance is deleted, the callback removes itself
+    from its parent handler. Functions are referenced normally.
+
+    :param callable callback: callback function or method.
+    :param EventHandler handler: parent handler.
+    """
+    def __init__(self, callback, handler=None):
+
+        self._handler = weakref.ref(handler) if handler is not None else None
+        self._obj     = None
+        self._func    = callback
+
+        if getattr(callback, 'im_self', None) is not None:
+            self._obj  = weakref.ref(callback.im_self, self._expired)
+            self._func = callback.im_func
+
+    def __call__(self, *args, **kwargs):
+        callback = self.resolve()
+        if callback is None:
+            return
+        return callback(*args, **kwargs)
+
+    def __eq__(self, other):
+        if isinstance(other, WeakCallback):
+            return self._func is other._func and self.instance is other.instance
+        if getattr(other, 'im_self', None) is not None:
+            return self._func is other.im_func and self.instance is other.im_self
+        return self._obj is None and self._func is other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((self._func, id(self.instance)))
+
+    @property
+    def instance(self):
+        """
+        Returns the bound method instance, or None if it was deleted.
+        """
+        if self._obj is None:
+            return
+        return self._obj()
+
+    @property
+    def alive(self):
+        return self._obj is None or self._obj() is not None
+
+    def resolve(self):
+        """
+        Returns the callable, or None if the instance was deleted.
+
+        :returns: callback function or method.
+        :rtype: callable
+        """
+        if self._obj is None:
+            return self._func
+        obj = self._obj()
+        if obj is None:
+            return
+        return self._func.__get__(obj, obj.__class__)
+
+    def _expired(self, ref):
+        handler = self._handler() if self._handler is not None else None
+        if handler is not None:
+            handler.discard(self)
+
+
+class AsyncDispatcher(object):
+    """
+    Delivers events to asynchronous callbacks on worker threads, so 
+    that slow listeners (publishing, validation, logging) don't stall 
+    the caller. Events from the same sender always go to the same
+    worker, which preserves their order.
+
+    Each worker has a bounded queue. When a queue is full, the caller
+    waits for space (up to timeout seconds), so a slow listener slows
+    the producer down rather than losing events. Events are only
+    dropped (and counted) if block is disabled or the timeout expires.
+    Callbacks posting events from a worker thread never wait, as the
+    worker would be waiting on itself.
+
+    :param int maxsize: maximum number of queued events per worker.
+    :param int workers: number of worker threads.
+    :param bool block: wait for queue space instead of dropping events.
+    :param float timeout: maximum time to wait when blocking (None waits indefinitely).
+    """
+    def __init__(self, maxsize=1024, workers=1, block=True, timeout=None):
+
+        self.maxsize    = maxsize
+        self.block      = block
+        self.timeout    = timeout
+        self.dropped    = 0
+
+        self._queues    = [Queue.Queue(maxsize) for i in range(max(int(workers), 1))]
+        self._threads   = []
+        self._lock      = threading.Lock()
+
+    def _start(self):
+        """
+        Start the worker threads.
+        """
+        with self._lock:
+            if self._threads:
+                return
+            for i, queue in enumerate(self._queues):
+                thread = threading.Thread(target=self._run, args=(queue,), name='SceneGraphEvents-%d' % i)
+                thread.daemon = True
+                thread.start()
+                self._threads.append(thread)
+
+    def post(self, sender, callback, args=(), kwargs=None):
+        """
+        Queue an event for a callback.
+
+        :param obj sender: event sender.
+        :param callable callback: callback function or method.
+        :param tuple args: event arguments.
+        :param dict kwargs: event keyword arguments.
+
+        :returns: event was queued.
+        :rtype: bool
+        """
+        if kwargs is None:
+            kwargs = dict()
+
+        if not self._threads:
+            self._start()
+
+        queue = self._queues[id(sender) % len(self._queues)]
+        block = self.block and threading.current_thread() not in self._threads
+        try:
+            queue.put((sender, callback, args, kwargs), block, self.timeout)
+        except Queue.Full:
+            with self._lock:
+                self.dropped += 1
+                dropped = self.dropped
+            if dropped == 1 or not dropped % 100:
+                log.warning('event queue is full, %d event(s) dropped.' % dropped)
+            return False
+        return True
+
+    def _run(self, queue):
+        while True:
+            item = queue.get()
+            try:
+                if item is None:
+                    return
+                sender, callback, args, kwargs = item
+                if isinstance(callback, WeakCallback):
+                    callback = callback.resolve()
+                if callback is not None:
+                    callback(sender, *args, **kwargs)
+            except Exception:
+                log.exception('asynchronous event callback failed.')
+            finally:
+                queue.task_done()
+
+    @property
+    def pending(self):
+        """
+        Returns the number of queued events.
+
+        :rtype: int
+        """
+        return sum(queue.qsize() for queue in self._queues)
+
+    def join(self):
+        """
+        Wait until all queued events have been delivered.
+        """
+        for queue in self._queues:
+            queue.join()
+
+    def shutdown(self, wait=True):
+        """
+        Stop the worker threads once the queued events are delivered.
+
+        :param bool wait: wait for the workers to finish.
+        """
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for queue in self._queues:
+            if threads:
+                queue.put(None)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+
+# shared dispatcher for asynchronous callbacks (see get_dispatcher)
+DISPATCHER = None
+
+
+def get_dispatcher():
+    """
+    Returns the default dispatcher for asynchronous callbacks.
+
+    :returns: event dispatcher.
+    :rtype: AsyncDispatcher
+    """
+    global DISPATCHER
+    if DISPATCHER is None:
+        DISPATCHER = AsyncDispatcher()
+    return DISPATCHER
+
+
+class EventStats(object):
+    """
+    Records callback timings for all event handlers. Every call is 
+    counted, durations are measured for a sample of calls (see 
+    sample_rate) and the most recent max_samples durations are kept 
+    per callback to compute percentiles.
+
+    Use :func:`enable_stats` to turn instrumentation on.
+
+    :param float sample_rate: fraction of calls to time (0-1).
+    :param int max_samples: number of durations to keep per callback.
+    """
+    def __init__(self, sample_rate=1.0, max_samples=1024):
+
+        self.sample_rate    = sample_rate
+        self.max_samples    = max_samples
+
+        self._data          = dict()
+        self._lock          = threading.Lock()
+        self._local         = threading.local()     # per-thread nesting depth
+
+    def call(self, handler, callback, sender, args, kwargs):
+        """
+        Run a callback and record its timing.
+
+        :param EventHandler handler: calling event handler.
+        :param callable callback: callback function or method.
+        :param obj sender: event sender.
+
+        :returns: callback result.
+        """
+        depth = getattr(self._local, 'depth', 0) + 1
+        self._local.depth = depth
+        elapsed = None
+        try:
+            if self.sample_rate >= 1.0 or random.random() < self.sample_rate:
+                start = timeit.default_timer()
+                result = callback(sender, *args, **kwargs)
+                elapsed = timeit.default_timer() - start
+            else:
+                result = callback(sender, *args, **kwargs)
+        finally:
+            self._local.depth = depth - 1
+            self.record('%s:%s' % (handler.name or 'event', callback_name(callback)), elapsed, depth)
+        return result
+
+    def record(self, key, elapsed, depth=1):
+        """
+        Add a callback call to the statistics.
+
+        :param str key: event/callback key.
+        :param float elapsed: duration in seconds (None if the call wasn't sampled).
+        :param int depth: callback nesting depth.
+        """
+        with self._lock:
+            data = self._data.get(key)
+            if data is None:
+                data = self._data[key] = dict(count=0, sampled=0, total=0.0, max=0.0, max_depth=0, 
+                                              samples=deque(maxlen=self.max_samples))
+            data['count'] += 1
+            data['max_depth'] = max(data['max_depth'], depth)
+            if elapsed is not None:
+                data['sampled'] += 1
+                data['total'] += elapsed
+                data['max'] = max(data['max'], elapsed)
+                data['samples'].append(elapsed)
+
+    def reset(self):
+        """
+        Clear the recorded statistics.
+        """
+        with self._lock:
+            self._data = dict()
+
+    def report(self):
+        """
+        Returns the statistics for each callback, slowest (total time) first.
+        Durations are in milliseconds.
+
+        :returns: dictionary of {event:callback : stats}
+        :rtype: dict
+        """
+        with self._lock:
+            items = [(k, dict(v, samples=sorted(v.get('samples')))) for k, v in self._data.items()]
+
+        result = dict()
+        for key, data in sorted(items, key=lambda x: x[1].get('total'), reverse=True):
+            samples = data.get('samples')
+            sampled = data.get('sampled')
+            result[key] = dict(count=data.get('count'),
+                               sampled=sampled,
+                               total=data.get('total') * 1000.0,
+                               mean=(data.get('total') / sampled * 1000.0) if sampled else 0.0,
+                               p50=percentile(samples, 0.5) * 1000.0,
+                               p99=percentile(samples, 0.99) * 1000.0,
+                               max=data.get('max') * 1000.0,
+                               max_depth=data.get('max_depth'))
+        return result
+
+    def dump(self, filename=None):
+        """
+        Returns the statistics as JSON, optionally writing them to disk.
+
+        :param str filename: output file.
+
+        :returns: JSON statistics.
+        :rtype: str
+        """
+        data = json.dumps(self.report(), indent=4)
+        if filename is not None:
+            fn = open(filename, 'w')
+            fn.write(data)
+            fn.close()
+        return data
+
+
+def callback_name(callback):
+    """
+    Returns a readable name for a callback.
+
+    :param callable callback: callback function or method.
+
+    :returns: callback name (ie: "SceneEventHandler.nodesAddedEvent").
+    :rtype: str
+    """
+    name = getattr(callback, '__name__', callback.__class__.__name__)
+    instance = getattr(callback, 'im_self', None)
+    if instance is not None:
+        return '%s.%s' % (instance.__class__.__name__, name)
+    return name
+
+
+def percentile(values, pct):
+    """
+    Returns the percentile of a sorted list of values.
+
+    :param list values: sorted values.
+    :param float pct: percentile (0-1).
+
+    :rtype: float
+    """
+    if not values:
+        return 0.0
+    return values[int(round(pct * (len(values) - 1)))]
+
+
+# callback statistics (None when disabled, see enable_stats)
+STATS = None
+
+
+def enable_stats(sample_rate=1.0, max_samples=1024):
+    """
+    Enable callback timing instrumentation.
+
+    :param float sample_rate: fraction of calls to time (0-1).
+    :param int max_samples: number of durations to keep per callback.
+
+    :returns: statistics object.
+    :rtype: EventStats
+    """
+    global STATS
+    if STATS is None:
+        STATS = EventStats(sample_rate=sample_rate, max_samples=max_samples)
+    else:
+        STATS.sample_rate = sample_rate
+    return STATS
+
+
+def disable_stats():
+    """
+    Disable callback timing instrumentation.
+    """
+    global STATS
+    STATS = None
+
+
+def get_stats():
+    """
+    Returns the current callback statistics, or None if disabled.
+
+    :rtype: EventStats
+    """
+    return STATS
+
+
+class EventBatch(object):
+    """
+    Batch shared by a group of event handlers (see :meth:`Graph.batch`). 
+    Handlers join the batch the first time they are triggered while it 
+    is active, so starting a batch doesn't touch every handler.
+    """
+    def __init__(self):
+
+        self.depth      = 0
+        self.handlers   = []
+        self._joined    = set()
+
+    @property
+    def active(self):
+        return self.depth > 0
+
+    def begin(self):
+        """
+        Start the batch. Batches can be nested, events are 
+        delivered when the outermost batch ends.
+        """
+        self.depth += 1
+
+    def join(self, handler):
+        """
+        Start queueing a handler's events until the batch ends.
+
+        :param EventHandler handler: event handler.
+        """
+        if handler in self._joined:
+            return
+        self._joined.add(handler)
+        self.handlers.append(handler)
+        handler.beginBatch()
+
+    def end(self):
+        """
+        End the batch and deliver the queued events of each handler, 
+        in the order they joined.
+
+        :returns: callback results.
+        :rtype: list
+        """
+        if self.depth:
+            self.depth -= 1
+        if self.depth:
+            return []
+
+        handlers, self.handlers, self._joined = self.handlers, [], set()
+        result = []
+        for handler in handlers:
+            result.extend(handler.endBatch())
+        return result
 
 
 class EventHandler(object):
+    """
+    Calls a list of callbacks when triggered. If weak is set, bound 
+    methods are referenced weakly (see :class:`WeakCallback`).
 
-    def __init__(self, sender):
+    :param obj sender: object passed as the first argument to callbacks.
+    :param str name: event name (used for instrumentation).
+    :param callable coalesce: function to merge queued events (see :func:`merge_events`).
+    :param bool weak: reference callbacks weakly by default.
+    :param AsyncDispatcher dispatcher: dispatcher for asynchronous callbacks (defaults to the shared dispatcher).
+    """
+    def __init__(self, sender, name=None, coalesce=merge_events, weak=False, dispatcher=None):
 
+        self.name = name
         self.callbacks = []
+        self.async_callbacks = []   # callbacks run on the dispatcher threads
+        self.dispatcher = dispatcher
         self.sender = sender
         self.blocked = False
+        self.coalesce = coalesce    # merges queued events while batching
+        self.weak = weak
+
+        self._batch_depth = 0
+        self._queue = []
+        self.group = None           # shared batch (see EventBatch)
 
     def __call__(self, *args, **kwargs):
         """
-        Runs all callbacks.
+        Runs all callbacks. If the handler is batching, the
+        event is queued until the batch ends.
         """
         if not self.blocked:
-            return [callback(self.sender, *args, **kwargs) for callback in self.callbacks]
+            if self.group is not None and self.group.active:
+                self.group.join(self)
+            if self._batch_depth:
+                self._queue.append((args, kwargs))
+                return []
+            return self._dispatch(args, kwargs)
         return []
 
     def __iadd__(self, callback):
@@ -34,7 +550,7 @@ class EventHandler(object):
         return self
 
     def __len__(self):
-        return len(self.callbacks)
+        return len(self.callbacks) + len(self.async_callbacks)
 
     def __getitem__(self, index):
         return self.callbacks[index]
@@ -53,16 +569,110 @@ class EventHandler(object):
         """
         self.blocked = block
 
-    def add(self, callback):
+    @property
+    def batching(self):
+        return self._batch_depth > 0
+
+    def beginBatch(self):
+        """
+        Start queueing events. Batches can be nested, events
+        are delivered when the outermost batch ends.
+        """
+        self._batch_depth += 1
+
+    def endBatch(self):
+        """
+        End the current batch and deliver any queued events.
+
+        :returns: callback results.
+        :rtype: list
+        """
+        if self._batch_depth:
+            self._batch_depth -= 1
+        if self._batch_depth:
+            return []
+        return self.flush()
+
+    def flush(self):
+        """
+        Deliver queued events. Events are merged with the 
+        coalesce function (if any), which may return None to
+        drop them.
+
+        :returns: callback results.
+        :rtype: list
+        """
+        queue, self._queue = self._queue, []
+        if not queue:
+            return []
+
+        if self.coalesce is not None:
+            merged = self.coalesce(queue)
+            queue = [merged] if merged is not None else []
+
+        result = []
+        for args, kwargs in queue:
+            result.extend(self._dispatch(args, kwargs))
+        return result
+
+    def _dispatch(self, args, kwargs):
+        """
+        Queue the event for asynchronous callbacks, then run the 
+        synchronous callbacks.
+
+        :returns: synchronous callback results.
+        :rtype: list
+        """
+        if self.async_callbacks:
+            dispatcher = self.dispatcher or get_dispatcher()
+            for callback in list(self.async_callbacks):
+                dispatcher.post(self.sender, callback, args, kwargs)
+
+        stats = STATS
+        if stats is None:
+            return [callback(self.sender, *args, **kwargs) for callback in self._resolved()]
+        return [stats.call(self, callback, self.sender, args, kwargs) for callback in self._resolved()]
+
+    def _resolved(self):
+        """
+        Returns the current callbacks, skipping weak callbacks
+        whose instance has been deleted.
+
+        :returns: list of callables.
+        :rtype: list
+        """
+        result = []
+        for callback in list(self.callbacks):
+            if isinstance(callback, WeakCallback):
+                callback = callback.resolve()
+                if callback is None:
+                    continue
+            result.append(callback)
+        return result
+
+    def add(self, callback, weak=None, asynchronous=False):
         """
         Add a callback. Raises error if callback is not
-        callable.
+        callable. Asynchronous callbacks are run on a worker thread 
+        (see :class:`AsyncDispatcher`) and don't return results.
 
         :param callable callback: callback function or method.
+        :param bool weak: reference the callback weakly (defaults to the handler setting).
+        :param bool asynchronous: run the callback off the calling thread.
         """
         if not callable(callback):
             raise TypeError("callback must be callable")
-        self.callbacks.append(callback)
+
+        if weak is None:
+            weak = self.weak
+
+        if weak and not isinstance(callback, WeakCallback):
+            callback = WeakCallback(callback, handler=self)
+
+        if asynchronous:
+            self.async_callbacks.append(callback)
+        else:
+            self.callbacks.append(callback)
 
     def remove(self, callback):
         """
@@ -70,5 +680,18 @@ class EventHandler(object):
 
         :param callable callback: callback function or method.
         """
-        self.callbacks.remove(callback)
+        if callback in self.async_callbacks:
+            self.async_callbacks.remove(callback)
+        else:
+            self.callbacks.remove(callback)
+
+    def discard(self, callback):
+        """
+        Remove a callback if it is connected.
+
+        :param callable callback: callback function or method.
+        """
+        for callbacks in [self.callbacks, self.async_callbacks]:
+            if callback in callbacks:
+                callbacks.remove(callback)
 
@@ -2,14 +2,16 @@
 import os
 import re
 import weakref
+import tempfile
 import simplejson as json
-import networkx as nx
-import networkx.readwrite.json_graph as nxj
 from functools import partial
+from contextlib import contextmanager
 import inspect
 from collections import OrderedDict as dict
 from SceneGraph import options
-from SceneGraph.core import log, PluginManager, Attribute, EventHandler
+from SceneGraph.core import log, PluginManager, Attribute, EventHandler, LayoutStore
+from SceneGraph.core import events
+from SceneGraph.core.events import merge_events
 from SceneGraph.core import nodes
 from SceneGraph import util
 
@@ -23,21 +25,24 @@ class Graph(object):
 
         default_width                      = kwargs.pop('width', 150.0)
         default_height                     = kwargs.pop('height', 150.0)
+        use_layout_store                   = kwargs.pop('layout_store', True)
 
         # events
-        self.nodesAdded                    = EventHandler(self)
-        self.edgesAdded                    = EventHandler(self)
-        self.graphUpdated                  = EventHandler(self)
+        self.nodesAdded                    = EventHandler(self, name='nodesAdded', coalesce=self._coalesceNodesAdded, weak=True)
+        self.edgesAdded                    = EventHandler(self, name='edgesAdded', coalesce=self._coalesceEdgesAdded, weak=True)
+        self.graphUpdated                  = EventHandler(self, name='graphUpdated', weak=True)
 
         # events - TESTING
-        self.graphAboutToBeSaved           = EventHandler(self)
-        self.graphSaved                    = EventHandler(self)
-        self.graphAboutToBeRead            = EventHandler(self)
-        self.graphRead                     = EventHandler(self)
+        self.graphAboutToBeSaved           = EventHandler(self, name='graphAboutToBeSaved', weak=True)
+        self.graphSaved                    = EventHandler(self, name='graphSaved', weak=True)
+        self.graphAboutToBeRead            = EventHandler(self, name='graphAboutToBeRead', weak=True)
+        self.graphRead                     = EventHandler(self, name='graphRead', weak=True)
 
-        self.graphRefreshed                = EventHandler(self)
+        self.graphRefreshed                = EventHandler(self, name='graphRefreshed', weak=True)
 
 
+        import networkx as nx
+
         #self.network                      = nx.DiGraph()
         self.network                       = nx.MultiDiGraph() # mutliple edges between nodes
         
@@ -50,7 +55,20 @@ class Graph(object):
         # attributes for current nodes/dynamically loaded nodes
         self._node_types                   = dict() 
         self.dagnodes                      = dict()
-        self.autosave_path                 = os.path.join(os.getenv('TMPDIR'), 'sg_autosave.json') 
+        self._batch_depth                  = 0          # see Graph.batch
+        self._node_batch                   = events.EventBatch()    # node events queued in the current batch
+        self._edge_attrs                   = dict()     # edge id -> (src attribute, dest attribute)
+
+        # columnar storage for node layout attributes (optional, requires numpy)
+        self.layout                        = None
+        if use_layout_store and LayoutStore.available():
+            self.layout                    = LayoutStore()
+        self._edge_slots                   = None       # edge ids & layout slots (see Graph.edges_in_rect)
+        # autosave is disabled in headless mode
+        self.autosave                      = kwargs.pop('autosave', not options.HEADLESS)
+        self.autosave_path                 = None
+        if self.autosave:
+            self.autosave_path             = os.path.join(os.getenv('TMPDIR') or tempfile.gettempdir(), 'sg_autosave.json')
         self._autosave_file                = None
 
         # testing mode only
@@ -194,6 +212,113 @@ class Graph(object):
                 nx_data.update({k:v})
                 #print '# DEBUG: updating: "%s" :' % k, v
 
+    def _disconnectNode(self, dag):
+        """
+        Disconnect a dag node's events from the graph.
+
+        :param DagNode dag: dag node.
+        """
+        dag.nodeNameChanged.discard(self.nodeNameChangedEvent)
+        dag.nodePositionChanged.discard(self.nodePositionChangedEvent)
+        dag.nodeAttributeUpdated.discard(self.nodeAttributeUpdatedEvent)
+        dag.nodePositionChanged.group = None
+        dag.nodeAttributeUpdated.group = None
+
+    def profile_events(self, enabled=True, sample_rate=1.0):
+        """
+        Enable/disable event callback timing (see :func:`events.enable_stats`).
+        Instrumentation is process-wide.
+
+        :param bool enabled: record callback timings.
+        :param float sample_rate: fraction of calls to time (0-1).
+        """
+        if enabled:
+            events.enable_stats(sample_rate=sample_rate)
+        else:
+            events.disable_stats()
+
+    def event_stats(self, filename=None, reset=False):
+        """
+        Returns event callback timings, keyed by "event:callback". Each entry
+        has call counts, total, mean, p50, p99 & max durations (ms) and 
+        the maximum nesting depth.
+
+        :param str filename: write the statistics to a JSON file.
+        :param bool reset: clear the statistics after reading.
+
+        :returns: dictionary of callback statistics.
+        :rtype: dict
+        """
+        stats = events.get_stats()
+        if stats is None:
+            log.warning('event profiling is not enabled.')
+            return dict()
+
+        result = stats.report()
+        if filename is not None:
+            stats.dump(filename)
+        if reset:
+            stats.reset()
+        return result
+
+    #- Batching ----
+    @contextmanager
+    def batch(self):
+        """
+        Context manager that queues graph & node events until the block 
+        exits. Events are coalesced and delivered once, so the scene is 
+        refreshed (and the undo stack updated) a single time.
+
+            with graph.batch():
+                for i in range(1000):
+                    graph.add_node('default')
+        """
+        self._batch_depth += 1
+        if self._batch_depth == 1:
+            for handler in [self.nodesAdded, self.edgesAdded, self.graphUpdated]:
+                handler.beginBatch()
+            self._node_batch.begin()
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                # sync the node data first, then update the scene
+                self._node_batch.end()
+                for handler in [self.nodesAdded, self.edgesAdded, self.graphUpdated]:
+                    handler.endBatch()
+
+    @property
+    def batching(self):
+        """
+        Returns true if events are currently being batched.
+
+        :rtype: bool
+        """
+        return self._batch_depth > 0
+
+    def _coalesceNodesAdded(self, queue):
+        """
+        Merge queued nodesAdded events, dropping nodes that 
+        were removed in the same batch.
+        """
+        args, kwargs = merge_events(queue)
+        ids = [i for i in (args[0] if args else []) if i in self.dagnodes]
+        if not ids:
+            return
+        return ((ids,), kwargs)
+
+    def _coalesceEdgesAdded(self, queue):
+        """
+        Merge queued edgesAdded events, dropping edges that 
+        were removed in the same batch.
+        """
+        args, kwargs = merge_events(queue)
+        edges = [e for e in (args[0] if args else []) if self.network.has_edge(e.get('src_id'), e.get('dest_id'))]
+        if not edges:
+            return
+        return ((edges,), kwargs)
+
     def updateDagNodes(self, dagnodes, debug=False):
         """
         Update the networkx nodes and links attributes from scene values.
@@ -213,7 +338,7 @@ class Graph(object):
                 nx_data = self.network.node[nid]
                 nx_data.update(dag_data)
                 
-                if debug:
+                if debug and self.autosave_path:
                     # write temp file
                     filename = os.path.join(os.path.dirname(self.autosave_path), '%s.json' % dag.name)
                     fn = open(filename, 'w')
@@ -292,10 +417,8 @@ class Graph(object):
         :returns: scene file name.
         :rtype: str
         """
-        tmp_dir = os.getenv('TMPDIR')
-        if not tmp_dir:
-            log.warning('environment "TMPDIR" not set, please set and restart.')
-        if tmp_dir not in filename:
+        tmp_dir = os.path.dirname(self.autosave_path) if self.autosave_path else None
+        if not tmp_dir or tmp_dir not in filename:
             self.network.graph['scene'] = filename
         return self.getScene()
 
@@ -447,11 +570,18 @@ class Graph(object):
         # get the dag node from the PluginManager
         dag = self.plug_mgr.get_dagnode(node_type=node_type, name=name, pos=pos, _graph=self, attributes=attributes, **kwargs)
 
+        if self.layout is not None:
+            dag.attach_layout(self.layout)
+
         # connect signals
         dag.nodeNameChanged += self.nodeNameChangedEvent
         dag.nodePositionChanged += self.nodePositionChangedEvent
         dag.nodeAttributeUpdated += self.nodeAttributeUpdatedEvent
 
+        # position & attribute events are queued while batching (see Graph.batch)
+        dag.nodePositionChanged.group = self._node_batch
+        dag.nodeAttributeUpdated.group = self._node_batch
+
         # advance the grid to the next value.
         self.grid.next()
         self.dagnodes[dag.id] = dag
@@ -493,13 +623,18 @@ class Graph(object):
         for node in nodes:
             dag_id = node.id
             # remove from networkx
-            if dag_id in self.network.nodes():
+            if dag_id in self.network:
+                for edge in self.network.in_edges(dag_id) + self.network.out_edges(dag_id):
+                    self.remove_node_edge(edge[0], edge[1])
                 self.network.remove_node(dag_id)
+                self._edge_slots = None
 
             # remove from dagnodes
             if dag_id in self.dagnodes:
                 dn = self.dagnodes.get(dag_id)
                 if self.dagnodes.pop(dag_id):
+                    dn.detach_layout()
+                    self._disconnectNode(dn)
                     node_ids.append(dag_id)
 
         if node_ids:
@@ -550,18 +685,19 @@ class Graph(object):
 
         src_conn = src.get_connection(src_attr)
         dest_conn = dest.get_connection(dest_attr)
-        edge_id_str = '(%s,%s)' % (src.id, dest.id)
+        edge_id = (src.id, dest.id)
 
-        #if edge_id_str not in src_conn._edges and edge_id_str not in dest_conn._edges:            
         # add the nx edge - weight should go here        
         self.network.add_edge(src.id, dest.id, key='attributes', weight=weight, attr_dict=edge_attrs)
+        self._edge_slots = None
         log.info('adding edge: "%s"' % self.edge_nice_name(src.id, dest.id))
 
         # new edge = {'attributes': {'dest_attr': 'input', 'src_attr': 'output', 'weight': 1}}
         new_edge = self.network.edge[src.id][dest.id]
         #print 'new edge: ', new_edge
-        src_conn._edges.append(edge_id_str)
-        dest_conn._edges.append(edge_id_str)
+        src_conn.add_edge(*edge_id)
+        dest_conn.add_edge(*edge_id)
+        self._edge_attrs[edge_id] = (src_conn, dest_conn)
 
         # update the scene
         self.edgesAdded([new_edge.get('attributes')])
@@ -709,6 +845,7 @@ class Graph(object):
             if edge_id in self.network.edges():
                 log.debug('Removing edge: "%s"' % self.edge_nice_name(*edge_id))
                 self.network.remove_edge(*edge_id)                
+                self._edge_slots = None
                 self.remove_node_edge(*edge_id)        
 
                 # update the scene
@@ -718,14 +855,16 @@ class Graph(object):
 
     def remove_node_edge(self, src_id, dest_id):
         """
-        Remove deleted edges from current dagnodes.
+        Remove deleted edges from current dagnodes. Only the 
+        source & destination attributes of the edge are updated.
+
+        :param str src_id: source node id.
+        :param str dest_id: destination node id.
         """
-        edge_id_str = '(%s,%s)' % (src_id, dest_id)
-        for id, dag in self.dagnodes.items():
-            for conn_name in dag.connections:
-                dagcon = dag.get_connection(conn_name)
-                if edge_id_str in dagcon._edges:
-                    dagcon._edges.remove(edge_id_str)
+        edge_id = (src_id, dest_id)
+        for dagcon in self._edge_attrs.pop(edge_id, ()):
+            if dagcon is not None:
+                dagcon.remove_edge(*edge_id)
 
     def getNodeID(self, name):
         """
@@ -923,16 +1062,17 @@ class Graph(object):
         """
         import copy
         result = []
-        for node in nodes:
-            new_name = self.get_valid_name(node.name)
-            data = copy.deepcopy(node.data)
-            data.update(pos=[node.pos[0]+offset[0], node.pos[1]+offset[1]])
-            data.update(name=new_name)
-            data.pop('node_type')
-            data.pop('id')
-            new_node = self.add_node(node.node_type, **data)
-            print '# adding node: "%s"' % new_node.name
-            result.append(new_node)
+        with self.batch():
+            for node in nodes:
+                new_name = self.get_valid_name(node.name)
+                data = copy.deepcopy(node.data)
+                data.update(pos=[node.pos[0]+offset[0], node.pos[1]+offset[1]])
+                data.update(name=new_name)
+                data.pop('node_type')
+                data.pop('id')
+                new_node = self.add_node(node.node_type, **data)
+                print '# adding node: "%s"' % new_node.name
+                result.append(new_node)
         return result
 
     def connect(self, source, dest):
@@ -980,7 +1120,12 @@ class Graph(object):
         """
         # clear the Graph
         self.network.clear()
+        for dag in self.dagnodes.values():
+            dag.detach_layout()
+            self._disconnectNode(dag)
         self.dagnodes = dict()
+        self._edge_attrs = dict()
+        self._edge_slots = None
         self._initialized = 0
         if self.handler is not None:
             self.handler.resetScene()
@@ -998,6 +1143,7 @@ class Graph(object):
 
         if nid is not None:
             #return self.network.successors(nid)
+            import networkx as nx
             return nx.descendants(self.network, nid)            
         return []
 
@@ -1014,6 +1160,7 @@ class Graph(object):
 
         if nid is not None:
             #return self.network.predecessors(nid)
+            import networkx as nx
             return nx.ancestors(self.network, nid)  
         return []
 
@@ -1057,6 +1204,108 @@ class Graph(object):
                     break
         return name
     
+    #- Layout ----
+    def bounds(self, dagnodes=None):
+        """
+        Returns the bounding rectangle of the given nodes (or all nodes).
+
+        :param list dagnodes: dag nodes to query (default is all nodes).
+
+        :returns: (x1, y1, x2, y2) or None if there are no nodes.
+        :rtype: tuple
+        """
+        if dagnodes is None:
+            dagnodes = self.dagnodes.values()
+        if not dagnodes:
+            return None
+
+        if self.layout is not None:
+            return self.layout.bounds([n._layout_slot for n in dagnodes])
+
+        result = None
+        for node in dagnodes:
+            x, y = node.pos
+            w, h = float(node.width) / 2, float(node.height) / 2
+            rect = (x - w, y - h, x + w, y + h)
+            if result is None:
+                result = rect
+                continue
+            result = (min(result[0], rect[0]), min(result[1], rect[1]), 
+                      max(result[2], rect[2]), max(result[3], rect[3]))
+        return result
+
+    def nodes_in_rect(self, x1, y1, x2, y2, contains=False):
+        """
+        Returns the dag nodes intersecting the given rectangle.
+
+        :param float x1: rectangle left.
+        :param float y1: rectangle top.
+        :param float x2: rectangle right.
+        :param float y2: rectangle bottom.
+        :param bool contains: only return nodes fully inside the rectangle.
+
+        Requires the layout store for large graphs; without NumPy every
+        node is tested.
+
+        :returns: list of DagNode objects.
+        :rtype: list
+        """
+        if self.layout is None:
+            result = []
+            for node in self.dagnodes.values():
+                bx1, by1, bx2, by2 = self.bounds([node])
+                if contains:
+                    if bx1 >= min(x1, x2) and by1 >= min(y1, y2) and bx2 <= max(x1, x2) and by2 <= max(y1, y2):
+                        result.append(node)
+                elif bx1 <= max(x1, x2) and bx2 >= min(x1, x2) and by1 <= max(y1, y2) and by2 >= min(y1, y2):
+                    result.append(node)
+            return result
+
+        return self.layout.items(self.layout.hit_test(x1, y1, x2, y2, contains=contains))
+
+    def edges_in_rect(self, x1, y1, x2, y2):
+        """
+        Returns the edges whose segment bounds (between the source & 
+        destination node positions) intersect the given rectangle, so 
+        that edges crossing the rectangle are found even if neither 
+        of their nodes is inside it.
+
+        :param float x1: rectangle left.
+        :param float y1: rectangle top.
+        :param float x2: rectangle right.
+        :param float y2: rectangle bottom.
+
+        :returns: list of (source id, destination id) tuples.
+        :rtype: list
+        """
+        if self.layout is None:
+            result = []
+            for src_id, dest_id in self.network.edges():
+                src, dest = self.dagnodes.get(src_id), self.dagnodes.get(dest_id)
+                if src is None or dest is None:
+                    continue
+                (sx, sy), (dx, dy) = src.pos, dest.pos
+                if min(sx, dx) <= max(x1, x2) and max(sx, dx) >= min(x1, x2) and min(sy, dy) <= max(y1, y2) and max(sy, dy) >= min(y1, y2):
+                    result.append((src_id, dest_id))
+            return result
+
+        # edge slots are cached until edges are added or removed
+        if self._edge_slots is None:
+            edge_ids, src_slots, dest_slots = [], [], []
+            for src_id, dest_id in self.network.edges():
+                src, dest = self.dagnodes.get(src_id), self.dagnodes.get(dest_id)
+                if src is None or dest is None:
+                    continue
+                edge_ids.append((src_id, dest_id))
+                src_slots.append(src._layout_slot)
+                dest_slots.append(dest._layout_slot)
+            self._edge_slots = (edge_ids, src_slots, dest_slots)
+
+        edge_ids, src_slots, dest_slots = self._edge_slots
+        if not edge_ids:
+            return []
+        return [edge_ids[i] for i in self.layout.hit_test_segments(src_slots, dest_slots, x1, y1, x2, y2)]
+
     #- Actions ----
     def nodeChangedAction(self, UUID, **kwargs):
         """
@@ -1080,6 +1329,7 @@ class Graph(object):
             log.warning('graph did not evaluate correctly.')
         attrs = {'source': 'source', 'target': 'target', 'key': 'key', 
                 'id': 'id', 'src_id': 'src_id', 'dest_id': 'dest_id', 'src_attr': 'src_attr', 'dest_attr': 'dest_attr', 'weight':'weight', 'style':'style'}
+        import networkx.readwrite.json_graph as nxj
         graph_data = nxj.node_link_data(self.network, attrs=attrs)
         return graph_data
 
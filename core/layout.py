@@ -0,0 +1,341 @@
+#!/usr/bin/env python
+# numpy is imported on first use (see :func:`import_numpy`)
+np = None
+
+
+def import_numpy():
+    """
+    Import numpy on demand.
+
+    :returns: numpy module (or None if numpy isn't installed).
+    :rtype: module
+    """
+    global np
+    if np is None:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            np = False
+    return np or None
+
+
+class LayoutStore(object):
+    """
+    Struct-of-arrays storage for per-node layout attributes (position, size,
+    color and enabled state). Each node is assigned a compact slot index
+    into the arrays, so bounds, hit-testing and transforms can be computed
+    over the entire graph without touching the node objects. The node 
+    that owns each slot is stored as well, so slot queries can be mapped
+    back to nodes (see :func:`LayoutStore.items`).
+
+    Positions are node centers, matching the node widget coordinates.
+
+    Requires NumPy, use :func:`LayoutStore.available` to check.
+
+    :param int capacity: initial number of slots to allocate.
+    """
+    default_color = [172, 172, 172, 255]
+
+    def __init__(self, capacity=256):
+
+        if import_numpy() is None:
+            raise ImportError('LayoutStore requires numpy.')
+
+        self._capacity      = 0
+        self._count         = 0         # high-water mark of allocated slots
+        self._free          = []        # released slots available for reuse
+
+        self.pos            = np.zeros((0, 2), dtype=np.float64)
+        self.size           = np.zeros((0, 2), dtype=np.float64)
+        self.color          = np.zeros((0, 4), dtype=np.int16)
+        self.enabled        = np.zeros(0, dtype=bool)
+        self.active         = np.zeros(0, dtype=bool)
+        self.owner          = np.zeros(0, dtype=object)
+
+        self._grow(max(int(capacity), 1))
+
+    def __len__(self):
+        return int(self.active[:self._count].sum())
+
+    @staticmethod
+    def available():
+        """
+        Returns true if NumPy is available.
+
+        :returns: store can be used.
+        :rtype: bool
+        """
+        return import_numpy() is not None
+
+    def _grow(self, capacity):
+        """
+        Resize the arrays to the given capacity.
+
+        :param int capacity: new number of slots.
+        """
+        if capacity <= self._capacity:
+            return
+
+        for attr in ['pos', 'size', 'color', 'enabled', 'active', 'owner']:
+            old = getattr(self, attr)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self._capacity] = old
+            setattr(self, attr, new)
+        self._capacity = capacity
+
+    #- Slots ----
+    def allocate(self, pos=(0.0, 0.0), width=100.0, height=15.0, color=None, enabled=True, owner=None):
+        """
+        Allocate a slot and initialize its values.
+
+        :param tuple pos: node center position.
+        :param float width: node width.
+        :param float height: node height.
+        :param list color: rgb or rgba color.
+        :param bool enabled: node enabled state.
+        :param object owner: node that owns the slot.
+
+        :returns: slot index.
+        :rtype: int
+        """
+        if self._free:
+            slot = self._free.pop()
+        else:
+            if self._count >= self._capacity:
+                self._grow(self._capacity * 2)
+            slot = self._count
+            self._count += 1
+
+        self.active[slot] = True
+        self.owner[slot] = owner
+        self.set_pos(slot, pos)
+        self.set_size(slot, width, height)
+        self.set_color(slot, color if color is not None else self.default_color)
+        self.set_enabled(slot, enabled)
+        return slot
+
+    def release(self, slot):
+        """
+        Release a slot so that it can be reused.
+
+        :param int slot: slot index.
+        """
+        if slot is None or not self.active[slot]:
+            return
+        self.active[slot] = False
+        self.owner[slot] = None
+        self._free.append(slot)
+
+    def clear(self):
+        """
+        Release all slots.
+        """
+        self.active[:] = False
+        self.owner[:] = None
+        self._count = 0
+        self._free = []
+
+    def slots(self):
+        """
+        Returns an array of all allocated slots.
+
+        :returns: slot indices.
+        :rtype: numpy.ndarray
+        """
+        return np.flatnonzero(self.active[:self._count])
+
+    def items(self, slots=None):
+        """
+        Returns the owners of the given slots.
+
+        :param list slots: slots to query (default is all).
+
+        :returns: list of slot owners.
+        :rtype: list
+        """
+        return self.owner[self._slots(slots)].tolist()
+
+    def _slots(self, slots=None):
+        if slots is None:
+            return self.slots()
+        return np.asarray(slots, dtype=np.intp)
+
+    #- Accessors ----
+    def get_pos(self, slot):
+        x, y = self.pos[slot]
+        return [float(x), float(y)]
+
+    def set_pos(self, slot, value):
+        self.pos[slot] = (value[0], value[1])
+
+    def get_size(self, slot):
+        w, h = self.size[slot]
+        return (float(w), float(h))
+
+    def set_size(self, slot, width, height):
+        self.size[slot] = (width, height)
+
+    def get_width(self, slot):
+        return float(self.size[slot, 0])
+
+    def set_width(self, slot, value):
+        self.size[slot, 0] = value
+
+    def get_color(self, slot):
+        return [int(c) for c in self.color[slot]]
+
+    def set_color(self, slot, value):
+        value = list(value)
+        if len(value) < 4:
+            value.append(255)
+        self.color[slot] = value[:4]
+
+    def get_enabled(self, slot):
+        return bool(self.enabled[slot])
+
+    def set_enabled(self, slot, value):
+        self.enabled[slot] = bool(value)
+
+    #- Bulk Operations ----
+    def rects(self, slots=None):
+        """
+        Returns the node rectangles for the given slots.
+
+        :param list slots: slots to query (default is all).
+
+        :returns: (N, 4) array of x1, y1, x2, y2 values.
+        :rtype: numpy.ndarray
+        """
+        slots = self._slots(slots)
+        half = self.size[slots] * 0.5
+        pos = self.pos[slots]
+        return np.hstack((pos - half, pos + half))
+
+    def bounds(self, slots=None):
+        """
+        Returns the bounding rectangle of the given slots.
+
+        :param list slots: slots to query (default is all).
+
+        :returns: (x1, y1, x2, y2) or None if there are no slots.
+        :rtype: tuple
+        """
+        rects = self.rects(slots)
+        if not len(rects):
+            return None
+        x1, y1 = rects[:, :2].min(axis=0)
+        x2, y2 = rects[:, 2:].max(axis=0)
+        return (float(x1), float(y1), float(x2), float(y2))
+
+    def hit_test(self, x1, y1, x2=None, y2=None, contains=False):
+        """
+        Returns the slots intersecting a point or rectangle.
+
+        :param float x1: point x (or rectangle left).
+        :param float y1: point y (or rectangle top).
+        :param float x2: rectangle right.
+        :param float y2: rectangle bottom.
+        :param bool contains: only return slots fully contained by the rectangle.
+
+        :returns: slot indices.
+        :rtype: numpy.ndarray
+        """
+        if x2 is None:
+            x2 = x1
+        if y2 is None:
+            y2 = y1
+
+        x1, x2 = min(x1, x2), max(x1, x2)
+        y1, y2 = min(y1, y2), max(y1, y2)
+
+        slots = self.slots()
+        rects = self.rects(slots)
+        if contains:
+            mask = (rects[:, 0] >= x1) & (rects[:, 1] >= y1) & (rects[:, 2] <= x2) & (rects[:, 3] <= y2)
+        else:
+            mask = (rects[:, 0] <= x2) & (rects[:, 2] >= x1) & (rects[:, 1] <= y2) & (rects[:, 3] >= y1)
+        return slots[mask]
+
+    def hit_test_segments(self, src_slots, dest_slots, x1, y1, x2, y2):
+        """
+        Returns the segments (between the positions of two slots) whose 
+        bounds intersect a rectangle.
+
+        :param list src_slots: segment start slots.
+        :param list dest_slots: segment end slots.
+        :param float x1: rectangle left.
+        :param float y1: rectangle top.
+        :param float x2: rectangle right.
+        :param float y2: rectangle bottom.
+
+        :returns: segment indices.
+        :rtype: numpy.ndarray
+        """
+        x1, x2 = min(x1, x2), max(x1, x2)
+        y1, y2 = min(y1, y2), max(y1, y2)
+
+        start = self.pos[self._slots(src_slots)]
+        end = self.pos[self._slots(dest_slots)]
+        lo = np.minimum(start, end)
+        hi = np.maximum(start, end)
+        mask = (lo[:, 0] <= x2) & (hi[:, 0] >= x1) & (lo[:, 1] <= y2) & (hi[:, 1] >= y1)
+        return np.flatnonzero(mask)
+
+    def translate(self, slots, dx, dy):
+        """
+        Offset the positions of the given slots.
+
+        :param list slots: slots to move.
+        :param float dx: x offset.
+        :param float dy: y offset.
+        """
+        slots = self._slots(slots)
+        self.pos[slots] += (dx, dy)
+
+    def align(self, slots, edge='left'):
+        """
+        Align the given slots to a common edge.
+
+        :param list slots: slots to align.
+        :param str edge: left, right, top, bottom, hcenter or vcenter.
+        """
+        slots = self._slots(slots)
+        if not len(slots):
+            return
+
+        pos = self.pos[slots]
+        half = self.size[slots] * 0.5
+
+        if edge == 'left':
+            pos[:, 0] = (pos[:, 0] - half[:, 0]).min() + half[:, 0]
+        elif edge == 'right':
+            pos[:, 0] = (pos[:, 0] + half[:, 0]).max() - half[:, 0]
+        elif edge == 'top':
+            pos[:, 1] = (pos[:, 1] - half[:, 1]).min() + half[:, 1]
+        elif edge == 'bottom':
+            pos[:, 1] = (pos[:, 1] + half[:, 1]).max() - half[:, 1]
+        elif edge == 'hcenter':
+            pos[:, 0] = pos[:, 0].mean()
+        elif edge == 'vcenter':
+            pos[:, 1] = pos[:, 1].mean()
+        else:
+            raise ValueError('invalid edge: "%s"' % edge)
+        self.pos[slots] = pos
+
+    def distribute(self, slots, axis='x'):
+        """
+        Evenly space the centers of the given slots between the
+        first and last slot along an axis.
+
+        :param list slots: slots to distribute.
+        :param str axis: x or y.
+        """
+        slots = self._slots(slots)
+        if len(slots) < 3:
+            return
+
+        col = 0 if axis == 'x' else 1
+        values = self.pos[slots, col]
+        order = np.argsort(values, kind='mergesort')
+        self.pos[slots[order], col] = np.linspace(values.min(), values.max(), len(slots))
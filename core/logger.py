@@ -23,19 +23,25 @@ def myLogger(name=None):
         logger.setLevel(LOGGER_LEVEL)
         
         console_handler = logging.StreamHandler()
-        file_handler = logging.FileHandler(getLogFile(name))        
-
         formatter_console = logging.Formatter('[%(name)s]: %(levelname)s: %(message)s')
-        formatter_file = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        
-        # set handler formatters
         console_handler.setFormatter(formatter_console)
-        file_handler.setFormatter(formatter_file)
-        file_handler.setLevel(logging.WARNING)
-        
-        # add handlers
         logger.addHandler(console_handler)        
-        logger.addHandler(file_handler)
+
+        # headless mode only logs to a file if one is configured
+        log_file = options.SCENEGRAPH_LOG_FILE
+        if not log_file and not options.HEADLESS:
+            try:
+                log_file = getLogFile(name)
+            except OSError as err:
+                logger.warning('cannot create log file: %s' % err)
+
+        if log_file:
+            # the log file isn't opened until the first record is written
+            file_handler = logging.FileHandler(log_file, delay=True)
+            formatter_file = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            file_handler.setFormatter(formatter_file)
+            file_handler.setLevel(logging.WARNING)
+            logger.addHandler(file_handler)
 
         logger.propagate = False
         LOGGERS[options.PACKAGE]=logger    
@@ -4,6 +4,7 @@ from copy import deepcopy
 from collections import OrderedDict as dict
 import simplejson as json
 import re
+import collections
 
 from SceneGraph.core import log
 
@@ -25,6 +26,74 @@ PROPERTIES = dict(
 )
 
 
+class FrozenDict(dict):
+    """
+    Read-only ordered dictionary, used to share parsed 
+    metadata between nodes of the same type.
+    """
+    def __init__(self, *args, **kwargs):
+        super(FrozenDict, self).__init__(*args, **kwargs)
+        self._frozen = True
+
+    def _readonly(self, *args, **kwargs):
+        if getattr(self, '_frozen', False):
+            raise TypeError('metadata is read-only, use Metadata.edit to modify a section.')
+
+    def __setitem__(self, key, value):
+        self._readonly()
+        super(FrozenDict, self).__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._readonly()
+        super(FrozenDict, self).__delitem__(key)
+
+    def update(self, *args, **kwargs):
+        self._readonly()
+        super(FrozenDict, self).update(*args, **kwargs)
+
+    def pop(self, *args):
+        self._readonly()
+        return super(FrozenDict, self).pop(*args)
+
+    def popitem(self, *args, **kwargs):
+        self._readonly()
+        return super(FrozenDict, self).popitem(*args, **kwargs)
+
+    def setdefault(self, *args):
+        self._readonly()
+        return super(FrozenDict, self).setdefault(*args)
+
+    def clear(self):
+        self._readonly()
+        super(FrozenDict, self).clear()
+
+
+def freeze(data):
+    """
+    Returns a read-only copy of a (nested) metadata dictionary.
+
+    :param dict data: metadata dictionary.
+
+    :returns: frozen metadata.
+    :rtype: FrozenDict
+    """
+    if isinstance(data, FrozenDict):
+        return data
+    return FrozenDict([(k, freeze(v) if isinstance(v, collections.Mapping) else v) for k, v in data.iteritems()])
+
+
+def thaw(data):
+    """
+    Returns a writable deep copy of a (nested) metadata dictionary.
+
+    :param dict data: metadata dictionary.
+
+    :returns: writable metadata.
+    :rtype: dict
+    """
+    return dict([(k, thaw(v) if isinstance(v, collections.Mapping) else deepcopy(v)) for k, v in data.iteritems()])
+
+
 class MetadataParser(object):
     """
     class MetadataParser:
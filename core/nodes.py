@@ -5,6 +5,7 @@ import uuid
 import simplejson as json
 from collections import OrderedDict as dict
 from SceneGraph.core import log, Attribute, EventHandler, MetadataParser
+from SceneGraph.core.metadata import freeze, thaw
 from SceneGraph.options import SCENEGRAPH_PATH, SCENEGRAPH_CORE, SCENEGRAPH_PLUGIN_PATH, SCENEGRAPH_METADATA_PATH
 from SceneGraph import util
 
@@ -16,6 +17,10 @@ PROPERTY_TYPES = dict(
     )
 
 
+# shared (read-only) metadata, keyed by node class
+METADATA_PROTOTYPES = dict()
+
+
 class Node(object):
 
     default_color = [172, 172, 172, 255]
@@ -23,15 +28,25 @@ class Node(object):
     REQUIRED      = ['name', 'node_type', 'id', 'color', 'docstring', 'width', 
                       'base_height', 'force_expand', 'pos', 'enabled', 'orientation', 'style']
 
+    # layout store (see Node.attach_layout)
+    _layout       = None
+    _layout_slot  = None
+
     def __init__(self, name=None, **kwargs):
 
         self._attributes            = dict()
         self._metadata              = Metadata(self)
 
+        # cached connection names (see Node._index_attr)
+        self._connections           = ()
+        self._inputs                = ()
+        self._outputs               = ()
+
         # event handlers
-        self.nodeNameChanged        = EventHandler(self)
-        self.nodePositionChanged    = EventHandler(self)
-        self.nodeAttributeUpdated   = EventHandler(self)
+        self.nodeNameChanged        = EventHandler(self, name='nodeNameChanged', weak=True)
+        self.nodePositionChanged    = EventHandler(self, name='nodePositionChanged', weak=True)
+        self.nodeAttributeUpdated   = EventHandler(self, name='nodeAttributeUpdated', weak=True)
+        self.nodeLayoutChanged      = EventHandler(self, name='nodeLayoutChanged', weak=True)     # size or connections changed
 
         # basic node attributes        
         self.name                   = name if name else self.default_name
@@ -52,9 +67,9 @@ class Node(object):
         attributes                  = kwargs.pop('attributes', dict())
 
         # if the node metadata isn't passed from another class, 
-        # read it from disk
+        # use the metadata shared by all nodes of this type
         if not metadata:
-            metadata = self.read_metadata()
+            metadata = self.metadata_prototype()
 
         # ui
         self._widget            = None  
@@ -90,7 +105,8 @@ class Node(object):
 
     def __setattr__(self, name, value):
         if name in ['_attributes', '_changed', '_widget', '_metadata', 'nodeNameChanged', 
-                    'nodePositionChanged', 'nodeAttributeUpdated']:
+                    'nodePositionChanged', 'nodeAttributeUpdated', 'nodeLayoutChanged', '_layout', '_layout_slot',
+                    '_pos', '_width', '_color', '_enabled', '_connections', '_inputs', '_outputs']:
             super(Node, self).__setattr__(name, value)
 
         elif name in self._attributes:            
@@ -101,8 +117,9 @@ class Node(object):
                 self.nodeAttributeUpdated(**{name:value})
         else:
             if name == 'name':
-                # callback to get a valid node name
-                valid_names = self.nodeNameChanged(name=value)
+                # callback to get a valid node name (callbacks that 
+                # don't validate the name return None)
+                valid_names = [n for n in self.nodeNameChanged(name=value) if n is not None]
                 if valid_names:
                     value = valid_names[0]
 
@@ -114,6 +131,13 @@ class Node(object):
             
             super(Node, self).__setattr__(name, value)
 
+            if name in ['width', 'base_height', 'force_expand', 'radius', 'orientation']:
+                self._update_layout_size()
+
+            # the label text & font change
+            elif name in ['name', 'enabled']:
+                self.nodeLayoutChanged()
+
     @property
     def data(self):
         """
@@ -170,6 +194,108 @@ class Node(object):
         """
         return True 
 
+    #- Layout ----
+    @property
+    def pos(self):
+        # with a layout store this is a copy, assign node.pos to move the node
+        if self._layout is not None:
+            return self._layout.get_pos(self._layout_slot)
+        return self._pos
+
+    @pos.setter
+    def pos(self, value):
+        if self._layout is not None:
+            self._layout.set_pos(self._layout_slot, value)
+        else:
+            self._pos = value
+
+    @property
+    def width(self):
+        if self._layout is not None:
+            return self._layout.get_width(self._layout_slot)
+        return self._width
+
+    @width.setter
+    def width(self, value):
+        if self._layout is not None:
+            self._layout.set_width(self._layout_slot, value)
+        else:
+            self._width = value
+
+    @property
+    def color(self):
+        if self._layout is not None:
+            return self._layout.get_color(self._layout_slot)
+        return self._color
+
+    @color.setter
+    def color(self, value):
+        if self._layout is not None:
+            self._layout.set_color(self._layout_slot, value)
+        else:
+            self._color = value
+
+    @property
+    def enabled(self):
+        if self._layout is not None:
+            return self._layout.get_enabled(self._layout_slot)
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value):
+        if self._layout is not None:
+            self._layout.set_enabled(self._layout_slot, value)
+        else:
+            self._enabled = value
+
+    def attach_layout(self, store):
+        """
+        Move the node's layout attributes (position, size, color & enabled
+        state) into a columnar :class:`~core.layout.LayoutStore`.
+
+        :param LayoutStore store: layout store.
+
+        :returns: slot index in the store.
+        :rtype: int
+        """
+        if self._layout is store:
+            return self._layout_slot
+
+        slot = store.allocate(pos=self.pos, width=self.width, height=self.height, 
+                              color=self.color, enabled=self.enabled, owner=self)
+        self.detach_layout()
+        self._layout_slot = slot
+        self._layout = store
+        return slot
+
+    def detach_layout(self):
+        """
+        Copy the node's layout attributes back from the 
+        layout store and release its slot.
+        """
+        if self._layout is None:
+            return
+
+        store = self._layout
+        slot = self._layout_slot
+        self._pos = store.get_pos(slot)
+        self._width = store.get_width(slot)
+        self._color = store.get_color(slot)
+        self._enabled = store.get_enabled(slot)
+
+        self._layout = None
+        self._layout_slot = None
+        store.release(slot)
+
+    def _update_layout_size(self):
+        """
+        Sync the node size with the layout store, and signal 
+        that the node layout has changed.
+        """
+        if self._layout is not None:
+            self._layout.set_size(self._layout_slot, self.width, self.height)
+        self.nodeLayoutChanged()
+
     #- Virtual ----
     @property
     def height(self):
@@ -226,6 +352,8 @@ class Node(object):
         #print '\t"%s.%s" type: %s' %(self.name, name, attr_type)
         attr = Attribute(name, value, dagnode=self, **kwargs)
         self._attributes.update({attr.name:attr})
+        self._index_attr(attr.name)
+        self._update_layout_size()
         return attr
 
     def get_attr(self, name):
@@ -255,8 +383,38 @@ class Node(object):
             raise AttributeError('attribute "%s" already exists.' % new_name)
 
         attr = self._attributes.pop(name)
+        self._index_attr(name)
         attr.name = new_name
         self._attributes.update({attr.name:attr})
+        self._index_attr(attr.name)
+        self.nodeLayoutChanged()
+
+    def _index_attr(self, name):
+        """
+        Update the cached connection name lists for the named attribute. 
+        If the attribute no longer exists, it is removed from the lists.
+
+        :param str name: name of attribute.
+        """
+        attr = self._attributes.get(name)
+        for cache, member in [('_connections', attr is not None and attr.connectable),
+                              ('_inputs', attr is not None and attr.is_input),
+                              ('_outputs', attr is not None and attr.is_output)]:
+            names = getattr(self, cache)
+            if member and name not in names:
+                setattr(self, cache, names + (name,))
+            elif not member and name in names:
+                setattr(self, cache, tuple(n for n in names if n != name))
+
+    def _reindex_attrs(self):
+        """
+        Rebuild the cached connection name lists from the current attributes.
+        """
+        attrs = self._attributes.values()
+        self._connections = tuple(a.name for a in attrs if a.connectable)
+        self._inputs = tuple(a.name for a in attrs if a.is_input)
+        self._outputs = tuple(a.name for a in attrs if a.is_output)
+        self._update_layout_size()
 
     #- Plugins/Metadata ----
     @property
@@ -285,6 +443,21 @@ class Node(object):
         """
         return SCENEGRAPH_PLUGIN_PATH in self.plugin_file
 
+    def metadata_prototype(self, refresh=False):
+        """
+        Returns the read-only metadata shared by all nodes of this type. 
+        Metadata files are parsed once per node class.
+
+        :param bool refresh: re-read the metadata files from disk.
+
+        :returns: frozen metadata dictionary.
+        :rtype: FrozenDict
+        """
+        cls = self.__class__
+        if refresh or cls not in METADATA_PROTOTYPES:
+            METADATA_PROTOTYPES[cls] = freeze(self.read_metadata())
+        return METADATA_PROTOTYPES.get(cls)
+
     def read_metadata(self, verbose=False):
         """
         Initialize node metadata from metadata files on disk.
@@ -538,8 +711,8 @@ class DagNode(Node):
         :returns: attribute node.
         :rtype: Attribute
         """
-        # connection properties
-        max_connections = properties.pop('max_connections', 1) 
+        # connection properties (properties may be shared, so don't modify them)
+        max_connections = properties.get('max_connections', 1) 
         attr_type = None
 
         #print '- Mapping: "%s.%s": ' % (self.name, name)
@@ -551,7 +724,7 @@ class DagNode(Node):
             #print '  - updating property: "%s.%s:%s' % (self.name, name, property_name)
             pattrs = properties.get(property_name)
             #print '# DEBUG: pattrs: ', pattrs
-            if not util.is_dict(pattrs):
+            if property_name == 'max_connections' or not util.is_dict(pattrs):
                 continue
 
             property_value = pattrs.get('value')
@@ -572,46 +745,30 @@ class DagNode(Node):
         """
         Returns a list of connections (input & output)
 
-        returns:
-            (list) - list of connection names.
+        :returns: connection names.
+        :rtype: tuple
         """
-        conn_names = []
-        for name in self._attributes:
-            if self._attributes.get(name).connectable:
-                conn_names.append(name)
-        return conn_names
+        return self._connections
 
     @property
     def inputs(self):
         """
         Returns a list of input connection names.
 
-        :returns: list of input connection names.
-        :rtype: list
+        :returns: input connection names.
+        :rtype: tuple
         """
-        connections = []
-        for name in self._attributes:
-            data = self._attributes.get(name)
-            #if data.get('connectable') and data.get('connection_type') == 'output':
-            if data.connectable and data.connection_type == 'input':
-                connections.append(name)
-        return connections
+        return self._inputs
 
     @property
     def outputs(self):
         """
         Returns a list of output connection names.
 
-        :returns: list of output connection names.
-        :rtype: list
+        :returns: output connection names.
+        :rtype: tuple
         """
-        connections = []
-        for name in self._attributes:
-            data = self._attributes.get(name)
-            #if data.get('connectable') and data.get('connection_type') == 'output':
-            if data.connectable and data.connection_type == 'output':
-                connections.append(name)
-        return connections
+        return self._outputs
 
     def get_input(self, name='input'):
         """
@@ -662,36 +819,59 @@ class DagNode(Node):
             return False
         return not conn.connectable
 
-    def input_connections(self):
+    def input_connections(self, attr=None):
         """
-        Returns a list of connected DagNodes.
+        Returns a list of connected DagNodes. Only the edges 
+        incoming to this node are queried.
+
+        :param str attr: only return nodes connected to this input.
 
         :returns: list of DagNode objects.
         :rtype: list
         """
-        connected_nodes = []
-        for edge in self.graph.network.edges(data=True):
-            # edge = (id, id, {atttributes})
-            srcid, destid, attrs = edge
-            if destid == self.id:
-                if srcid in self.graph.dagnodes:
-                    connected_nodes.append(self.graph.dagnodes.get(srcid))
-        return connected_nodes
+        return self._connected_nodes('input', attr=attr)
 
-    def output_connections(self):
+    def output_connections(self, attr=None):
+        """
+        Returns a list of connected DagNodes. Only the edges 
+        outgoing from this node are queried.
+
+        :param str attr: only return nodes connected to this output.
+
+        :returns: list of DagNode objects.
+        :rtype: list
         """
-        Returns a list of connected DagNodes.
+        return self._connected_nodes('output', attr=attr)
+
+    def _connected_nodes(self, connection_type, attr=None):
+        """
+        Returns a list of DagNodes connected to this node, using the 
+        network adjacency (cost is proportional to the node degree).
+
+        :param str connection_type: input or output.
+        :param str attr: connection name filter.
 
         :returns: list of DagNode objects.
         :rtype: list
         """
         connected_nodes = []
-        for edge in self.graph.network.edges(data=True):
+        if self.graph is None or self.id not in self.graph.network:
+            return connected_nodes
+
+        if connection_type == 'input':
+            edges = self.graph.network.in_edges(self.id, data=True)
+            node_index, attr_key = 0, 'dest_attr'
+        else:
+            edges = self.graph.network.out_edges(self.id, data=True)
+            node_index, attr_key = 1, 'src_attr'
+
+        for edge in edges:
             # edge = (id, id, {atttributes})
-            srcid, destid, attrs = edge
-            if srcid == self.id:
-                if destid in self.graph.dagnodes:
-                    connected_nodes.append(self.graph.dagnodes.get(destid))
+            if attr is not None and edge[2].get(attr_key) != attr:
+                continue
+            node_id = edge[node_index]
+            if node_id in self.graph.dagnodes:
+                connected_nodes.append(self.graph.dagnodes.get(node_id))
         return connected_nodes
 
     @property
@@ -761,7 +941,9 @@ class DagNode(Node):
         conn = self.get_connection(name)
         if conn:
             self._attributes.pop(name)
+            self._index_attr(name)
             del conn 
+            self._update_layout_size()
             return True 
         return False
 
@@ -885,6 +1067,7 @@ class Metadata(object):
         self._default_xform  = "Node Transform"
         self._default_attrs  = "Node Attributes" 
         self._template_data  = dict()               # dictionary to hold parsed data
+        self._edited         = set()                # sections copied from the template
 
         self._data.update(**kwargs)
 
@@ -899,7 +1082,8 @@ class Metadata(object):
 
     def update(self, data):
         """
-        Update the data dictionary.
+        Update the data dictionary. Sections are shared with the 
+        template data until they are modified.
 
         .. todo::: can't pass as **kwargs else we lose the order (why is that?)
         """
@@ -907,10 +1091,25 @@ class Metadata(object):
             self._template_data = data
             for k, v in data.iteritems():
                 if k in self._data:
-                    self._data.get(k).update(**v)
+                    self.edit(k).update(thaw(v))
                 else:
                     self._data.update({k:v})
 
+    def edit(self, section):
+        """
+        Returns a writable metadata section. The section is copied 
+        from the shared template data the first time it is edited.
+
+        :param str section: section name.
+
+        :returns: section attributes dictionary.
+        :rtype: dict
+        """
+        if section not in self._edited:
+            self._data[section] = thaw(self._data.get(section, dict()))
+            self._edited.add(section)
+        return self._data.get(section)
+
     @property
     def data(self):
         """
@@ -935,6 +1134,7 @@ class Metadata(object):
         Clears the parsed metadata.
         """
         self._data = dict()
+        self._edited = set()
 
     def sections(self):
         """
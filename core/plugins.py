@@ -5,10 +5,22 @@ import sys
 import pkgutil
 import inspect
 import time
+import tempfile
+import threading
 import simplejson as json
+from collections import OrderedDict
+
+try:
+    from os import scandir
+except ImportError:
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
 
 from SceneGraph.core import log
-from SceneGraph.options import SCENEGRAPH_PATH, SCENEGRAPH_CORE, SCENEGRAPH_PLUGIN_PATH, SCENEGRAPH_ICON_PATH, SCENEGRAPH_METADATA_PATH
+from SceneGraph import options
+from SceneGraph.options import SCENEGRAPH_PATH, SCENEGRAPH_CORE, SCENEGRAPH_PLUGIN_PATH, SCENEGRAPH_ICON_PATH, SCENEGRAPH_METADATA_PATH, SCENEGRAPH_PLUGIN_MANIFEST
 
 
 
@@ -20,12 +32,33 @@ class PluginManager(object):
     pass the paths you want to use with the 'paths' argument, else the 
     PluginManager will scan for directories on the PYTHONPATH.
 
+    Plugin scan results are cached in a manifest (see :class:`PluginManifest`), 
+    and plugin modules are only imported when a node type is first used. Pass 
+    lazy=False to import all plugins up front.
+
+    By default, the default plugins are read from the process-wide 
+    :class:`PluginRegistry`, so that they are only scanned once for all 
+    graphs. Each manager keeps its own copy of the plugin data, so 
+    enabling/disabling plugins only affects this manager. Pass shared=False 
+    to scan the plugins directly.
+
+    External plugin paths (passed with the 'paths' argument or read from the
+    SCENEGRAPH_PLUGIN_PATH environment variable) are scanned concurrently and
+    loaded after the builtin plugins. Paths listed first take priority.
+    Scanning times are stored in PluginManager.timings.
+
     run with PluginManager.load_plugins()
     """
     def __init__(self, paths=[], **kwargs):
 
         # storage for plugin data
         self._node_data              = dict()    
+        self._lazy                   = kwargs.pop('lazy', True)
+        self._manifest               = PluginManifest(kwargs.pop('manifest', default_manifest()))
+        self._widgets                = kwargs.pop('widgets', not options.HEADLESS)    # load node widgets (imports PySide)
+        self._shared                 = kwargs.pop('shared', True)
+        self._enabled                = dict()    # per-manager enabled overrides
+        self.timings                 = OrderedDict()     # plugin loading times (seconds)
 
         # plugin paths & module data
         self._core_plugin_path       = SCENEGRAPH_CORE
@@ -37,17 +70,35 @@ class PluginManager(object):
         self._external_plugin_paths  = paths
         self._external_modules       = []
 
-        # load core nodes
-        self.load_core()
-
-        # auto-load default plugins
-        self.load_plugins(self._default_plugin_path)
-        self.load_widgets(self._default_plugin_path)
-
         # setup external paths
         if not self._external_plugin_paths:
             self._external_plugin_paths = self.initializeExternalPaths()
 
+        if self._shared:
+            # copy the default plugins from the shared registry
+            start = time.time()
+            self._node_data = get_registry().node_data()
+            self.timings['registry'] = time.time() - start
+
+            # external paths passed explicitly aren't in the registry
+            if paths:
+                self.load_external(paths)
+        else:
+            # load core nodes
+            start = time.time()
+            self.load_core()
+            self.timings['core'] = time.time() - start
+
+            # auto-load default plugins
+            start = time.time()
+            self.load_plugins(self._default_plugin_path)
+            self.load_widgets(self._default_plugin_path)
+            self.timings['builtins'] = time.time() - start
+
+            self.load_external()
+
+        log.debug('plugins loaded: %s' % ', '.join(['%s: %.3fs' % (k, v) for k, v in self.timings.iteritems()]))
+
     def initializeExternalPaths(self):
         """
         Builds a list of external plugins paths. 
@@ -235,7 +286,7 @@ class PluginManager(object):
         core_path = SCENEGRAPH_CORE
         widget_path = os.path.join(SCENEGRAPH_PATH, 'ui')
 
-        builtins = self._load_core(core_path, plugins=plugins)
+        builtins = self._load_cached(core_path, self._load_core, plugins=plugins)
         #print '# DEBUG: core nodes loaded: ', builtins
         self.load_widgets(widget_path, plugins=builtins)
 
@@ -291,7 +342,9 @@ class PluginManager(object):
 
                 imported.append(node_type)
                 # raw_data = pkgutil.get_data('mod.components', 'data.txt')            
-                self._node_data.update({node_type:{'dagnode':globals()[cname], 'metadata':None, 'source':None, 'enabled':True, 'category':node_category, 'class':node_class}})
+                self._node_data.update({node_type:PluginEntry({'dagnode':obj, 'metadata':None, 'source':None, 'enabled':True, 'category':node_category, 'class':node_class})})
+                self._node_data.get(node_type).update(path=path, module=mod_name, class_name=cname, 
+                                                      default_name=getattr(obj, 'default_name', None))
 
                 # add source and metadata files
                 if os.path.exists(src_file):
@@ -318,7 +371,72 @@ class PluginManager(object):
         if path is None:
             path = self.default_plugin_path
 
-        builtins = self._load_builtins(path, plugins=plugins)
+        builtins = self._load_cached(path, self._load_builtins, plugins=plugins)
+
+    def load_external(self, paths=None, plugins=[]):
+        """
+        Load plugins & widgets from external paths. Paths are scanned 
+        concurrently, then loaded in reverse order so that plugins in 
+        the first listed paths take priority.
+
+        :param list paths: plugin paths (defaults to the external plugin paths).
+        :param list plugins: plugin names to filter.
+
+        :returns: list of loaded plugin names.
+        :rtype: list
+        """
+        if paths is None:
+            paths = self._external_plugin_paths
+
+        start = time.time()
+        stamps = scan_plugin_roots(paths)
+        self.timings['external_scan'] = time.time() - start
+
+        start = time.time()
+        imported = []
+        for path in reversed(stamps.keys()):
+            stamp = stamps.get(path)
+            if stamp is None:
+                log.warning('plugin path "%s" does not exist.' % path)
+                continue
+
+            for mod_name in get_modules(path):
+                if mod_name not in self._external_modules:
+                    self._external_modules.append(mod_name)
+
+            imported.extend(self._load_cached(path, self._load_builtins, plugins=plugins, stamp=stamp))
+            self.load_widgets(path, plugins=plugins, stamp=stamp)
+
+        self.timings['external'] = time.time() - start
+        return sorted(list(set(imported)))
+
+    def _load_cached(self, path, loader, plugins=[], stamp=None):
+        """
+        Register the node types found in a path from the plugin manifest. 
+        If the manifest is out of date, the path is scanned (importing its 
+        modules) with the given loader and the manifest is updated.
+
+        :param str path: path to scan.
+        :param function loader: scanning method (ie: PluginManager._load_builtins).
+        :param list plugins: plugin names to filter.
+        :param dict stamp: current file modification times of the path (see :func:`scan_directory`).
+
+        :returns: list of loaded plugin names.
+        :rtype: list
+        """
+        records = self._manifest.get(path, 'nodes', stamp=stamp) if self._lazy else None
+        if records is None:
+            imported = loader(path, plugins=plugins)
+            if self._lazy and not plugins:
+                self._manifest.set(path, 'nodes', dict([(n, record(self._node_data.get(n))) for n in imported]), stamp=stamp)
+            return imported
+
+        imported = []
+        for node_type, node_attrs in records.iteritems():
+            if not plugins or node_type in plugins:
+                self._node_data.update({node_type:PluginEntry(node_attrs)})
+                imported.append(node_type)
+        return sorted(imported)
 
     def _load_builtins(self, path, plugins=[]):
         """
@@ -335,6 +453,10 @@ class PluginManager(object):
         fexpr = re.compile(r"(?P<basename>.+?)(?P<fext>\.[^.]*$|$)")
 
         for loader, mod_name, is_pkg in pkgutil.walk_packages([path]):
+            # widget modules import PySide (see PluginManager.load_widgets)
+            if not self._widgets and mod_name.endswith('_widget'):
+                continue
+
             module = loader.find_module(mod_name).load_module(mod_name)
 
             modfn = module.__file__
@@ -371,7 +493,9 @@ class PluginManager(object):
                         globals()[cname] = obj
 
                     imported.append(node_type)                
-                    self._node_data.update({node_type:{'dagnode':globals()[cname], 'metadata':None, 'source':None, 'enabled':True, 'category':node_category, 'class':node_class}})
+                    self._node_data.update({node_type:PluginEntry({'dagnode':obj, 'metadata':None, 'source':None, 'enabled':True, 'category':node_category, 'class':node_class})})
+                    self._node_data.get(node_type).update(path=path, module=mod_name, class_name=cname, 
+                                                          default_name=getattr(obj, 'default_name', None))
 
                     # add source and metadata files
                     if os.path.exists(src_file):
@@ -382,7 +506,7 @@ class PluginManager(object):
 
         return sorted(list(set(imported)))
 
-    def load_widgets(self, path=None, plugins=[]):
+    def load_widgets(self, path=None, plugins=[], stamp=None):
         """
         Load built-in and external node widgets.
 
@@ -391,17 +515,27 @@ class PluginManager(object):
 
         :param str path: path to scan.
         :param list plugins: plugin names to filter.
+        :param dict stamp: current file modification times of the path (see :func:`scan_directory`).
         """
+        if not self._widgets:
+            return
+
         log.info('loading plugin widgets...')
 
         if path is None:
             path = self.default_plugin_path
 
-        widgets = self._load_widgets(path, plugins=plugins)
+        widgets = self._manifest.get(path, 'widgets', stamp=stamp) if self._lazy else None
+        if widgets is None:
+            widgets = self._load_widgets(path)
+            if self._lazy:
+                self._manifest.set(path, 'widgets', dict([(w, record(widgets.get(w))) for w in widgets]), stamp=stamp)
 
         # update the node data attribute with widget classes
         for node_type in widgets:
-            
+            if plugins and node_type not in plugins:
+                continue
+
             if node_type in self._node_data:
                 #print '# DEBUG: updating node "%s" with widget...' % node_type
                 self._node_data.get(node_type).update(widgets.get(node_type))
@@ -446,7 +580,8 @@ class PluginManager(object):
                     if cname not in globals():
                         globals()[cname] = obj
 
-                    imported.update({widget_type:{'widget':globals()[cname]}})
+                    imported.update({widget_type:{'widget':obj, 'widget_path':path, 
+                                                  'widget_module':mod_name, 'widget_class':cname}})
 
         return imported
 
@@ -459,14 +594,15 @@ class PluginManager(object):
         :returns: list of external module paths.
         :rtype: list
         """
-        result = []
+        candidates = []
         for p in sys.path:
             ppath = os.path.join(p, dirname)
-            if os.path.exists(ppath):
-                if os.path.exists(os.path.join(ppath, '__init__.py')):
-                    if ppath not in result:
-                        result.append(ppath)
-        return result
+            if ppath not in candidates:
+                candidates.append(ppath)
+
+        # probe the candidates concurrently (paths may be network mounts)
+        found = parallel_map(lambda x: os.path.isfile(os.path.join(x, '__init__.py')), candidates)
+        return [ppath for ppath, is_pkg in zip(candidates, found) if is_pkg]
 
     @property
     def valid_plugins(self):
@@ -478,10 +614,8 @@ class PluginManager(object):
             if not enabled:
                 continue
 
-            dag = pattrs.get('dagnode', None)
-            widget = pattrs.get('widget', None)
-
-            if dag is None or widget is None:
+            # check without importing lazily loaded plugins
+            if 'dagnode' not in pattrs or 'widget' not in pattrs:
                 continue
 
             if pname not in result:
@@ -556,6 +690,10 @@ class PluginManager(object):
         :rtype: str 
         """
         if nodetype in self._node_data:
+            # read the name from the manifest if the plugin isn't imported yet
+            if dict.get(self._node_data.get(nodetype), 'default_name'):
+                return dict.get(self._node_data.get(nodetype), 'default_name')
+
             cls = self._node_data.get(nodetype).get('dagnode')
             if cls:
                 if hasattr(cls, 'default_name'):
@@ -592,9 +730,28 @@ class PluginManager(object):
             if plug == plugin:
                 log.info('setting plugin "%s" enabled: %s' % (plugin, str(enabled)))
                 self._node_data.get(plugin).update(enabled=enabled)
+                self._enabled[plugin] = enabled
                 return True
         return False
 
+    def refresh(self):
+        """
+        Re-read the default plugins from the shared registry (see 
+        :func:`PluginRegistry.refresh`). Plugins enabled/disabled
+        with :func:`PluginManager.enable` keep their state.
+        """
+        if not self._shared:
+            self.flush()
+            self.load_core()
+            self.load_plugins(self._default_plugin_path)
+            self.load_widgets(self._default_plugin_path)
+        else:
+            self._node_data = get_registry().node_data()
+
+        for plugin, enabled in self._enabled.iteritems():
+            if plugin in self._node_data:
+                self._node_data.get(plugin).update(enabled=enabled)
+
     def flush(self):
         """
         Flush all currently loaded plugins.
@@ -615,8 +772,397 @@ class PluginManager(object):
         self._default_modules = []
 
 
+#- Registry ------
+
+class PluginRegistry(object):
+    """
+    Process-wide registry of the default (core & builtin) plugins, shared 
+    by all PluginManagers. Plugins are scanned the first time they're 
+    requested, and again after the registry is invalidated. Access is 
+    thread-safe.
+
+    :param bool lazy: use the plugin manifest & import plugins on demand.
+    :param str manifest: plugin manifest file.
+    """
+    def __init__(self, lazy=True, manifest=SCENEGRAPH_PLUGIN_MANIFEST):
+
+        self.lazy        = lazy
+        self.manifest    = manifest
+        self.generation  = 0        # incremented each time the plugins are scanned
+
+        self._node_data  = None
+        self._lock       = threading.RLock()
+
+    def _scan(self):
+        """
+        Scan the default plugin paths.
+        """
+        manager = PluginManager(shared=False, lazy=self.lazy, manifest=self.manifest)
+        self._node_data = manager._node_data
+        self.generation += 1
+
+    def node_data(self):
+        """
+        Returns a copy of the plugin data. Lazily loaded plugin classes are
+        shared with the registry, so each plugin is only imported once.
+
+        :returns: dictionary of {node type: plugin data}
+        :rtype: dict
+        """
+        with self._lock:
+            if self._node_data is None:
+                self._scan()
+            return dict([(k, v.copy()) for k, v in self._node_data.iteritems()])
+
+    def invalidate(self, manifest=False):
+        """
+        Mark the registry out of date. Plugins are scanned again the next 
+        time they are requested.
+
+        :param bool manifest: clear the plugin manifest as well.
+        """
+        with self._lock:
+            self._node_data = None
+            if manifest:
+                PluginManifest(self.manifest).clear()
+
+    def refresh(self, manifest=False):
+        """
+        Scan the plugins again. Existing managers are updated with 
+        :func:`PluginManager.refresh`.
+
+        :param bool manifest: clear the plugin manifest as well.
+        """
+        with self._lock:
+            self.invalidate(manifest=manifest)
+            self._scan()
+
+
+# shared plugin registry (see get_registry)
+REGISTRY = None
+REGISTRY_LOCK = threading.Lock()
+
+
+def get_registry():
+    """
+    Returns the process-wide plugin registry.
+
+    :returns: plugin registry.
+    :rtype: PluginRegistry
+    """
+    global REGISTRY
+    with REGISTRY_LOCK:
+        if REGISTRY is None:
+            REGISTRY = PluginRegistry(manifest=default_manifest())
+        return REGISTRY
+
+
+#- Manifest ------
+
+class PluginEntry(dict):
+    """
+    Plugin data dictionary. If the dag node or widget class of a plugin 
+    hasn't been imported, it is imported the first time it's accessed, 
+    using the module & class names recorded in the plugin manifest.
+    """
+    LAZY_KEYS = {
+        'dagnode': ('path', 'module', 'class_name'),
+        'widget': ('widget_path', 'widget_module', 'widget_class'),
+        }
+
+    def __getitem__(self, key):
+        if key in self.LAZY_KEYS and not dict.__contains__(self, key):
+            if not dict.get(self, self.LAZY_KEYS.get(key)[1]):
+                raise KeyError(key)
+
+            base = getattr(self, '_base', None)
+            if base is not None:
+                dict.__setitem__(self, key, base[key])
+                return dict.__getitem__(self, key)
+
+            path, mod_name, cname = [dict.get(self, k) for k in self.LAZY_KEYS.get(key)]
+            module = load_plugin_module(path, mod_name)
+            obj = getattr(module, cname)
+            if cname not in globals():
+                globals()[cname] = obj
+            dict.__setitem__(self, key, obj)
+        return dict.__getitem__(self, key)
+
+    def __contains__(self, key):
+        if dict.__contains__(self, key):
+            return True
+        if key in self.LAZY_KEYS:
+            return bool(dict.get(self, self.LAZY_KEYS.get(key)[1]))
+        return False
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def copy(self):
+        """
+        Returns a copy of the entry. Lazily loaded classes are resolved
+        through (and cached on) the original entry.
+
+        :rtype: PluginEntry
+        """
+        entry = PluginEntry(dict.items(self))
+        entry._base = self
+        return entry
+
+    @property
+    def loaded(self):
+        """
+        Returns true if the dag node class has been imported.
+
+        :rtype: bool
+        """
+        return dict.__contains__(self, 'dagnode')
+
+
+class PluginManifest(object):
+    """
+    On-disk cache of plugin scan results, stored per directory. An entry
+    is valid as long as no python or metadata file in the directory is 
+    added, removed or modified since it was scanned.
+
+    :param str filename: manifest file.
+    """
+    def __init__(self, filename=None):
+
+        self.filename = filename
+        self._data    = None
+
+    def _read(self):
+        if self._data is not None:
+            return self._data
+
+        self._data = dict()
+        if self.filename and os.path.exists(self.filename):
+            try:
+                data = json.load(open(self.filename))
+                if data.get('version') == sys.version[:3]:
+                    self._data = data.get('paths', dict())
+            except Exception as err:
+                log.warning('cannot read plugin manifest "%s": %s' % (self.filename, err))
+        return self._data
+
+    def _write(self):
+        """
+        Write the manifest to a temporary file, then move it over the
+        original, so a failed write never leaves a truncated manifest.
+        Errors are logged, as the manifest is only a cache.
+        """
+        if not self.filename:
+            return
+        tmpname = None
+        try:
+            dirname = os.path.dirname(os.path.abspath(self.filename))
+            if not os.path.exists(dirname):
+                os.makedirs(dirname)
+            fd, tmpname = tempfile.mkstemp(prefix='.%s.' % os.path.basename(self.filename), suffix='.tmp', dir=dirname)
+            with os.fdopen(fd, 'w') as fn:
+                json.dump({'version':sys.version[:3], 'paths':self._data}, fn, indent=4)
+            if sys.platform == 'win32' and os.path.exists(self.filename):
+                os.remove(self.filename)
+            os.rename(tmpname, self.filename)
+            tmpname = None
+        except Exception as err:
+            log.warning('cannot write plugin manifest "%s": %s' % (self.filename, err))
+        finally:
+            if tmpname and os.path.exists(tmpname):
+                os.remove(tmpname)
+
+    def stamp(self, path):
+        """
+        Returns the modification times of the plugin files in a path.
+
+        :param str path: directory to query.
+
+        :returns: dictionary of {filename: mtime}
+        :rtype: dict
+        """
+        return scan_directory(path)
+
+    def get(self, path, kind, stamp=None):
+        """
+        Returns the cached scan results for a path, or None if they 
+        are missing or out of date.
+
+        :param str path: scanned directory.
+        :param str kind: scan type (nodes or widgets).
+        :param dict stamp: current file modification times (computed if not passed).
+
+        :returns: dictionary of {type: plugin data}
+        :rtype: dict
+        """
+        entry = self._read().get('%s:%s' % (kind, os.path.abspath(path)))
+        if not entry:
+            return
+        if entry.get('stamp') != (stamp if stamp is not None else self.stamp(path)):
+            return
+        return entry.get('plugins')
+
+    def set(self, path, kind, plugins, stamp=None):
+        """
+        Cache scan results for a path.
+
+        :param str path: scanned directory.
+        :param str kind: scan type (nodes or widgets).
+        :param dict plugins: dictionary of {type: plugin data}
+        :param dict stamp: current file modification times (computed if not passed).
+        """
+        if stamp is None:
+            stamp = self.stamp(path)
+        self._read()['%s:%s' % (kind, os.path.abspath(path))] = {'stamp':stamp, 'plugins':plugins}
+        self._write()
+
+    def clear(self):
+        """
+        Remove all cached scan results.
+        """
+        self._data = dict()
+        self._write()
+
+
+def record(plugin_data):
+    """
+    Returns the serializable part of a plugin data dictionary
+    (ie: without the imported classes).
+
+    :param dict plugin_data: plugin data.
+
+    :returns: manifest record.
+    :rtype: dict
+    """
+    return dict([(k, v) for k, v in dict.items(plugin_data) if k not in PluginEntry.LAZY_KEYS])
+
+
+def load_plugin_module(path, mod_name):
+    """
+    Import a plugin module from a path. Modules already imported
+    from the same path are reused.
+
+    :param str path: directory containing the module.
+    :param str mod_name: module name.
+
+    :returns: imported module.
+    :rtype: module
+    """
+    module = sys.modules.get(mod_name)
+    if module is not None and getattr(module, '__file__', None):
+        if os.path.dirname(os.path.abspath(module.__file__)) == os.path.abspath(path):
+            return module
+    return pkgutil.get_importer(path).find_module(mod_name).load_module(mod_name)
+
+
 #- Utilities ------
 
+def default_manifest():
+    """
+    Returns the default plugin manifest file. In headless mode, the
+    manifest is only used if it is set with the SCENEGRAPH_PLUGIN_MANIFEST 
+    environment variable.
+
+    :returns: manifest file (or None).
+    :rtype: str
+    """
+    if options.HEADLESS and not os.getenv('SCENEGRAPH_PLUGIN_MANIFEST'):
+        return None
+    return options.SCENEGRAPH_PLUGIN_MANIFEST
+
+
+# files that invalidate a manifest entry when changed
+PLUGIN_EXTENSIONS = ('.py', '.mtd')
+
+
+def scan_directory(path):
+    """
+    Returns the modification times of the plugin files (python & metadata) 
+    in a directory (recursively). Uses os.scandir (or the scandir module) when available, 
+    so that directory entries and stats are read in batches.
+
+    :param str path: directory to scan.
+
+    :returns: dictionary of {relative filename: mtime}
+    :rtype: dict
+    """
+    result = dict()
+    if scandir is None:
+        for root, dirs, files in os.walk(path):
+            for fname in files:
+                if fname.endswith(PLUGIN_EXTENSIONS):
+                    filename = os.path.join(root, fname)
+                    result[os.path.relpath(filename, path)] = os.path.getmtime(filename)
+        return result
+
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = list(scandir(current))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir():
+                stack.append(entry.path)
+            elif entry.name.endswith(PLUGIN_EXTENSIONS) and entry.is_file():
+                result[os.path.relpath(entry.path, path)] = entry.stat().st_mtime
+    return result
+
+
+def parallel_map(func, items, workers=8):
+    """
+    Map a function over items using a thread pool. Results 
+    are returned in the order of the items.
+
+    :param function func: function to call.
+    :param list items: function arguments.
+    :param int workers: maximum number of threads.
+
+    :returns: list of results.
+    :rtype: list
+    """
+    items = list(items)
+    if len(items) < 2:
+        return [func(item) for item in items]
+
+    from multiprocessing.pool import ThreadPool
+
+    pool = ThreadPool(min(workers, len(items)))
+    try:
+        return pool.map(func, items)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def scan_plugin_roots(paths, workers=8):
+    """
+    Scan plugin directories concurrently. Duplicate paths are removed, 
+    keeping the first occurrence (highest priority).
+
+    :param list paths: plugin directories, in priority order.
+    :param int workers: maximum number of threads.
+
+    :returns: dictionary of {path: file modification times} (None for missing paths), in priority order.
+    :rtype: OrderedDict
+    """
+    roots = []
+    for path in paths:
+        if path and path not in roots:
+            roots.append(path)
+
+    def scan_root(path):
+        if not os.path.isdir(path):
+            return
+        return scan_directory(path)
+
+    return OrderedDict(zip(roots, parallel_map(scan_root, roots, workers=workers)))
+
+
 def get_modules(path):
     """
     Returns all sub-modules of this package.
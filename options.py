@@ -38,6 +38,11 @@ API_MINIMUM                     = 0.64
 # initialize globals
 PLATFORM, USER_HOME             = setup_platform_defaults()
 
+# headless profile (servers & render farm workers): no UI plugins are loaded,
+# and nothing is written to the user prefs directory unless configured.
+# Set before importing SceneGraph.core.
+HEADLESS                        = os.getenv('SCENEGRAPH_HEADLESS', '').lower() in ['1', 'true', 'yes', 'on']
+
 SCENEGRAPH_PATH                 = os.path.dirname(__file__)
 SCENEGRAPH_CORE                 = os.path.join(SCENEGRAPH_PATH, 'core')
 SCENEGRAPH_PLUGIN_PATH          = os.path.join(SCENEGRAPH_PATH, 'plugins')
@@ -50,8 +55,20 @@ SCENEGRAPH_CONFIG_PATH          = os.path.join(SCENEGRAPH_PATH, 'cfg')
 SCENEGRAPH_METADATA_PATH        = os.path.join(SCENEGRAPH_PATH, 'mtd')
 
 SCENEGRAPH_PREFS_PATH           = os.path.join(USER_HOME, '.config', PACKAGE)
+SCENEGRAPH_PLUGIN_MANIFEST      = os.getenv('SCENEGRAPH_PLUGIN_MANIFEST') or os.path.join(SCENEGRAPH_PREFS_PATH, 'plugin_manifest.json')
+SCENEGRAPH_LOG_FILE             = os.getenv('SCENEGRAPH_LOG_FILE')      # overrides the default log file
+SCENEGRAPH_UI_CACHE             = os.path.join(SCENEGRAPH_PREFS_PATH, 'ui_cache')
 SCENEGRAPH_USER_WORK_PATH       = os.path.join(USER_HOME, 'graphs')
 
+# scenes with more nodes than this only create widgets for visible nodes (0 disables)
+SCENEGRAPH_VIRTUAL_THRESHOLD    = int(os.getenv('SCENEGRAPH_VIRTUAL_THRESHOLD', 2000))
+
+# scenes with more edges than this draw them in a single batched layer (0 disables)
+SCENEGRAPH_EDGE_LAYER_THRESHOLD = int(os.getenv('SCENEGRAPH_EDGE_LAYER_THRESHOLD', 2000))
+
+# cache node widgets in device coordinates (see GraphicsScene.updateCacheModes)
+SCENEGRAPH_CACHE_NODES          = os.getenv('SCENEGRAPH_CACHE_NODES', '1') not in ['0', 'false', 'False']
+
 
 
 SCENEGRAPH_COLORS = {
@@ -128,7 +145,9 @@ SCENEGRAPH_PREFERENCES = {
   "stylesheet_name": { "default": "default", "desc": "Stylesheet to use.", "label": "Stylesheet", "class": "global" },
   "palette_style": { "default": "default", "desc": "Color palette to use.", "label": "Palette", "class": "global" },
   "font_style": { "default": "default", "desc": "font style to use.", "label": "Font style", "class": "global" },
-  "viewport_mode": { "default": "smart", "desc": "viewport update mode.", "label": "Viewport Mode", "class": "global" }
+  "viewport_mode": { "default": "smart", "desc": "viewport update mode.", "label": "Viewport Mode", "class": "global" },
+  "lod_simple": { "default": 0.5, "desc": "Draw simplified nodes below this zoom level.", "label": "Simplify below", "class": "global" },
+  "lod_flat": { "default": 0.2, "desc": "Draw flat nodes (no labels or terminals) below this zoom level.", "label": "Flatten below", "class": "global" }
 }
     
 
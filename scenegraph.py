@@ -3,9 +3,6 @@ from PySide import QtCore, QtGui
 from functools import partial
 import os
 import re
-import pysideuic
-import xml.etree.ElementTree as xml
-from cStringIO import StringIO
 import simplejson as json
 
 from SceneGraph import options
@@ -16,38 +13,14 @@ from SceneGraph.ui import settings
 from SceneGraph.ui import models
 from SceneGraph.ui import attributes
 from SceneGraph.ui import graphics
+from SceneGraph.ui import node_widgets
+from SceneGraph.ui.forms import loadUiType
 
 
 log = core.log
 SCENEGRAPH_UI = options.SCENEGRAPH_UI
 
 
-def loadUiType(uiFile):
-    """
-    Pyside lacks the "loadUiType" command, so we have to convert the ui file to py code in-memory first
-    and then execute it in a special frame to retrieve the form_class.
-    """
-    parsed = xml.parse(uiFile)
-    widget_class = parsed.find('widget').get('class')
-    form_class = parsed.find('class').text
-
-    with open(uiFile, 'r') as f:
-        o = StringIO()
-        frame = {}
-
-        pysideuic.compileUi(f, o, indent=0)
-        pyc = compile(o.getvalue(), '<string>', 'exec')
-        try:
-            exec pyc in frame
-        except ImportError as err:
-            log.warning('loadUi: %s' % err)              
-
-        #Fetch the base_class and form class based on their type in the xml from designer
-        form_class = frame['Ui_%s'%form_class]
-        base_class = eval('QtGui.%s'%widget_class)
-    return form_class, base_class
-
-
 #If you put the .ui file for this example elsewhere, just change this path.
 form_class, base_class = loadUiType(SCENEGRAPH_UI)
 
@@ -57,6 +30,8 @@ class SceneGraphUI(form_class, base_class):
         super(SceneGraphUI, self).__init__(parent)
         from SceneGraph.icn import icons 
 
+        # stylesheet images are read from the compiled resources
+        icons.load_resources()
         self.setupUi(self)        
         self.setDockNestingEnabled(True)
         #self.setWindowFlags(QtCore.Qt.WindowStaysOnTopHint)
@@ -95,6 +70,8 @@ class SceneGraphUI(form_class, base_class):
         self.viewport_mode        = kwargs.get('viewport_mode', 'smart')
         self.render_fx            = kwargs.get('render_fx', True)
         self.antialiasing         = 2
+        self.lod_simple           = kwargs.get('lod_simple', options.SCENEGRAPH_PREFERENCES.get('lod_simple').get('default'))
+        self.lod_flat             = kwargs.get('lod_flat', options.SCENEGRAPH_PREFERENCES.get('lod_flat').get('default'))
         self.environment          = kwargs.get('env', 'standalone')
 
         # setup default user path
@@ -269,7 +246,7 @@ class SceneGraphUI(form_class, base_class):
             for plugin in self.graph.plug_mgr.node_types():
                 if plugin not in self._valid_plugins:
                     log.info('disabling plugin "%s"' % plugin)
-                    self.graph.plug_mgr.node_types().get(plugin).update(enabled=False)
+                    self.graph.plug_mgr.enable(plugin, False)
         
     def connectSignals(self):
         """
@@ -321,6 +298,8 @@ class SceneGraphUI(form_class, base_class):
         self.logging_level_menu.currentIndexChanged.connect(self.toggleLoggingLevel)
         self.check_render_fx.toggled.connect(self.toggleEffectsRendering)
         self.autosave_time_edit.editingFinished.connect(self.setAutosaveDelay)
+        self.lod_simple_spinbox.valueChanged.connect(self.levelOfDetailChangedAction)
+        self.lod_flat_spinbox.valueChanged.connect(self.levelOfDetailChangedAction)
         self.app_style_menu.currentIndexChanged.connect(self.applicationStyleChanged)
 
         self.ui_font_menu.currentIndexChanged.connect(self.stylesheetChangedAction)
@@ -489,6 +468,8 @@ class SceneGraphUI(form_class, base_class):
         font_family_nodes = kwargs.pop('font_family_nodes', self.font_family_nodes)
         use_gl = kwargs.pop('use_gl', self.use_gl)
         font_family_mono = kwargs.pop('font_family_mono', self.font_family_mono)
+        lod_simple = kwargs.pop('lod_simple', self.lod_simple)
+        lod_flat = kwargs.pop('lod_flat', self.lod_flat)
 
         self.ignore_scene_prefs_check.blockSignals(True)
         self.edge_type_menu.blockSignals(True)
@@ -506,6 +487,8 @@ class SceneGraphUI(form_class, base_class):
         self.stylesheet_menu.blockSignals(True)
         self.palette_style_menu.blockSignals(True)
         self.font_style_menu.blockSignals(True)
+        self.lod_simple_spinbox.blockSignals(True)
+        self.lod_flat_spinbox.blockSignals(True)
         
 
         # global preferences
@@ -553,6 +536,11 @@ class SceneGraphUI(form_class, base_class):
         # autosave prefs
         self.autosave_time_edit.setText(str(autosave_inc/1000))
 
+        # level of detail thresholds
+        self.lod_simple_spinbox.setValue(float(lod_simple))
+        self.lod_flat_spinbox.setValue(float(lod_flat))
+        node_widgets.set_lod_thresholds(simple=lod_simple, flat=lod_flat)
+
         # application style
         app = QtGui.QApplication.instance()
         current_style = app.style().metaObject().className()
@@ -611,6 +599,8 @@ class SceneGraphUI(form_class, base_class):
         self.stylesheet_menu.blockSignals(False)
         self.palette_style_menu.blockSignals(False)
         self.font_style_menu.blockSignals(False)        
+        self.lod_simple_spinbox.blockSignals(False)
+        self.lod_flat_spinbox.blockSignals(False)
 
     def buildWindowTitle(self):
         """
@@ -886,9 +876,21 @@ class SceneGraphUI(form_class, base_class):
         for node in self.view.scene().scenenodes.values():
             if hasattr(node, '_render_effects'):
                 node._render_effects = self.render_fx 
+                if hasattr(node, 'setLevelOfDetail'):
+                    node.setLevelOfDetail(node._lod)
                 node.update()
         self.view.scene().update()
 
+    def levelOfDetailChangedAction(self):
+        """
+        Update the node level of detail thresholds.
+        """
+        self.lod_simple = self.lod_simple_spinbox.value()
+        self.lod_flat = self.lod_flat_spinbox.value()
+        node_widgets.set_lod_thresholds(simple=self.lod_simple, flat=self.lod_flat)
+        self.view.scene().updateZoom(force=True)
+        self.view.scene().update()
+
     def toggleLoggingLevel(self):
         """
         Toggle the logging level.
@@ -1421,6 +1423,13 @@ class SceneGraphUI(form_class, base_class):
         if autosave_inc is None:
             autosave_inc = options.SCENEGRAPH_PREFERENCES.get('autosave_inc').get('default')
 
+        # level of detail thresholds (global)
+        for attr in ['lod_simple', 'lod_flat']:
+            if attr not in kwargs:
+                value = self.qsettings.value(attr)
+                if value is not None:
+                    setattr(self, attr, float(value))
+
         # update valid plugin types
         plugins = self.qsettings.value("plugins")
         if plugins:
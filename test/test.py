@@ -2,11 +2,9 @@
 from PySide import QtCore, QtGui
 from functools import partial
 import os
-import pysideuic
-import xml.etree.ElementTree as xml
-from cStringIO import StringIO
 from SceneGraph import core 
 from SceneGraph import options
+from SceneGraph.ui.forms import loadUiType
 
 log = core.log
 
@@ -15,29 +13,6 @@ SCENEGRAPH_TEST_PATH = options.SCENEGRAPH_TEST_PATH
 SCENEGRAPH_TEST_UI = os.path.join(SCENEGRAPH_TEST_PATH, 'TestGraph.ui')
 
 
-def loadUiType(uiFile):
-    """
-    Pyside lacks the "loadUiType" command, so we have to convert the ui file to py code in-memory first
-    and then execute it in a special frame to retrieve the form_class.
-    """
-    parsed = xml.parse(uiFile)
-    widget_class = parsed.find('widget').get('class')
-    form_class = parsed.find('class').text
-
-    with open(uiFile, 'r') as f:
-        o = StringIO()
-        frame = {}
-
-        pysideuic.compileUi(f, o, indent=0)
-        pyc = compile(o.getvalue(), '<string>', 'exec')
-        exec pyc in frame
-
-        #Fetch the base_class and form class based on their type in the xml from designer
-        form_class = frame['Ui_%s'%form_class]
-        base_class = eval('QtGui.%s'%widget_class)
-    return form_class, base_class
-
-
 # load the ui file
 form_class, base_class = loadUiType(SCENEGRAPH_TEST_UI)
 
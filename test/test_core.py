@@ -0,0 +1,557 @@
+#!/usr/bin/env python
+"""
+Unit tests for the core API. These don't require Qt.
+
+    python -m unittest discover -s SceneGraph/test -p "test_*.py" -t .
+"""
+import os
+import sys
+import gc
+import shutil
+import subprocess
+import tempfile
+import time
+import weakref
+import unittest
+
+from SceneGraph import options
+
+# without Qt, node widgets can't be loaded (see test_ui)
+try:
+    import PySide
+except ImportError:
+    options.HEADLESS = True
+
+from SceneGraph.core import events, graph, layout, metadata, nodes, plugins
+from SceneGraph.tools import importtime, panbench
+
+
+# time allowed to import the core API (milliseconds)
+IMPORT_BUDGET = 250.0
+
+
+class MetadataPrototypeTest(unittest.TestCase):
+    """
+    Metadata is parsed once per node class, and shared between nodes.
+    """
+    def setUp(self):
+        self.data = metadata.freeze({'Node Attributes': {'width': {'default': 100.0}}})
+
+    def test_frozen_is_read_only(self):
+        self.assertRaises(TypeError, self.data.__setitem__, 'section', {})
+        self.assertRaises(TypeError, self.data.pop, 'Node Attributes')
+        self.assertRaises(TypeError, self.data.get('Node Attributes').update, {})
+        self.assertRaises(TypeError, self.data.get('Node Attributes').get('width').clear)
+
+    def test_thaw_copies(self):
+        data = metadata.thaw(self.data)
+        data['Node Attributes']['width']['default'] = 50.0
+        self.assertEqual(self.data['Node Attributes']['width']['default'], 100.0)
+
+    def test_nodes_share_prototype(self):
+        n1 = nodes.DagNode(name='node1')
+        n2 = nodes.DagNode(name='node2')
+
+        self.assertIs(n1.metadata_prototype(), n2.metadata_prototype())
+        self.assertTrue(n1.metadata.sections())
+        for section in n1.metadata.sections():
+            self.assertIs(n1.metadata.data.get(section), n2.metadata.data.get(section))
+
+    def test_edit_copies_section(self):
+        n1 = nodes.DagNode(name='node1')
+        n2 = nodes.DagNode(name='node2')
+        section = n1.metadata.sections()[0]
+
+        n1.metadata.edit(section)['test_attr'] = {'default': 1}
+        self.assertIsNot(n1.metadata.data.get(section), n2.metadata.data.get(section))
+        self.assertNotIn('test_attr', n2.metadata.data.get(section))
+        self.assertNotIn('test_attr', n2.metadata_prototype().get(section))
+
+
+class EventBatchTest(unittest.TestCase):
+    """
+    Events are queued while batching, and delivered as a single 
+    coalesced event when the batch ends.
+    """
+    def setUp(self):
+        self.calls = []
+        self.handler = events.EventHandler(self, name='test')
+        self.handler += self.callback
+
+    def callback(self, sender, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        return len(self.calls)
+
+    def test_dispatch(self):
+        self.assertEqual(self.handler('a', x=1), [1])
+        self.assertEqual(self.calls, [(('a',), {'x': 1})])
+
+    def test_batch_queues_events(self):
+        self.handler.beginBatch()
+        self.assertEqual(self.handler('a'), [])
+        self.assertEqual(self.calls, [])
+
+        self.assertEqual(self.handler.endBatch(), [1])
+        self.assertEqual(len(self.calls), 1)
+
+    def test_nested_batch(self):
+        self.handler.beginBatch()
+        self.handler.beginBatch()
+        self.handler('a')
+        self.handler.endBatch()
+        self.assertEqual(self.calls, [])
+
+        self.handler.endBatch()
+        self.assertEqual(len(self.calls), 1)
+
+    def test_batch_coalesces_events(self):
+        self.handler.beginBatch()
+        self.handler(['a', 'b'], x=1)
+        self.handler('b', 'c', x=2)
+        self.handler.endBatch()
+        self.assertEqual(self.calls, [((['a', 'b', 'c'],), {'x': 2})])
+
+    def test_batch_without_coalesce(self):
+        handler = events.EventHandler(self, name='test', coalesce=None)
+        handler += self.callback
+
+        handler.beginBatch()
+        handler('a')
+        handler('b')
+        handler.endBatch()
+        self.assertEqual(self.calls, [(('a',), {}), (('b',), {})])
+
+    def test_graph_batch(self):
+        g = graph.Graph()
+        added = []
+        g.nodesAdded.add(lambda sender, *args, **kwargs: added.append(args))
+
+        with g.batch():
+            dags = [g.add_node('default', name='node%d' % i) for i in range(3)]
+            self.assertEqual(added, [])
+
+        self.assertEqual(len(added), 1)
+        self.assertEqual(sorted(added[0][0]), sorted([dag.id for dag in dags]))
+
+    def test_graph_batch_node_events(self):
+        g = graph.Graph()
+        dags = [g.add_node('default', name='node%d' % i) for i in range(3)]
+        moved = []
+        dags[0].nodePositionChanged.add(lambda sender, *args, **kwargs: moved.append(kwargs.get('pos')))
+
+        with g.batch():
+            dags[0].pos = [10.0, 10.0]
+            dags[0].pos = [20.0, 20.0]
+            self.assertEqual(moved, [])
+
+            # nodes only join the batch when they emit an event
+            self.assertTrue(dags[0].nodePositionChanged.batching)
+            self.assertFalse(dags[1].nodePositionChanged.batching)
+
+        self.assertEqual(moved, [[20.0, 20.0]])
+        self.assertFalse(dags[0].nodePositionChanged.batching)
+
+        dags[0].pos = [30.0, 30.0]
+        self.assertEqual(moved, [[20.0, 20.0], [30.0, 30.0]])
+
+
+class Listener(object):
+    def __init__(self):
+        self.calls = 0
+
+    def callback(self, sender, *args, **kwargs):
+        self.calls += 1
+
+
+class WeakCallbackTest(unittest.TestCase):
+    """
+    Weak handlers don't keep their listeners alive.
+    """
+    def test_weak_callback(self):
+        handler = events.EventHandler(self, weak=True)
+        listener = Listener()
+        handler += listener.callback
+
+        handler()
+        self.assertEqual(listener.calls, 1)
+
+        ref = weakref.ref(listener)
+        del listener
+        gc.collect()
+        self.assertIsNone(ref())
+        self.assertEqual(len(handler), 0)
+        self.assertEqual(handler(), [])
+
+    def test_strong_callback(self):
+        handler = events.EventHandler(self)
+        listener = Listener()
+        handler += listener.callback
+
+        ref = weakref.ref(listener)
+        del listener
+        gc.collect()
+        self.assertIsNotNone(ref())
+        handler()
+        self.assertEqual(ref().calls, 1)
+
+    def test_weak_function(self):
+        handler = events.EventHandler(self, weak=True)
+        calls = []
+        handler += lambda sender: calls.append(sender)
+        gc.collect()
+
+        handler()
+        self.assertEqual(calls, [self])
+
+    def test_discard(self):
+        handler = events.EventHandler(self, weak=True)
+        listener = Listener()
+        handler += listener.callback
+
+        handler.discard(listener.callback)
+        self.assertEqual(len(handler), 0)
+
+    def test_node_listener_released(self):
+        dag = nodes.DagNode(name='node1')
+        listener = Listener()
+        dag.nodeAttributeUpdated += listener.callback
+
+        dag.color = [255, 0, 0, 255]
+        self.assertEqual(listener.calls, 1)
+
+        ref = weakref.ref(listener)
+        del listener
+        gc.collect()
+        self.assertIsNone(ref())
+        self.assertEqual(len(dag.nodeAttributeUpdated), 0)
+
+
+class AsyncDispatcherTest(unittest.TestCase):
+    """
+    A full event queue slows the producer down instead of dropping events.
+    """
+    def setUp(self):
+        self.received = []
+
+    def slowCallback(self, sender, value):
+        time.sleep(0.02)
+        self.received.append(value)
+
+    def test_back_pressure(self):
+        dispatcher = events.AsyncDispatcher(maxsize=1)
+        start = time.time()
+        for i in range(10):
+            self.assertTrue(dispatcher.post(self, self.slowCallback, (i,)))
+        elapsed = time.time() - start
+        dispatcher.join()
+        dispatcher.shutdown()
+
+        # the producer waited on the listener, and nothing was lost
+        self.assertGreaterEqual(elapsed, 0.1)
+        self.assertEqual(dispatcher.dropped, 0)
+        self.assertEqual(self.received, list(range(10)))
+
+    def test_drop(self):
+        dispatcher = events.AsyncDispatcher(maxsize=1, block=False)
+        results = [dispatcher.post(self, self.slowCallback, (i,)) for i in range(10)]
+        dispatcher.join()
+        dispatcher.shutdown()
+
+        self.assertIn(False, results)
+        self.assertEqual(dispatcher.dropped, results.count(False))
+        self.assertEqual(len(self.received), results.count(True))
+
+    def test_post_from_worker(self):
+        dispatcher = events.AsyncDispatcher(maxsize=1)
+
+        def repost(sender, value):
+            if value:
+                dispatcher.post(sender, repost, (value - 1,))
+            self.received.append(value)
+
+        dispatcher.post(self, repost, (3,))
+        dispatcher.join()
+        dispatcher.shutdown()
+        self.assertEqual(self.received, [3, 2, 1, 0])
+
+
+@unittest.skipUnless(layout.LayoutStore.available(), 'requires numpy')
+class LayoutStoreTest(unittest.TestCase):
+    """
+    Node rectangles are queried from the layout store arrays.
+    """
+    def setUp(self):
+        self.store = layout.LayoutStore(capacity=2)
+        self.slots = [self.store.allocate(pos=(x, 0.0), width=100.0, height=20.0, owner='node%d' % i) for i, x in enumerate([0.0, 200.0, 400.0])]
+
+    def test_hit_test_point(self):
+        self.assertEqual(self.store.hit_test(10.0, 5.0).tolist(), [self.slots[0]])
+        self.assertEqual(self.store.hit_test(100.0, 0.0).tolist(), [])
+
+    def test_hit_test_rect(self):
+        self.assertEqual(self.store.hit_test(150.0, -5.0, 450.0, 5.0).tolist(), self.slots[1:])
+        # corners can be passed in any order
+        self.assertEqual(self.store.hit_test(450.0, 5.0, 150.0, -5.0).tolist(), self.slots[1:])
+
+    def test_hit_test_contains(self):
+        self.assertEqual(self.store.hit_test(-60.0, -20.0, 240.0, 20.0, contains=True).tolist(), self.slots[:1])
+
+    def test_release(self):
+        self.store.release(self.slots[1])
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(self.store.hit_test(200.0, 0.0).tolist(), [])
+
+        slot = self.store.allocate(pos=(200.0, 0.0), owner='node3')
+        self.assertEqual(slot, self.slots[1])
+        self.assertEqual(self.store.items(self.store.hit_test(200.0, 0.0)), ['node3'])
+
+    def test_items(self):
+        self.assertEqual(self.store.items(), ['node0', 'node1', 'node2'])
+        self.assertEqual(self.store.items(self.store.hit_test(0.0, 0.0, 200.0, 0.0)), ['node0', 'node1'])
+
+    def test_bounds(self):
+        self.assertEqual(self.store.bounds(), (-50.0, -10.0, 450.0, 10.0))
+
+    def test_nodes_in_rect(self):
+        for use_layout in [True, False]:
+            g = graph.Graph(layout_store=use_layout)
+            self.assertEqual(g.layout is not None, use_layout)
+
+            dags = [g.add_node('default', name='node%d' % i, pos=[x, 0.0]) for i, x in enumerate([0.0, 200.0, 400.0])]
+            result = g.nodes_in_rect(150.0, -5.0, 450.0, 5.0)
+            self.assertEqual(sorted([dag.name for dag in result]), ['node1', 'node2'])
+
+    def test_edges_in_rect(self):
+        for use_layout in [True, False]:
+            g = graph.Graph(layout_store=use_layout)
+            src = g.add_node('merge', name='node0', pos=[0.0, 0.0])
+            dest = g.add_node('dot', name='node1', pos=[1000.0, 100.0])
+            g.add_edge(src, dest, src_attr='output', dest_attr='input')
+
+            # neither node is in the rect, but the edge crosses it
+            self.assertEqual(g.nodes_in_rect(400.0, 40.0, 600.0, 60.0), [])
+            self.assertEqual(g.edges_in_rect(400.0, 40.0, 600.0, 60.0), [(src.id, dest.id)])
+            self.assertEqual(g.edges_in_rect(400.0, 200.0, 600.0, 300.0), [])
+
+            # edges follow their nodes
+            dest.pos = [1000.0, 400.0]
+            self.assertEqual(g.edges_in_rect(400.0, 200.0, 600.0, 300.0), [(src.id, dest.id)])
+
+            g.remove_edge(src.id, dest.id)
+            self.assertEqual(g.edges_in_rect(400.0, 40.0, 600.0, 60.0), [])
+
+    def test_graph_bounds(self):
+        for use_layout in [True, False]:
+            g = graph.Graph(layout_store=use_layout)
+            self.assertIsNone(g.bounds())
+
+            dags = [g.add_node('default', name='node%d' % i, pos=[x, 0.0]) for i, x in enumerate([0.0, 200.0])]
+            x1, y1, x2, y2 = g.bounds()
+            self.assertEqual((x1, x2), (-50.0, 250.0))
+            self.assertEqual(g.bounds(dags[:1])[2], 50.0)
+            self.assertIsNone(g.bounds([]))
+
+    def test_node_pos(self):
+        g = graph.Graph()
+        dag = g.add_node('default', name='node0', pos=[10.0, 20.0])
+        self.assertEqual(dag.pos, [10.0, 20.0])
+
+        dag.pos = [30.0, 40.0]
+        self.assertEqual(dag.pos, [30.0, 40.0])
+        self.assertEqual(g.nodes_in_rect(30.0, 40.0, 30.0, 40.0), [dag])
+
+
+class NodeNameTest(unittest.TestCase):
+    """
+    Node names are validated by the graph, whatever order the 
+    rename callbacks are connected in.
+    """
+    def test_rename_validated(self):
+        g = graph.Graph()
+        g.add_node('default', name='node0')
+        dag = g.add_node('default', name='node1')
+
+        # connect a listener before the graph
+        listener = Listener()
+        dag.nodeNameChanged.discard(g.nodeNameChangedEvent)
+        dag.nodeNameChanged += listener.callback
+        dag.nodeNameChanged += g.nodeNameChangedEvent
+
+        dag.name = 'node0'
+        self.assertEqual(listener.calls, 1)
+        self.assertNotEqual(dag.name, 'node0')
+        self.assertTrue(dag.name.startswith('node'))
+
+
+PLUGIN_SOURCE = """
+from SceneGraph.core.nodes import DagNode
+
+class ManifestTestNode(DagNode):
+    node_type = 'manifest_test'
+    node_class = 'test'
+"""
+
+
+class PluginManifestTest(unittest.TestCase):
+    """
+    Plugin scan results are cached per directory, and plugin 
+    classes are imported on first access.
+    """
+    module_name = 'sg_manifest_test_node'
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.source = os.path.join(self.path, '%s.py' % self.module_name)
+        with open(self.source, 'w') as fn:
+            fn.write(PLUGIN_SOURCE)
+        self.filename = os.path.join(self.path, 'cache', 'plugins.json')
+
+    def tearDown(self):
+        sys.modules.pop(self.module_name, None)
+        shutil.rmtree(self.path)
+
+    def test_manifest_roundtrip(self):
+        data = {'manifest_test': {'module': self.module_name, 'class_name': 'ManifestTestNode'}}
+        plugins.PluginManifest(self.filename).set(self.path, 'nodes', data)
+
+        manifest = plugins.PluginManifest(self.filename)
+        self.assertEqual(manifest.get(self.path, 'nodes'), data)
+        self.assertIsNone(manifest.get(self.path, 'widgets'))
+
+    def test_manifest_invalidated(self):
+        plugins.PluginManifest(self.filename).set(self.path, 'nodes', {'manifest_test': {}})
+
+        # modified file
+        mtime = os.path.getmtime(self.source)
+        os.utime(self.source, (mtime + 10, mtime + 10))
+        self.assertIsNone(plugins.PluginManifest(self.filename).get(self.path, 'nodes'))
+
+        # added file
+        plugins.PluginManifest(self.filename).set(self.path, 'nodes', {'manifest_test': {}})
+        open(os.path.join(self.path, 'other.py'), 'w').close()
+        self.assertIsNone(plugins.PluginManifest(self.filename).get(self.path, 'nodes'))
+
+        # modified metadata
+        metadata_file = os.path.join(self.path, '%s.mtd' % self.module_name)
+        open(metadata_file, 'w').close()
+        plugins.PluginManifest(self.filename).set(self.path, 'nodes', {'manifest_test': {}})
+        mtime = os.path.getmtime(metadata_file)
+        os.utime(metadata_file, (mtime + 10, mtime + 10))
+        self.assertIsNone(plugins.PluginManifest(self.filename).get(self.path, 'nodes'))
+
+    def test_manifest_write_failed(self):
+        data = {'manifest_test': {'module': self.module_name}}
+        plugins.PluginManifest(self.filename).set(self.path, 'nodes', data)
+
+        # unserializable record: the previous manifest is kept
+        manifest = plugins.PluginManifest(self.filename)
+        manifest.set(self.path, 'widgets', {'manifest_test': {'class': object()}})
+        self.assertEqual(plugins.PluginManifest(self.filename).get(self.path, 'nodes'), data)
+        self.assertEqual(os.listdir(os.path.dirname(self.filename)), ['plugins.json'])
+
+    def test_entry_lazy_import(self):
+        entry = plugins.PluginEntry(path=self.path, module=self.module_name, class_name='ManifestTestNode')
+        self.assertTrue('dagnode' in entry)
+        self.assertFalse(entry.loaded)
+        self.assertNotIn(self.module_name, sys.modules)
+
+        self.assertEqual(entry['dagnode'].__name__, 'ManifestTestNode')
+        self.assertTrue(entry.loaded)
+        self.assertIn(self.module_name, sys.modules)
+
+    def test_entry_copy(self):
+        entry = plugins.PluginEntry(path=self.path, module=self.module_name, class_name='ManifestTestNode')
+        copy = entry.copy()
+
+        self.assertIs(copy['dagnode'], entry['dagnode'])
+        self.assertTrue(entry.loaded)
+
+    def test_entry_missing(self):
+        entry = plugins.PluginEntry(path=self.path, module=self.module_name, class_name='ManifestTestNode')
+        self.assertFalse('widget' in entry)
+        self.assertIsNone(entry.get('widget'))
+        self.assertRaises(KeyError, entry.__getitem__, 'widget')
+
+    def test_record(self):
+        entry = plugins.PluginEntry(path=self.path, module=self.module_name, class_name='ManifestTestNode')
+        entry['dagnode']
+        self.assertEqual(sorted(plugins.record(entry).keys()), ['class_name', 'module', 'path'])
+
+
+PRIORITY_SOURCE = """
+from SceneGraph.core.nodes import DagNode
+
+class PriorityTestNode(DagNode):
+    node_type = 'priority_test'
+    node_class = 'test'
+    node_category = 'test'
+    default_name = '%s'
+"""
+
+
+class PluginPriorityTest(unittest.TestCase):
+    """
+    When external plugin paths define the same class, the first 
+    listed path wins.
+    """
+    def setUp(self):
+        self.paths = []
+        self.modules = []
+        for name in ['first', 'second']:
+            path = tempfile.mkdtemp()
+            module_name = 'sg_priority_%s_node' % name
+            with open(os.path.join(path, '%s.py' % module_name), 'w') as fn:
+                fn.write(PRIORITY_SOURCE % name)
+            self.paths.append(path)
+            self.modules.append(module_name)
+
+    def tearDown(self):
+        for path, module_name in zip(self.paths, self.modules):
+            sys.modules.pop(module_name, None)
+            shutil.rmtree(path)
+
+    def test_first_path_wins(self):
+        for lazy in [False, True]:
+            manager = plugins.PluginManager(paths=self.paths, lazy=lazy, manifest=None, widgets=False)
+            entry = manager._node_data.get('priority_test')
+            self.assertEqual(entry.get('path'), self.paths[0])
+            self.assertEqual(entry.get('module'), self.modules[0])
+            self.assertEqual(entry.get('dagnode').default_name, 'first')
+            self.assertEqual(entry.get('dagnode').__module__, self.modules[0])
+
+
+class ImportTimeTest(unittest.TestCase):
+    """
+    Importing the core API stays within the import budget. The import 
+    is timed in a fresh interpreter (see :func:`importtime.main`).
+    """
+    def test_core_budget(self):
+        self.assertEqual(importtime.main(['SceneGraph.core', '--budget', str(IMPORT_BUDGET), '--limit', '5']), 0)
+
+    def test_budget_exceeded(self):
+        self.assertEqual(importtime.main(['SceneGraph.core', '--budget', '0', '--limit', '5']), 1)
+
+    def test_core_imports(self):
+        # modules that are deferred until they're used
+        code = 'import sys, SceneGraph.core; print sorted(m for m in ["numpy", "PySide", "SceneGraph.ui"] if m in sys.modules)'
+        output = subprocess.check_output([sys.executable, '-c', code])
+        self.assertEqual(output.strip().splitlines()[-1], '[]')
+
+
+class PanBenchTest(unittest.TestCase):
+    """
+    Frame time statistics of the pan benchmark. The benchmark 
+    itself requires PySide.
+    """
+    def test_summary(self):
+        mean, median, p95 = panbench.summary([float(i) for i in reversed(range(1, 101))])
+        self.assertEqual(mean, 50.5)
+        self.assertEqual(median, 51.0)
+        self.assertEqual(p95, 96.0)
+
+    def test_summary_empty(self):
+        self.assertEqual(panbench.summary([]), (0.0, 0.0, 0.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+"""
+Unit tests for the graph ui. These require PySide, and are skipped if
+it isn't installed.
+
+    python -m unittest discover -s SceneGraph/test -p "test_*.py" -t .
+"""
+import os
+import gc
+import shutil
+import tempfile
+import unittest
+
+try:
+    from PySide import QtGui
+except ImportError:
+    QtGui = None
+
+from SceneGraph.tools.membench import rss
+
+
+# scene size & number of times the scene is opened
+LEAK_NODES          = 5000
+LEAK_ITERATIONS     = 50
+
+# growth allowed over the open/close loop
+LEAK_OBJECTS        = 2000
+LEAK_BYTES          = 20 * 1024 * 1024
+
+
+def count_instances(cls):
+    """
+    Returns the number of live instances of a class.
+
+    :param type cls: class to count.
+
+    :returns: number of instances.
+    :rtype: int
+    """
+    return len([obj for obj in gc.get_objects() if isinstance(obj, cls)])
+
+
+@unittest.skipIf(QtGui is None, 'requires PySide')
+class SceneLeakTest(unittest.TestCase):
+    """
+    Opening & closing a scene doesn't leak nodes, widgets or memory.
+    """
+    @classmethod
+    def setUpClass(cls):
+        from SceneGraph import scenegraph
+
+        cls.app = QtGui.QApplication.instance() or QtGui.QApplication([])
+        cls.ui = scenegraph.SceneGraphUI()
+        cls.ui.show()
+
+        cls.path = tempfile.mkdtemp()
+        cls.filename = os.path.join(cls.path, 'leak_test.json')
+
+        # a chain of connected nodes
+        graph = cls.ui.graph
+        with graph.batch():
+            last = None
+            for i in range(LEAK_NODES):
+                dag = graph.add_node('default', name='node%d' % i, pos=[(i % 100) * 150.0, (i / 100) * 50.0])
+                if last is not None:
+                    graph.add_edge(last, dag, src_attr='output', dest_attr='input')
+                last = dag
+        graph.write(cls.filename)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.ui.resetGraph()
+        cls.ui.close()
+        shutil.rmtree(cls.path)
+
+    def openScene(self):
+        self.ui.resetGraph()
+        self.ui.graph.read(self.filename)
+        self.app.processEvents()
+        gc.collect()
+
+    def test_open_close(self):
+        from SceneGraph.core.nodes import DagNode
+        from SceneGraph.ui.node_widgets import NodeWidget, EdgeWidget
+
+        # warm up caches (icons, shadows, plugins)
+        for i in range(3):
+            self.openScene()
+
+        objects = len(gc.get_objects())
+        memory = rss()
+
+        for i in range(LEAK_ITERATIONS):
+            self.openScene()
+
+        # only the current scene is alive
+        self.assertEqual(count_instances(DagNode), LEAK_NODES)
+        self.assertLessEqual(count_instances(NodeWidget), LEAK_NODES)
+        self.assertLessEqual(count_instances(EdgeWidget), LEAK_NODES - 1)
+
+        self.assertLess(len(gc.get_objects()) - objects, LEAK_OBJECTS)
+        self.assertLess(rss() - memory, LEAK_BYTES)
+
+
+if __name__ == '__main__':
+    unittest.main()
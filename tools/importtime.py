@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+"""
+Report the time spent importing a module, broken down by the modules it imports.
+
+    python -m SceneGraph.tools.importtime [module] [--budget ms]
+
+The report is generated in a fresh interpreter, so modules that are already
+loaded by the caller don't skew the results.
+"""
+import sys
+import time
+import subprocess
+import imp
+from optparse import OptionParser
+
+
+DEFAULT_MODULE = 'SceneGraph.core'
+
+
+class ImportTimer(object):
+    """
+    Import hook (see PEP 302) that records the time spent loading each module.
+    Cumulative times include nested imports, self times exclude them.
+    """
+    def __init__(self):
+        self.cumulative  = dict()
+        self.self_time   = dict()
+        self.order       = []
+        self._stack      = []
+        self._found      = dict()
+
+    def install(self):
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_module(self, fullname, path=None):
+        try:
+            self._found[fullname] = imp.find_module(fullname.rsplit('.', 1)[-1], path)
+        except ImportError:
+            return None
+        return self
+
+    def load_module(self, fullname):
+        if fullname in sys.modules:
+            return sys.modules[fullname]
+
+        fp, pathname, description = self._found.pop(fullname)
+        self._stack.append(0.0)
+        start = time.time()
+        try:
+            return imp.load_module(fullname, fp, pathname, description)
+        finally:
+            if fp:
+                fp.close()
+            elapsed = time.time() - start
+            nested = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            self.order.append(fullname)
+            self.cumulative[fullname] = elapsed
+            self.self_time[fullname] = elapsed - nested
+
+    def report(self, limit=None):
+        """
+        Returns a list of (module, self time, cumulative time) sorted by cumulative time (seconds).
+
+        :param int limit: number of entries to return.
+
+        :returns: list of tuples.
+        :rtype: list
+        """
+        result = [(m, self.self_time.get(m), self.cumulative.get(m)) for m in self.order]
+        result = sorted(result, key=lambda x: x[2], reverse=True)
+        if limit:
+            result = result[:limit]
+        return result
+
+
+def measure(module=DEFAULT_MODULE):
+    """
+    Import a module and time it. This should be run in a fresh interpreter.
+
+    :param str module: module to import.
+
+    :returns: total time (seconds), timer.
+    :rtype: tuple
+    """
+    timer = ImportTimer()
+    timer.install()
+    start = time.time()
+    try:
+        __import__(module)
+    finally:
+        total = time.time() - start
+        timer.uninstall()
+    return total, timer
+
+
+def measure_subprocess(module=DEFAULT_MODULE, limit=25):
+    """
+    Run the import report in a fresh interpreter.
+
+    :param str module: module to import.
+    :param int limit: number of entries to report.
+
+    :returns: report output, exit code.
+    :rtype: tuple
+    """
+    cmd = [sys.executable, '-m', 'SceneGraph.tools.importtime', module, '--inline', '--limit', str(limit)]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    output, _ = proc.communicate()
+    return output, proc.returncode
+
+
+def main(args=None):
+    parser = OptionParser(usage='python -m SceneGraph.tools.importtime [module] [options]')
+    parser.add_option('-b', '--budget', type='float', default=None, help='fail if the import takes longer than this (milliseconds).')
+    parser.add_option('-n', '--limit', type='int', default=25, help='number of modules to report.')
+    parser.add_option('--inline', action='store_true', default=False, help='measure in the current interpreter.')
+    (opts, args) = parser.parse_args(args)
+    module = args[0] if args else DEFAULT_MODULE
+
+    if not opts.inline:
+        output, code = measure_subprocess(module, limit=opts.limit)
+        sys.stdout.write(output)
+        if code:
+            return code
+        total = 0.0
+        for line in reversed(output.splitlines()):
+            if line.startswith('# import ') and line.endswith(' ms'):
+                total = float(line.split()[-2])
+                break
+    else:
+        total, timer = measure(module)
+        print '%-50s %10s %10s' % ('module', 'self (ms)', 'cumul (ms)')
+        for name, self_time, cumulative in timer.report(limit=opts.limit):
+            print '%-50s %10.2f %10.2f' % (name, self_time * 1000.0, cumulative * 1000.0)
+        total = total * 1000.0
+        print '# import %s: %.2f ms' % (module, total)
+
+    if opts.budget is not None and total > opts.budget:
+        print '# import %s exceeded the budget: %.2f ms > %.2f ms' % (module, total, opts.budget)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+"""
+Report the memory used per node, with and without the graph layout store.
+
+    python -m SceneGraph.tools.membench [--nodes 20000] [--types default,dot,note,merge]
+
+Each graph is built in a fresh interpreter, so memory used by one
+graph doesn't skew the next. Widgets aren't created (headless mode).
+"""
+import os
+import sys
+import gc
+import subprocess
+from optparse import OptionParser
+
+
+DEFAULT_TYPES = ['default', 'dot', 'note', 'merge']
+
+
+def rss():
+    """
+    Returns the resident memory of the current process.
+
+    :returns: resident memory (bytes).
+    :rtype: int
+    """
+    try:
+        with open('/proc/self/statm') as fn:
+            return int(fn.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (IOError, OSError, ValueError):
+        import resource
+        # peak memory (kilobytes on Linux, bytes on macOS)
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage if sys.platform == 'darwin' else usage * 1024
+
+
+def measure(count, node_types, layout_store=True):
+    """
+    Build a graph and measure the memory used by its nodes. This
+    should be run in a fresh interpreter.
+
+    :param int count: number of nodes.
+    :param list node_types: node types to add (in turn).
+    :param bool layout_store: use the graph layout store.
+
+    :returns: bytes per node.
+    :rtype: float
+    """
+    from SceneGraph import options
+    options.HEADLESS = True
+    from SceneGraph.core.graph import Graph
+
+    g = Graph(layout_store=layout_store)
+    if layout_store and g.layout is None:
+        raise ImportError('the layout store requires numpy.')
+
+    # add one node of each type, so that metadata & plugins are loaded
+    for node_type in node_types:
+        g.add_node(node_type)
+    gc.collect()
+    start = rss()
+
+    with g.batch():
+        for i in range(count):
+            node_type = node_types[i % len(node_types)]
+            g.add_node(node_type, name='%s%d' % (node_type, i), pos=[(i % 100) * 150.0, (i / 100) * 50.0])
+    gc.collect()
+    return float(rss() - start) / count
+
+
+def measure_subprocess(count, node_types, layout_store=True):
+    """
+    Run the measurement in a fresh interpreter.
+
+    :param int count: number of nodes.
+    :param list node_types: node types to add.
+    :param bool layout_store: use the graph layout store.
+
+    :returns: bytes per node (or None if the measurement failed).
+    :rtype: float
+    """
+    cmd = [sys.executable, '-m', 'SceneGraph.tools.membench', '--inline', '--nodes', str(count), '--types', ','.join(node_types)]
+    if not layout_store:
+        cmd.append('--no-store')
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    output, _ = proc.communicate()
+    for line in reversed(output.splitlines()):
+        if line.startswith('# bytes per node: '):
+            return float(line.split()[-1])
+    sys.stdout.write(output)
+    return None
+
+
+def main(args=None):
+    parser = OptionParser(usage='python -m SceneGraph.tools.membench [options]')
+    parser.add_option('-n', '--nodes', type='int', default=20000, help='number of nodes.')
+    parser.add_option('-t', '--types', type='string', default=','.join(DEFAULT_TYPES), help='node types (comma separated).')
+    parser.add_option('--no-store', action='store_true', default=False, help='disable the layout store (with --inline).')
+    parser.add_option('--inline', action='store_true', default=False, help='measure in the current interpreter.')
+    (opts, args) = parser.parse_args(args)
+    node_types = [t for t in opts.types.split(',') if t]
+
+    if opts.inline:
+        print '# bytes per node: %.1f' % measure(opts.nodes, node_types, layout_store=not opts.no_store)
+        return 0
+
+    print '# %d nodes (%s)' % (opts.nodes, ', '.join(node_types))
+    print '%-12s %16s' % ('layout', 'bytes per node')
+    result = 0
+    for layout_store in [False, True]:
+        value = measure_subprocess(opts.nodes, node_types, layout_store=layout_store)
+        label = 'store' if layout_store else 'baseline'
+        if value is None:
+            print '%-12s %16s' % (label, 'failed')
+            result = 1
+            continue
+        print '%-12s %16.1f' % (label, value)
+    return result
+
+
+if __name__ == '__main__':
+    sys.exit(main())
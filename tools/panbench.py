@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+"""
+Report the frame time while panning a graph view, with the node widget
+item cache enabled and disabled.
+
+    python -m SceneGraph.tools.panbench [--nodes 2000] [--frames 200] [--zoom 0.5]
+
+Nodes are laid out in a grid that fits in the viewport, so every node is
+visible (and painted) in each frame. Scene virtualization is disabled.
+"""
+import sys
+import time
+from optparse import OptionParser
+
+
+def build_scene(ui, count, columns=50, spacing=(130, 60)):
+    """
+    Add a grid of nodes to the graph.
+
+    :param SceneGraphUI ui: SceneGraph ui.
+    :param int count: number of nodes.
+    :param int columns: nodes per row.
+    :param tuple spacing: x & y distance between nodes.
+
+    :returns: grid bounds (x, y, width, height).
+    :rtype: tuple
+    """
+    scene = ui.view.scene()
+    scene.virtual_threshold = 0
+    scene.edge_layer_threshold = 0
+
+    with ui.graph.batch():
+        for i in range(count):
+            x = (i % columns) * spacing[0]
+            y = (i / columns) * spacing[1]
+            ui.graph.add_node('default', name='node%d' % i, pos=[x, y])
+
+    rows = (count + columns - 1) / columns
+    return (-spacing[0], -spacing[1], (columns + 1) * spacing[0], (rows + 1) * spacing[1])
+
+
+def measure(app, view, frames=200, step=4):
+    """
+    Pan the view and time each repaint.
+
+    :param QApplication app: application.
+    :param GraphicsView view: graphics view.
+    :param int frames: number of frames to draw.
+    :param int step: scroll distance per frame (pixels).
+
+    :returns: frame times (seconds).
+    :rtype: list
+    """
+    scrollbar = view.horizontalScrollBar()
+    start_value = scrollbar.value()
+    direction = 1
+
+    # draw the first frame, so that the cache is populated
+    view.viewport().repaint()
+    app.processEvents()
+
+    result = []
+    for i in range(frames):
+        value = scrollbar.value() + step * direction
+        if value > scrollbar.maximum() or value < scrollbar.minimum():
+            direction *= -1
+            value = scrollbar.value() + step * direction
+
+        start = time.time()
+        scrollbar.setValue(value)
+        view.viewport().repaint()
+        result.append(time.time() - start)
+        app.processEvents()
+
+    scrollbar.setValue(start_value)
+    return result
+
+
+def summary(values):
+    """
+    Returns the mean, median and 95th percentile of a list of values.
+
+    :param list values: frame times.
+
+    :returns: mean, median, p95.
+    :rtype: tuple
+    """
+    values = sorted(values)
+    if not values:
+        return (0.0, 0.0, 0.0)
+    mean = sum(values) / len(values)
+    median = values[len(values) / 2]
+    p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+    return (mean, median, p95)
+
+
+def main(args=None):
+    parser = OptionParser(usage='python -m SceneGraph.tools.panbench [options]')
+    parser.add_option('-n', '--nodes', type='int', default=2000, help='number of nodes.')
+    parser.add_option('-f', '--frames', type='int', default=200, help='number of frames to draw.')
+    parser.add_option('-z', '--zoom', type='float', default=0.5, help='view zoom level.')
+    parser.add_option('-s', '--step', type='int', default=4, help='scroll distance per frame (pixels).')
+    (opts, args) = parser.parse_args(args)
+
+    from PySide import QtCore, QtGui
+    from SceneGraph import scenegraph
+
+    app = QtGui.QApplication.instance() or QtGui.QApplication(sys.argv)
+    ui = scenegraph.SceneGraphUI()
+    ui.show()
+
+    view = ui.view
+    scene = view.scene()
+    x, y, width, height = build_scene(ui, opts.nodes)
+    app.processEvents()
+
+    # size the viewport to fit the grid at the requested zoom
+    view.resetTransform()
+    view.scale(opts.zoom, opts.zoom)
+    ui.resize(int(width * opts.zoom) + 100, int(height * opts.zoom) + 100)
+    view.centerOn(QtCore.QPointF(x + width / 2.0, y + height / 2.0))
+    scene.updateZoom(opts.zoom)
+    app.processEvents()
+
+    print '# %d nodes, %d frames, zoom %.2f' % (len(scene.get_nodes()), opts.frames, opts.zoom)
+    print '%-10s %12s %12s %12s' % ('cache', 'mean (ms)', 'median (ms)', 'p95 (ms)')
+    for enabled in [False, True]:
+        scene.setNodeCache(enabled)
+        mean, median, p95 = summary(measure(app, view, frames=opts.frames, step=opts.step))
+        print '%-10s %12.2f %12.2f %12.2f' % ('on' if enabled else 'off', mean * 1000.0, median * 1000.0, p95 * 1000.0)
+
+    ui.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -155,11 +155,10 @@ class AttributeEditor(QtGui.QWidget):
 
                                 # connected edges
                                 if edges:
-                                    for edge in edges:
-                                        src_id, dest_id = edge.strip('()').split(',')
-                                        if self._graph.get_edge(src_id, dest_id):
-                                            src_id, dest_id, edge_attrs = self._graph.get_edge(src_id, dest_id)[0]
-                                            dagnode = self._graph.get_node(src_id)[0]
+                                    for src_id, dest_id in edges:
+                                        edge_attrs = self._graph.network.get_edge_data(src_id, dest_id, key='attributes')
+                                        dagnode = self._graph.dagnodes.get(src_id)
+                                        if edge_attrs and dagnode:
                                             conn_str = '%s.%s' % (dagnode.name, edge_attrs.get('src_attr'))
                                             #print 'connection: ', conn_str
                                             editor.setConnected(conn_str)
@@ -329,6 +328,10 @@ class AttributeEditor(QtGui.QWidget):
                         attributes[name] = dict()
 
                     for pname, pval in attribute.data.iteritems():
+                        # use edge ids rather than the file representation
+                        if pname == '_edges':
+                            pval = attribute.edges
+
                         if pname not in attributes.get(name):
                             log.debug('adding user property: "%s": %s' % (pname, pval))
                             attributes.get(name)[pname]=pval
@@ -379,7 +382,7 @@ class AttributeEditor(QtGui.QWidget):
                         if attribute in node._attributes.keys():
                             # get the attribute object
                             attr_node = node.get_attr(attribute)
-                            edges = attr_node._edges
+                            edges = attr_node.edges
 
                         attr_dict['private'] = properties.get('private', False)
                         attr_dict['label'] = properties.get('label', {}).get('value', None)
@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+import os
+import imp
+import marshal
+import py_compile
+import hashlib
+from PySide import QtGui
+from SceneGraph.core import log
+from SceneGraph.options import SCENEGRAPH_PATH, SCENEGRAPH_UI_CACHE
+
+
+def ui_hash(uiFile):
+    """
+    Returns the md5 hash of a .ui file.
+
+    :param str uiFile: .ui file path.
+
+    :returns: hex digest.
+    :rtype: str
+    """
+    with open(uiFile, 'rb') as f:
+        return hashlib.md5(f.read()).hexdigest()
+
+
+def cached_form_path(uiFile, digest=None, cache_path=None):
+    """
+    Returns the path of the compiled form module for a .ui file.
+
+    :param str uiFile: .ui file path.
+    :param str digest: .ui file hash (computed if not passed).
+    :param str cache_path: cache directory.
+
+    :returns: python module path.
+    :rtype: str
+    """
+    if digest is None:
+        digest = ui_hash(uiFile)
+    if cache_path is None:
+        cache_path = SCENEGRAPH_UI_CACHE
+    name = os.path.splitext(os.path.basename(uiFile))[0]
+    return os.path.join(cache_path, 'ui_%s_%s.py' % (name, digest))
+
+
+def compile_form(uiFile, filename=None):
+    """
+    Compile a .ui file to python code. The widget and form class
+    names are written to the module, so that the .ui xml doesn't need
+    to be parsed when the module is imported.
+
+    :param str uiFile: .ui file path.
+    :param str filename: output python module path (if None, the code is returned).
+
+    :returns: output file path (or python code).
+    :rtype: str
+    """
+    import pysideuic
+    import xml.etree.ElementTree as xml
+    from cStringIO import StringIO
+
+    parsed = xml.parse(uiFile)
+    widget_class = parsed.find('widget').get('class')
+    form_class = parsed.find('class').text
+
+    o = StringIO()
+    o.write('UI_WIDGET_CLASS = %r\nUI_FORM_CLASS = %r\n' % (widget_class, form_class))
+    with open(uiFile, 'r') as f:
+        pysideuic.compileUi(f, o, indent=0)
+
+    if filename is None:
+        return o.getvalue()
+
+    cache_path = os.path.dirname(filename)
+    if not os.path.exists(cache_path):
+        os.makedirs(cache_path)
+
+    # write to a temp file first, so a partial file is never imported
+    tmp_file = '%s.%d.tmp' % (filename, os.getpid())
+    with open(tmp_file, 'w') as f:
+        f.write(o.getvalue())
+
+    if os.path.exists(filename):
+        os.remove(filename)
+    os.rename(tmp_file, filename)
+    return filename
+
+
+def clear_cache(uiFile, keep=None, cache_path=None):
+    """
+    Remove stale compiled forms for a .ui file.
+
+    :param str uiFile: .ui file path.
+    :param str keep: compiled form to keep.
+    :param str cache_path: cache directory.
+    """
+    if cache_path is None:
+        cache_path = SCENEGRAPH_UI_CACHE
+    if not os.path.isdir(cache_path):
+        return
+
+    prefix = 'ui_%s_' % os.path.splitext(os.path.basename(uiFile))[0]
+    keep = os.path.basename(keep) if keep else None
+    for fname in os.listdir(cache_path):
+        if not fname.startswith(prefix):
+            continue
+        if keep and os.path.splitext(fname)[0] == os.path.splitext(keep)[0]:
+            continue
+        try:
+            os.remove(os.path.join(cache_path, fname))
+        except OSError:
+            pass
+
+
+def load_form(filename):
+    """
+    Returns the code object of a compiled form module. The
+    bytecode is cached alongside the module.
+
+    :param str filename: python module path.
+
+    :returns: code object.
+    :rtype: code
+    """
+    pyc_file = '%sc' % filename
+    if os.path.exists(pyc_file) and os.path.getmtime(pyc_file) >= os.path.getmtime(filename):
+        with open(pyc_file, 'rb') as f:
+            if f.read(4) == imp.get_magic():
+                f.read(4)
+                try:
+                    return marshal.load(f)
+                except (EOFError, ValueError, TypeError):
+                    pass
+
+    with open(filename, 'r') as f:
+        pyc = compile(f.read(), filename, 'exec')
+
+    try:
+        py_compile.compile(filename, doraise=True)
+    except (IOError, OSError, py_compile.PyCompileError):
+        pass
+    return pyc
+
+
+def loadUiType(uiFile, cache=True, cache_path=None):
+    """
+    Pyside lacks the "loadUiType" command, so we have to convert the ui file to py code first
+    and then import it to retrieve the form_class.
+
+    The compiled form is cached (keyed by the .ui file hash) and imported
+    directly on later launches.
+
+    :param str uiFile: .ui file path.
+    :param bool cache: use the form cache.
+    :param str cache_path: cache directory.
+
+    :returns: form class, base class.
+    :rtype: tuple
+    """
+    frame = dict()
+    filename = cached_form_path(uiFile, cache_path=cache_path) if cache else None
+    if filename is not None and not os.path.exists(filename):
+        try:
+            compile_form(uiFile, filename)
+            clear_cache(uiFile, keep=filename, cache_path=cache_path)
+        except (IOError, OSError) as err:
+            log.warning('loadUi: cannot write form cache: %s' % err)
+            filename = None
+
+    if filename is not None:
+        pyc = load_form(filename)
+    else:
+        pyc = compile(compile_form(uiFile), '<string>', 'exec')
+
+    try:
+        exec pyc in frame
+    except ImportError as err:
+        log.warning('loadUi: %s' % err)
+
+    form_class = frame['Ui_%s' % frame['UI_FORM_CLASS']]
+    base_class = getattr(QtGui, frame['UI_WIDGET_CLASS'])
+    return form_class, base_class
+
+
+def ui_files(path=None):
+    """
+    Returns a list of all .ui files in the ui directory
+    (including the designer files).
+
+    :param str path: directory to search.
+
+    :returns: list of .ui file paths.
+    :rtype: list
+    """
+    if path is None:
+        path = os.path.join(SCENEGRAPH_PATH, 'ui')
+
+    result = []
+    for root, dirs, files in os.walk(path):
+        for fname in sorted(files):
+            if fname.endswith('.ui'):
+                result.append(os.path.join(root, fname))
+    return result
+
+
+def build_cache(files=None, cache_path=None, force=False):
+    """
+    Precompile .ui files into the form cache.
+
+    :param list files: .ui files to compile (default is all SceneGraph .ui files).
+    :param str cache_path: cache directory.
+    :param bool force: recompile existing forms.
+
+    :returns: list of compiled modules.
+    :rtype: list
+    """
+    if files is None:
+        files = ui_files()
+
+    result = []
+    for uiFile in files:
+        filename = cached_form_path(uiFile, cache_path=cache_path)
+        if force or not os.path.exists(filename):
+            compile_form(uiFile, filename)
+            clear_cache(uiFile, keep=filename, cache_path=cache_path)
+        result.append(filename)
+    return result
+
+
+if __name__ == '__main__':
+    for filename in build_cache(force=True):
+        print '# compiled: "%s"' % filename
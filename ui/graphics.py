@@ -1,13 +1,16 @@
 #!/usr/bin/env python
 import os
+from collections import OrderedDict as dict
 from PySide import QtCore, QtGui
 from functools import partial
 from SceneGraph import core
+from SceneGraph import options
 from SceneGraph.core import nodes
 
 from SceneGraph.ui import handlers
 from SceneGraph.ui import node_widgets
 from SceneGraph.ui import commands
+from SceneGraph.ui import virtual
 
 
 # logger
@@ -55,6 +58,7 @@ class GraphicsView(QtGui.QGraphicsView):
         
         self.boxing = False
         self.modifierBoxOrigin = None
+        self._rubber_band_origin = None     # rubber band selection start (see GraphicsView.mouseReleaseEvent)
         self.modifierBox = QtGui.QRubberBand(QtGui.QRubberBand.Rectangle, self)
         self.scale(1.0, 1.0)
 
@@ -238,6 +242,24 @@ class GraphicsView(QtGui.QGraphicsView):
         factor = 1.41 ** ((event.delta()*.5) / 240.0)
         self.scale(factor, factor)
         self._scale = factor
+        self.scene().scheduleVisibleUpdate()
+        self.scene().updateZoom()
+
+    def scrollContentsBy(self, dx, dy):
+        """
+        Update the visible nodes of a virtualized scene when the view scrolls.
+        """
+        QtGui.QGraphicsView.scrollContentsBy(self, dx, dy)
+        if self.scene() is not None:
+            self.scene().scheduleVisibleUpdate()
+
+    def resizeEvent(self, event):
+        """
+        Update the visible nodes of a virtualized scene when the view is resized.
+        """
+        QtGui.QGraphicsView.resizeEvent(self, event)
+        if self.scene() is not None:
+            self.scene().scheduleVisibleUpdate()
 
     def mouseMoveEvent(self, event):
         """
@@ -245,11 +267,10 @@ class GraphicsView(QtGui.QGraphicsView):
 
         :param QtCore.QEvent event: mouse event
         """     
-        selected_nodes = self.scene().selectedNodes()
-        event_item = self.itemAt(event.pos())
         nodes_to_move = []
         if event.buttons() & QtCore.Qt.LeftButton:            
             if event.modifiers() & QtCore.Qt.AltModifier:
+                selected_nodes = self.scene().selectedNodes()
                 if selected_nodes:                    
                     for sel_node in selected_nodes:
                         if hasattr(sel_node, 'dagnode'):
@@ -282,11 +303,14 @@ class GraphicsView(QtGui.QGraphicsView):
         :param QtCore.QEvent event: mouse event
         """        
         self.current_cursor_pos = event.pos()
+        self._rubber_band_origin = None
         if event.button() == QtCore.Qt.LeftButton:
             if event.modifiers() & QtCore.Qt.ControlModifier:
                 self.setDragMode(QtGui.QGraphicsView.ScrollHandDrag)
             else:
                 self.setDragMode(QtGui.QGraphicsView.RubberBandDrag)
+                if self.itemAt(event.pos()) is None:
+                    self._rubber_band_origin = event.pos()
 
         # right mouse click
         if event.button() == QtCore.Qt.RightButton:
@@ -302,6 +326,29 @@ class GraphicsView(QtGui.QGraphicsView):
             
         QtGui.QGraphicsView.mousePressEvent(self, event)
 
+    def mouseReleaseEvent(self, event):
+        """
+        Select the edges drawn by the edge layer within the rubber band, 
+        as they don't have graphics items for the view to select.
+
+        :param QtCore.QEvent event: mouse event
+        """
+        QtGui.QGraphicsView.mouseReleaseEvent(self, event)
+
+        origin = self._rubber_band_origin
+        self._rubber_band_origin = None
+        if origin is None or self.scene() is None or self.scene().edge_layer is None:
+            return
+
+        rect = QtCore.QRect(origin, event.pos()).normalized()
+        if rect.width() < 2 and rect.height() < 2:
+            return
+
+        path = QtGui.QPainterPath()
+        path.addPolygon(self.mapToScene(rect))
+        path.closeSubpath()
+        self.scene().edge_layer.selectEdges(path)
+
     def event(self, event):
         """
         Capture the tab key press event.
@@ -322,9 +369,12 @@ class GraphicsView(QtGui.QGraphicsView):
         if event.key() == QtCore.Qt.Key_A:
             # get the bounding rect of the graphics scene
             boundsRect = self.scene().itemsBoundingRect()            
+            if self.scene().is_virtual:
+                boundsRect = boundsRect.united(self.scene()._placeholders.boundingRect())
             
             # resize
             self.fitInView(boundsRect, QtCore.Qt.KeepAspectRatio)
+            self.scene().updateZoom()
             #self.setSceneRect(boundsRect) # this resizes the scene rect to the bounds rect, not desirable
 
         # disable selected nodes
@@ -344,6 +394,7 @@ class GraphicsView(QtGui.QGraphicsView):
                 if self.scene().selectedNodes():
                     boundsRect = self.scene().selectedNodesRect()
             self.fitInView(boundsRect, QtCore.Qt.KeepAspectRatio)
+            self.scene().updateZoom()
 
         # delete nodes & edges...
         elif event.key() == QtCore.Qt.Key_Delete or event.key() == QtCore.Qt.Key_Backspace:
@@ -461,17 +512,177 @@ class GraphicsScene(QtGui.QGraphicsScene):
         self.handler        = handlers.SceneEventHandler(self)
         self.scenenodes     = dict()
 
+        # typed widget registries (see GraphicsScene.registerWidget)
+        self._node_widgets  = dict()            # node id -> node widget
+        self._edge_widgets  = dict()            # edge ids -> edge widget
+        self._node_names    = dict()            # node name -> node widget
+        self._edge_names    = dict()            # edge name -> edge widget
+        self._renamed       = set()             # renamed widgets waiting to be re-indexed
+
+        # virtualized scene (see GraphicsScene.updateVisibleNodes)
+        self.virtual_threshold = kwargs.get('virtual_threshold', options.SCENEGRAPH_VIRTUAL_THRESHOLD)
+        self._virtual       = False
+        self._placeholders  = None              # placeholder layer for nodes without widgets
+        self._pool          = virtual.WidgetPool()
+        self._visible_timer = QtCore.QTimer(self)
+        self._visible_timer.setSingleShot(True)
+        self._visible_timer.setInterval(16)
+        self._visible_timer.timeout.connect(self.updateVisibleNodes)
+
+        # batched edge layer (see GraphicsScene.setEdgeLayer)
+        self.edge_layer_threshold = kwargs.get('edge_layer_threshold', options.SCENEGRAPH_EDGE_LAYER_THRESHOLD)
+        self._edge_layer    = None
+        self.selectionChanged.connect(self.edgeSelectionChangedEvent)
+
+        # node widget item cache (see GraphicsScene.updateCacheModes)
+        self.cache_nodes    = kwargs.get('cache_nodes', options.SCENEGRAPH_CACHE_NODES)
+        self._cache_mode    = node_widgets.cache_mode(1.0) if self.cache_nodes else QtGui.QGraphicsItem.NoCache
+
+        # node widget level of detail (see GraphicsScene.updateLevelOfDetail)
+        self._lod           = node_widgets.LOD_FULL
+
         # temp attributes
         self._hover_nodes   = []
 
+        # hover detection runs at most once per frame (see GraphicsScene.updateHoverNodes)
+        self._hover_pos     = None
+        self._hover_timer   = QtCore.QTimer(self)
+        self._hover_timer.setSingleShot(True)
+        self._hover_timer.setInterval(16)
+        self._hover_timer.timeout.connect(self.updateHoverNodes)
+
     def initialize(self):
         """
         Initialize the scene nodes attributes and
         clear the current scene.
         """
-        self.scenenodes=dict()
         self.clear()
 
+    def clear(self):
+        """
+        Clear the scene and the widget registries.
+        """
+        self.scenenodes = dict()
+        self._node_widgets = dict()
+        self._edge_widgets = dict()
+        self._node_names = dict()
+        self._edge_names = dict()
+        self._renamed = set()
+        self._pool.clear()
+        self._virtual = False
+        self._placeholders = None
+        self._edge_layer = None
+        QtGui.QGraphicsScene.clear(self)
+
+    def removeItem(self, item):
+        """
+        Remove an item from the scene. Node & edge widgets
+        are removed from the widget registries.
+
+        :param QGraphicsItem item: graphics item.
+        """
+        if self.is_top_level(item):
+            self.unregisterWidget(item)
+        QtGui.QGraphicsScene.removeItem(self, item)
+
+    #- Registry ----
+
+    def registerWidget(self, widget):
+        """
+        Add a node or edge widget to the widget registries, so that
+        queries don't need to iterate over every item in the scene.
+
+        :param QGraphicsObject widget: node or edge widget.
+        """
+        if self.is_node(widget):
+            self.scenenodes[widget.dagnode.id] = widget
+            self._node_widgets[widget.dagnode.id] = widget
+            self._node_names[widget.dagnode.name] = widget
+            widget.dagnode.nodeNameChanged += self.nodeNameChangedEvent
+
+        elif self.is_edge(widget):
+            self.scenenodes[widget.ids] = widget
+            self._edge_widgets[widget.ids] = widget
+            self._edge_names[widget.name] = widget
+
+    def unregisterWidget(self, widget):
+        """
+        Remove a node or edge widget from the widget registries.
+
+        :param QGraphicsObject widget: node or edge widget.
+        """
+        if self.is_node(widget):
+            key = widget.dagnode.id
+            registry = self._node_widgets
+            names = self._node_names
+            widget.dagnode.nodeNameChanged.discard(self.nodeNameChangedEvent)
+        elif self.is_edge(widget):
+            key = widget.ids
+            registry = self._edge_widgets
+            names = self._edge_names
+        else:
+            return
+
+        if registry.get(key) is widget:
+            registry.pop(key)
+            self.scenenodes.pop(key, None)
+
+        if names.get(widget.name) is widget:
+            names.pop(widget.name)
+        self._renamed.discard(widget)
+
+    def nodeNameChangedEvent(self, dagnode, *args, **kwargs):
+        """
+        Called before a dag node is renamed. The old node & edge names
+        are removed from the name index, and the widgets are re-indexed
+        (with the validated name) on the next lookup.
+
+        :param DagNode dagnode: dag node.
+        """
+        widget = self._node_widgets.get(dagnode.id)
+        if widget is None:
+            return
+
+        if self._node_names.get(dagnode.name) is widget:
+            self._node_names.pop(dagnode.name)
+        self._renamed.add(widget)
+
+        # edge names include the node name
+        for conn in getattr(widget, 'connections', dict()).values():
+            for edge in conn.connected_edges():
+                if self._edge_names.get(edge.name) is edge:
+                    self._edge_names.pop(edge.name)
+                self._renamed.add(edge)
+
+    def _updateRenamed(self):
+        """
+        Add renamed widgets to the name index.
+        """
+        for widget in self._renamed:
+            if self.is_node(widget) and self._node_widgets.get(widget.dagnode.id) is widget:
+                self._node_names[widget.name] = widget
+            elif self.is_edge(widget) and self._edge_widgets.get(widget.ids) is widget:
+                self._edge_names[widget.name] = widget
+        self._renamed = set()
+
+    def _lookup_name(self, name, names):
+        """
+        Find a widget by name.
+
+        :param str name: node or edge name.
+        :param dict names: name index.
+
+        :returns: widget (or None).
+        :rtype: QGraphicsObject
+        """
+        if self._renamed:
+            self._updateRenamed()
+
+        widget = names.get(name)
+        if widget is not None and widget.name == name:
+            return widget
+        return None
+
     @property
     def debug(self):
         return self.ui.debug
@@ -496,7 +707,10 @@ class GraphicsScene(QtGui.QGraphicsScene):
         """
         for nid in self.scenenodes:
             widget = self.scenenodes.get(nid)
-            widget.update()
+            if hasattr(widget, 'invalidateCache'):
+                widget.invalidateCache()
+            else:
+                widget.update()
         self.update()
 
     #- Preferences ---
@@ -531,6 +745,10 @@ class GraphicsScene(QtGui.QGraphicsScene):
                 if k == 'font_family_nodes':
                     for node in nodes:
                         node._font = v
+                        if hasattr(node, 'updateLayout'):
+                            node.updateLayout()
+                        elif hasattr(node, 'invalidateCache'):
+                            node.invalidateCache()
         
     #- Nodes ----
     
@@ -547,6 +765,8 @@ class GraphicsScene(QtGui.QGraphicsScene):
             for k, v in kwargs.iteritems():
                 if hasattr(node, k):
                     setattr(node, k, v)
+            if hasattr(node, 'invalidateCache'):
+                node.invalidateCache()
 
     def restoreNodes(self, data):
         """
@@ -575,6 +795,11 @@ class GraphicsScene(QtGui.QGraphicsScene):
             dagids = [dagids,]
 
         log.debug('GraphicsScene: adding %d nodes.' % len(dagids))
+
+        # large scenes only create widgets for the visible nodes
+        if self.virtual_threshold and len(self.graph.dagnodes) > self.virtual_threshold and self.graph.layout is not None:
+            self.setVirtual(True)
+
         widgets = []
         for dag_id in dagids:
             #print 'dag id: ', dag_id
@@ -582,32 +807,56 @@ class GraphicsScene(QtGui.QGraphicsScene):
                 dag = self.graph.dagnodes.get(dag_id)
 
                 if self.graph.is_node(dag):
+                    if self._virtual:
+                        continue
+
                     if dag_id not in self.scenenodes:               
-                        widget = self.plug_mgr.get_widget(dag)
-
-                        if not widget:
-                            log.warning('invalid widget: "%s"' % dag.name)
-                            continue
-                            
-                        widget._render_effects = self.ui.render_fx
-                        widget._font = self.ui.font_family_nodes
-                        
-                        # set the debug mode
-                        widget.setDebug(self.debug)
-                        self.scenenodes[dag.id]=widget
-                        self.addItem(widget)
-                        widgets.append(widget)
-
-                        # connect signals
-                        widget.nodeChanged.connect(self.nodeChangedEvent)
-                        widget.nodeDeleted.connect(self.nodeDeletedEvent)
+                        widget = self._createNodeWidget(dag)
+                        if widget is not None:
+                            widgets.append(widget)
                 else:
                     log.warning('invalid dag type: "%s"' % dag.Class())
                
             else:
                 raise GraphException('invalid graph id: "%s"' % dag_id )
+
+        if self._virtual:
+            self._placeholders.updateBounds()
+            self.setSceneRect(self.sceneRect().united(self._placeholders.boundingRect()))
+            self.scheduleVisibleUpdate()
         return widgets
 
+    def _createNodeWidget(self, dag):
+        """
+        Create a widget for the given dag node and add it to the scene.
+
+        :param DagNode dag: dag node.
+
+        :returns: node widget.
+        :rtype: NodeWidget
+        """
+        widget = self.plug_mgr.get_widget(dag)
+
+        if not widget:
+            log.warning('invalid widget: "%s"' % dag.name)
+            return
+            
+        widget._render_effects = self.ui.render_fx
+        widget._font = self.ui.font_family_nodes
+        
+        # set the debug mode
+        widget.setDebug(self.debug)
+        if hasattr(widget, 'setLevelOfDetail'):
+            widget.setLevelOfDetail(self._lod)
+        node_widgets.set_cache_mode(widget, self._cache_mode)
+        self.addItem(widget)
+        self.registerWidget(widget)
+
+        # connect signals
+        widget.nodeChanged.connect(self.nodeChangedEvent)
+        widget.nodeDeleted.connect(self.nodeDeletedEvent)
+        return widget
+
     def addEdges(self, edges):
         """
         Add edges to the current scene.
@@ -625,50 +874,444 @@ class GraphicsScene(QtGui.QGraphicsScene):
             src_id = edge.get('src_id')
             dest_id = edge.get('dest_id')
 
-            src_attr = edge.get('src_attr', 'output')
-            dest_attr = edge.get('dest_attr', 'input')
-
-            weight = edge.get('weight', 1)
-            edge_type = edge.get('edge_type', self.ui.edge_type)
-
             source_node = self.get_node(src_id)
             dest_node  = self.get_node(dest_id)
 
+            # virtualized scene: the edge widget is created when both nodes are visible
+            if self._virtual and (not source_node or not dest_node):
+                continue
+
             # nodes not found? Seeya
             if not source_node:
-                raise GraphException('invalid source id: "%s"' % srcid)
+                raise GraphException('invalid source id: "%s"' % src_id)
                 return False
 
             if not dest_node:
-                raise GraphException('invalid destination id: "%s"' % destid)
+                raise GraphException('invalid destination id: "%s"' % dest_id)
                 return False
 
-            # get the relevant connection terminals
-            src_conn_widget = source_node.getOutputConnection(src_attr)
-            dest_conn_widget = dest_node.getInputConnection(dest_attr)
-
-            if not src_conn_widget or not dest_conn_widget:
-                print 'cannot find a connection widget'
-                continue
-
-            edge_widget = node_widgets.EdgeWidget(edge, src_conn_widget, dest_conn_widget, weight=weight, edge_type=edge_type)
-            
-            # connect signals
-            edge_widget.nodeDeleted.connect(self.nodeDeletedEvent)
-            edge_widget._render_effects = self.ui.render_fx
-
-            # check that connection is valid. (implement this)
-            if edge_widget.connect_terminal(src_conn_widget) and edge_widget.connect_terminal(dest_conn_widget):
-                # set the debug mode
-                edge_widget.setDebug(self.debug)
-                self.scenenodes[edge_widget.ids]=edge_widget
-                self.addItem(edge_widget)
+            edge_widget = self._createEdgeWidget(edge)
+            if edge_widget is not None:
                 widgets.append(edge_widget)
 
                 new_snapshot = self.graph.snapshot()
                 self.undo_stack.push(commands.SceneNodesCommand(old_snapshot, new_snapshot, self, msg='edge added'))
 
         return widgets
+
+    def _createEdgeWidget(self, edge):
+        """
+        Create a widget for the given edge and add it to the scene. Both
+        node widgets must exist.
+
+        :param dict edge: nx edge dictionary.
+
+        :returns: edge widget.
+        :rtype: EdgeWidget
+        """
+        src_attr = edge.get('src_attr', 'output')
+        dest_attr = edge.get('dest_attr', 'input')
+
+        weight = edge.get('weight', 1)
+        edge_type = edge.get('edge_type', self.ui.edge_type)
+
+        source_node = self.get_node(edge.get('src_id'))
+        dest_node  = self.get_node(edge.get('dest_id'))
+
+        # get the relevant connection terminals
+        src_conn_widget = source_node.getOutputConnection(src_attr)
+        dest_conn_widget = dest_node.getInputConnection(dest_attr)
+
+        if not src_conn_widget or not dest_conn_widget:
+            print 'cannot find a connection widget'
+            return
+
+        # large scenes draw edges in the edge layer, without widgets
+        if self._edge_layer is not None:
+            return self._addLayerEdge(edge, src_conn_widget, dest_conn_widget, edge_type=edge_type)
+
+        edge_widget = self._newEdgeWidget(edge, src_conn_widget, dest_conn_widget, edge_type=edge_type)
+        if edge_widget is not None:
+            if self.edge_layer_threshold and len(self._edge_widgets) > self.edge_layer_threshold:
+                self.setEdgeLayer(True)
+        return edge_widget
+
+    def _newEdgeWidget(self, edge, src_conn_widget, dest_conn_widget, edge_type=None):
+        """
+        Create an edge widget between two connection terminals and add it to the scene.
+
+        :param dict edge: nx edge dictionary.
+        :param Connection src_conn_widget: source terminal.
+        :param Connection dest_conn_widget: destination terminal.
+        :param str edge_type: edge type (bezier or polygon).
+
+        :returns: edge widget.
+        :rtype: EdgeWidget
+        """
+        weight = edge.get('weight', 1)
+        edge_widget = node_widgets.EdgeWidget(edge, src_conn_widget, dest_conn_widget, weight=weight, edge_type=edge_type)
+        
+        # connect signals
+        edge_widget.nodeDeleted.connect(self.nodeDeletedEvent)
+        edge_widget._render_effects = self.ui.render_fx
+
+        # check that connection is valid. (implement this)
+        if edge_widget.connect_terminal(src_conn_widget) and edge_widget.connect_terminal(dest_conn_widget):
+            # set the debug mode
+            edge_widget.setDebug(self.debug)
+            self.addItem(edge_widget)
+            self.registerWidget(edge_widget)
+            edge_widget.updateTerminals()
+            return edge_widget
+
+        edge_widget.breakConnections()
+
+    def _addLayerEdge(self, edge, src_conn_widget, dest_conn_widget, edge_type=None):
+        """
+        Add an edge between two connection terminals to the edge layer.
+
+        :param dict edge: nx edge dictionary.
+        :param Connection src_conn_widget: source terminal.
+        :param Connection dest_conn_widget: destination terminal.
+        :param str edge_type: edge type (bezier or polygon).
+
+        :returns: layer edge.
+        :rtype: LayerEdge
+        """
+        layer_edge = virtual.LayerEdge(edge, src_conn_widget, dest_conn_widget, weight=edge.get('weight', 1))
+        if edge_type is not None:
+            layer_edge.edge_type = edge_type
+
+        if layer_edge.connect_terminal(src_conn_widget) and layer_edge.connect_terminal(dest_conn_widget):
+            layer_edge.setDebug(self.debug)
+            self._edge_layer.addEdge(layer_edge)
+            layer_edge.updateTerminals()
+            return layer_edge
+
+        layer_edge.breakConnections()
+
+    def _hasEdge(self, edge_id):
+        """
+        Returns true if an edge is drawn in the scene (by a widget or the edge layer).
+
+        :param tuple edge_id: edge source id, edge destination id.
+
+        :rtype: bool
+        """
+        if edge_id in self._edge_widgets:
+            return True
+        return self._edge_layer is not None and edge_id in self._edge_layer
+
+    #- Edge Layer ----
+
+    @property
+    def edge_layer(self):
+        """
+        Returns the batched edge layer, if enabled.
+
+        :returns: edge layer.
+        :rtype: EdgeLayer
+        """
+        return self._edge_layer
+
+    def setEdgeLayer(self, value):
+        """
+        Toggle the batched edge layer. When enabled, edges are drawn 
+        together in one pass, and edge widgets are only created while 
+        they're hovered or selected.
+
+        :param bool value: enable the edge layer.
+        """
+        if bool(value) == (self._edge_layer is not None):
+            return
+
+        if value:
+            log.info('drawing %d edges in a single layer.' % len(self._edge_widgets))
+            self._edge_layer = virtual.EdgeLayer(self)
+            self.addItem(self._edge_layer)
+            for edge_widget in self._edge_widgets.values():
+                src_conn, dest_conn = edge_widget.source_item(), edge_widget.dest_item()
+                if src_conn is None or dest_conn is None:
+                    continue
+
+                # selected edges keep their widget
+                if edge_widget.isSelected():
+                    layer_edge = virtual.LayerEdge(edge_widget.edge_data, src_conn, dest_conn, weight=edge_widget.weight)
+                    layer_edge.edge_type = edge_widget.edge_type
+                    self._edge_layer.addEdge(layer_edge, widget=edge_widget)
+                    continue
+
+                edge_type = edge_widget.edge_type
+                edge_widget.close()
+                self._addLayerEdge(edge_widget.edge_data, src_conn, dest_conn, edge_type=edge_type)
+            return
+
+        # create widgets for the edges drawn by the layer
+        layer = self._edge_layer
+        edges = [(e.edge_data, e.source_item(), e.dest_item(), e.edge_type) for e in layer.edges(realized=False) if e.is_valid]
+        layer.clear()
+        QtGui.QGraphicsScene.removeItem(self, layer)
+        self._edge_layer = None
+
+        for edge, src_conn, dest_conn, edge_type in edges:
+            self._newEdgeWidget(edge, src_conn, dest_conn, edge_type=edge_type)
+
+    def edgeSelectionChangedEvent(self):
+        """
+        Release edge widgets that are no longer selected.
+        """
+        if self._edge_layer is not None:
+            self._edge_layer.selectionChangedEvent()
+
+    #- Zoom ----
+
+    def zoomLevel(self):
+        """
+        Returns the highest zoom level of the scene's views. Widgets are 
+        shared by all views, so they are drawn at the detail of the 
+        closest view.
+
+        :returns: zoom level.
+        :rtype: float
+        """
+        views = self.views()
+        if not views:
+            return 1.0
+        return max([view.transform().m11() for view in views])
+
+    def updateZoom(self, zoom=None, force=False):
+        """
+        Update the node widgets when a view is zoomed, so that the level 
+        of detail and cache modes are set once per zoom change, rather 
+        than while painting.
+
+        :param float zoom: view zoom level (default is :meth:`zoomLevel`).
+        :param bool force: update the widgets regardless of the zoom.
+        """
+        if zoom is None:
+            zoom = self.zoomLevel()
+        self.updateLevelOfDetail(zoom, force=force)
+        self.updateCacheModes(zoom, force=force)
+
+    def updateLevelOfDetail(self, zoom=None, force=False):
+        """
+        Update the level of detail of the node widgets for the current zoom 
+        level (see :func:`node_widgets.lod_tier`). Widgets are only 
+        updated when the zoom crosses into a different tier.
+
+        :param float zoom: view zoom level (default is :meth:`zoomLevel`).
+        :param bool force: update the widgets regardless of the zoom.
+        """
+        if zoom is None:
+            zoom = self.zoomLevel()
+
+        tier = node_widgets.lod_tier(zoom)
+        if not force and tier == self._lod:
+            return
+
+        self._lod = tier
+        for widget in self.get_nodes():
+            if hasattr(widget, 'setLevelOfDetail'):
+                widget.setLevelOfDetail(tier)
+
+    #- Item Cache ----
+
+    def updateCacheModes(self, zoom=None, force=False):
+        """
+        Update the cache mode of the node widgets for the current zoom 
+        level (see :func:`node_widgets.cache_mode`). Widgets are only 
+        updated when the zoom crosses into a different level of detail.
+
+        :param float zoom: view zoom level (default is :meth:`zoomLevel`).
+        :param bool force: update the widgets regardless of the zoom.
+        """
+        if zoom is None:
+            zoom = self.zoomLevel()
+
+        mode = QtGui.QGraphicsItem.NoCache
+        if self.cache_nodes:
+            mode = node_widgets.cache_mode(zoom)
+
+        if not force and mode == self._cache_mode:
+            return
+
+        self._cache_mode = mode
+        for widget in self.get_nodes():
+            node_widgets.set_cache_mode(widget, mode)
+
+    def setNodeCache(self, value):
+        """
+        Enable or disable the node widget item cache.
+
+        :param bool value: cache node widgets.
+        """
+        self.cache_nodes = bool(value)
+        self.updateCacheModes(force=True)
+
+    #- Virtualization ----
+
+    @property
+    def is_virtual(self):
+        """
+        Returns true if the scene only creates widgets for visible nodes.
+
+        :returns: scene is virtualized.
+        :rtype: bool
+        """
+        return self._virtual
+
+    def setVirtual(self, value):
+        """
+        Toggle the virtualized scene mode. Nodes outside of the visible area 
+        are drawn as placeholders, and widgets are created (or reused from 
+        the widget pool) as the view scrolls over them.
+
+        :param bool value: virtualize the scene.
+        """
+        if value == self._virtual:
+            return
+
+        # visible nodes are queried from the layout store (see Graph.nodes_in_rect)
+        if value and self.graph.layout is None:
+            log.warning('cannot virtualize the scene, the graph layout store requires numpy.')
+            return
+
+        self._virtual = value
+        if value:
+            log.info('virtualizing scene (%d nodes).' % len(self.graph.dagnodes))
+            self._placeholders = virtual.PlaceholderLayer(self)
+            self.addItem(self._placeholders)
+            self._placeholders.updateBounds()
+            self.scheduleVisibleUpdate()
+            return
+
+        # create all of the remaining widgets
+        if self._placeholders is not None:
+            QtGui.QGraphicsScene.removeItem(self, self._placeholders)
+        self._placeholders = None
+        self._pool.clear()
+
+        widgets = []
+        for dag in self.graph.dagnodes.values():
+            if dag.id not in self._node_widgets:
+                widget = self._createNodeWidget(dag)
+                if widget is not None:
+                    widgets.append(widget)
+        self._realizeEdges(widgets)
+
+    def visibleRect(self):
+        """
+        Returns the area of the scene visible in the views.
+
+        :returns: visible scene rect.
+        :rtype: QtCore.QRectF
+        """
+        rect = QtCore.QRectF()
+        for view in self.views():
+            rect = rect.united(view.mapToScene(view.viewport().rect()).boundingRect())
+        return rect
+
+    def scheduleVisibleUpdate(self):
+        """
+        Update the visible nodes of a virtualized scene on the next frame.
+        """
+        if self._virtual and not self._visible_timer.isActive():
+            self._visible_timer.start()
+
+    def updateVisibleNodes(self):
+        """
+        Create widgets for the nodes in the visible area (plus a margin) of a
+        virtualized scene, and move widgets that have left it to the widget
+        pool. Selected nodes always keep their widgets.
+
+        :returns: new node widgets.
+        :rtype: list
+        """
+        if not self._virtual:
+            return []
+
+        rect = self.visibleRect()
+        if rect.isEmpty():
+            return []
+
+        margin = virtual.VIRTUAL_MARGIN
+        realize_rect = rect.adjusted(-margin, -margin, margin, margin)
+        keep_rect = realize_rect.adjusted(-margin, -margin, margin, margin)
+
+        # release widgets that have left the view
+        for widget in self.get_nodes():
+            if widget.isSelected():
+                continue
+            if not keep_rect.intersects(widget.sceneBoundingRect()):
+                self._releaseNode(widget)
+
+        widgets = []
+        for dag in self.graph.nodes_in_rect(realize_rect.left(), realize_rect.top(), realize_rect.right(), realize_rect.bottom()):
+            if dag.id in self._node_widgets:
+                continue
+
+            widget = self._pool.take(dag.id)
+            if widget is not None:
+                widget.setDebug(self.debug)
+                if hasattr(widget, 'setLevelOfDetail'):
+                    widget.setLevelOfDetail(self._lod)
+                node_widgets.set_cache_mode(widget, self._cache_mode)
+                self.addItem(widget)
+                self.registerWidget(widget)
+                widget.setPos(QtCore.QPointF(dag.pos[0], dag.pos[1]))
+            else:
+                widget = self._createNodeWidget(dag)
+
+            if widget is not None:
+                widgets.append(widget)
+
+        self._realizeEdges(widgets)
+        self._placeholders.update()
+        return widgets
+
+    def _releaseNode(self, widget):
+        """
+        Remove a node widget (and its edges) from the scene, and add it 
+        to the widget pool.
+
+        :param NodeWidget widget: node widget.
+        """
+        for conn_widget in getattr(widget, 'connections', dict()).values():
+            for edge_widget in list(conn_widget.connected_edges()):
+                edge_widget.close()
+
+        self.removeItem(widget)
+        self._pool.put(widget)
+
+    def discardPooledNodes(self):
+        """
+        Destroy pooled widgets whose dag nodes have been removed from the graph.
+        """
+        for dag_id in self._pool.keys():
+            if dag_id not in self.graph.dagnodes:
+                self._pool.discard(dag_id)
+
+    def _realizeEdges(self, widgets):
+        """
+        Create the edge widgets connected to the given node widgets, if
+        both ends have widgets.
+
+        :param list widgets: node widgets.
+        """
+        if not widgets:
+            return
+
+        network = self.graph.network
+        ids = [w.dagnode.id for w in widgets]
+        visited = set()
+        for src_id, dest_id, attrs in network.in_edges(nbunch=ids, data=True) + network.out_edges(nbunch=ids, data=True):
+            edge_id = (src_id, dest_id)
+            if edge_id in visited or self._hasEdge(edge_id):
+                continue
+
+            visited.add(edge_id)
+            if src_id in self._node_widgets and dest_id in self._node_widgets:
+                self._createEdgeWidget(attrs)
         
     def removeNodes(self, nodes):
         """
@@ -817,11 +1460,7 @@ class GraphicsScene(QtGui.QGraphicsScene):
         :returns: list of DagNode widgets.
         :rtype: list
         """
-        widgets = []
-        for item in self.items():
-            if self.is_node(item):            
-                widgets.append(item)
-        return widgets
+        return self._node_widgets.values()
 
     def get_node(self, name):
         """
@@ -832,13 +1471,9 @@ class GraphicsScene(QtGui.QGraphicsScene):
         :returns: node widget.
         :rtype: NodeWidget
         """
-        if name in self.scenenodes:
-            return self.scenenodes.get(name)
-
-        for node in self.get_nodes():
-            node_name = node.dagnode.name
-            if node_name == name:
-                return node
+        if name in self._node_widgets:
+            return self._node_widgets.get(name)
+        return self._lookup_name(name, self._node_names)
 
     def selectedNodes(self, nodes_only=False):
         """
@@ -889,15 +1524,14 @@ class GraphicsScene(QtGui.QGraphicsScene):
 
     def get_edges(self):
         """
-        Returns a list of edge widgets.
+        Returns a list of edge widgets (and the edges drawn by the edge layer).
 
         :returns: list of Edge widgets.
         :rtype: list
         """
-        edges = []
-        for item in self.items():
-            if self.is_edge(item):
-                edges.append(item)
+        edges = self._edge_widgets.values()
+        if self._edge_layer is not None:
+            edges.extend(self._edge_layer.edges(realized=False))
         return edges
 
     def get_edge(self, *args):
@@ -907,16 +1541,21 @@ class GraphicsScene(QtGui.QGraphicsScene):
         :returns: list of Edge attribute dictionaries.
         :rtype: list
         """
+        # edge names, ie: "node1.output,node2.input" (or a pair of connection names)
+        names = [a for a in args if isinstance(a, basestring)]
+        names.extend(['%s,%s' % (src, dest) for src in names for dest in names if src != dest])
+
         edges = []
-        for edge in self.get_edges():
-            if edge.name in args:
+        for name in names:
+            edge = self._lookup_name(name, self._edge_names)
+            if edge is not None and edge not in edges:
                 edges.append(edge)
-            if edge.source_connection in args:
-                if edge.dest_connection in args:
-                    edges.append(edge)
+
         for arg in args:
-            if arg in self.scenenodes:
-                edges.append(self.scenenodes.get(arg))
+            if type(arg) is tuple and arg in self._edge_widgets:
+                edge = self._edge_widgets.get(arg)
+                if edge not in edges:
+                    edges.append(edge)
         return edges
 
 
@@ -998,7 +1637,6 @@ class GraphicsScene(QtGui.QGraphicsScene):
                             self.line = QtGui.QGraphicsLineItem(QtCore.QLineF(event.scenePos(), event.scenePos()))
                             self.line.setPen(lpen)
                             self.addItem(self.line)
-                            self.update(self.itemsBoundingRect())
 
                         # disconnect the edge if this is an input
                         if item.isInputConnection():
@@ -1019,33 +1657,52 @@ class GraphicsScene(QtGui.QGraphicsScene):
 
                                         self.line = QtGui.QGraphicsLineItem(QtCore.QLineF(p1, event.scenePos()))
                                         self.addItem(self.line)
-                                        self.update(self.itemsBoundingRect())
 
         if event.button() == QtCore.Qt.RightButton:
             pass
 
+        # items repaint their own rects, no need to update the scene
         QtGui.QGraphicsScene.mousePressEvent(self, event)
-        self.update()
 
     def mouseMoveEvent(self, event):
         """
         Update the line as the user draws.
         """
-        modifiers = QtGui.QApplication.keyboardModifiers()
-        item = self.nodeAt(event.scenePos())
-        self._hover_nodes = []
+        # query the hovered nodes on the next frame
+        self._hover_pos = event.scenePos()
+        if not self._hover_timer.isActive():
+            self._hover_timer.start()
 
-        if item:
-            if self.is_node(item) or self.is_edge(item):
-                self._hover_nodes.append(item)
-
-        # if we're drawing a line...
+        # if we're drawing a line... (the line item only repaints its old & new rects)
         if self.line:
             newLine = QtCore.QLineF(self.line.line().p1(), event.scenePos())
             self.line.setLine(newLine)
 
         QtGui.QGraphicsScene.mouseMoveEvent(self, event)
-        self.update()
+
+    def updateHoverNodes(self):
+        """
+        Update the list of nodes & edges under the cursor. Called 
+        at most once per frame as the mouse moves.
+        """
+        if self._hover_pos is None:
+            return
+
+        item = self.nodeAt(self._hover_pos)
+        self._hover_nodes = []
+
+        # pick edges from the edge layer, and create a widget for the hovered edge
+        if self._edge_layer is not None:
+            hover_edge = getattr(item, '_layer_edge', None) if self.is_edge(item) else None
+            if item is None:
+                hover_edge = self._edge_layer.edgeAt(self._hover_pos)
+            widget = self._edge_layer.setHoverEdge(hover_edge)
+            if item is None:
+                item = widget
+
+        if item:
+            if self.is_node(item) or self.is_edge(item):
+                self._hover_nodes.append(item)
 
     def mouseReleaseEvent(self, event):
         """
@@ -1092,7 +1749,6 @@ class GraphicsScene(QtGui.QGraphicsScene):
             self.line.scene().removeItem(self.line)
             self.line = None
         QtGui.QGraphicsScene.mouseReleaseEvent(self, event)
-        self.update()
 
     def nodeChangedEvent(self, node):
         """
@@ -1108,6 +1764,14 @@ class GraphicsScene(QtGui.QGraphicsScene):
             node.setToolTip('(%d, %d)' % (pos[0], pos[1]))
             node.dagnode.pos = pos
 
+            # update the incident edges & the terminals of connected nodes
+            for conn_widget in getattr(node, 'connections', dict()).values():
+                if not hasattr(conn_widget, 'connected_edges'):
+                    continue
+                for edge_widget in conn_widget.connected_edges():
+                    edge_widget.invalidateGeometry()
+                    edge_widget.updateTerminals()
+
             # SIGNAL MANAGER (Scene -> Graph)
             #self.handler.sceneNodesUpdatedAction([node,])           
 
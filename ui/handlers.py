@@ -234,6 +234,13 @@ class SceneEventHandler(QtCore.QObject):
                 print '# DEBUG: removing node: ', node
                 node.close()
 
+        # widgets of deleted nodes in a virtualized scene
+        self.scene.discardPooledNodes()
+
+        # edges drawn by the edge layer
+        if self.scene.edge_layer is not None:
+            self.scene.edge_layer.removeMissing(self.graph.network)
+
     def dagNodesUpdatedEvent(self, dagnodes):
         """
         Update dag nodes from an external UI.
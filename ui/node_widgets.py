@@ -2,13 +2,202 @@
 import sys
 import math
 import weakref
+from collections import OrderedDict
 from PySide import QtCore, QtGui
 from SceneGraph.core import log
 from SceneGraph import options
 from SceneGraph.ui.commands import SceneNodesCommand, SceneChangedCommand
 
 
-class NodeWidget(QtGui.QGraphicsObject):
+# level of detail tiers
+LOD_FULL        = 0         # full detail
+LOD_SIMPLE      = 1         # simplified box & label
+LOD_FLAT        = 2         # flat colored rect, no terminals or labels
+
+# level of detail thresholds, by view zoom level (see GraphicsScene.updateLevelOfDetail)
+LOD_THRESHOLDS  = dict(
+    simple  = options.SCENEGRAPH_PREFERENCES.get('lod_simple').get('default'),
+    flat    = options.SCENEGRAPH_PREFERENCES.get('lod_flat').get('default'),
+    )
+
+
+def set_lod_thresholds(simple=None, flat=None):
+    """
+    Set the level of detail thresholds for node widgets.
+
+    :param float simple: nodes are simplified below this level of detail.
+    :param float flat: nodes are drawn flat below this level of detail.
+    """
+    if simple is not None:
+        LOD_THRESHOLDS['simple'] = float(simple)
+    if flat is not None:
+        LOD_THRESHOLDS['flat'] = float(flat)
+
+
+def lod_tier(zoom):
+    """
+    Returns the level of detail tier for the given zoom level.
+
+    :param float zoom: view zoom level.
+
+    :returns: level of detail tier.
+    :rtype: int
+    """
+    if zoom < LOD_THRESHOLDS.get('flat'):
+        return LOD_FLAT
+    if zoom < LOD_THRESHOLDS.get('simple'):
+        return LOD_SIMPLE
+    return LOD_FULL
+
+
+def cache_mode(zoom):
+    """
+    Returns the item cache mode for node widgets at the given zoom level. 
+    Nodes are cached in device coordinates, so panning the view reuses 
+    the cached pixmaps, and only a zoom change re-renders them. Below the 
+    flat level of detail, nodes are plain rects and aren't cached.
+
+    :param float zoom: view zoom level.
+
+    :returns: cache mode.
+    :rtype: QtGui.QGraphicsItem.CacheMode
+    """
+    if zoom < LOD_THRESHOLDS.get('flat'):
+        return QtGui.QGraphicsItem.NoCache
+    return QtGui.QGraphicsItem.DeviceCoordinateCache
+
+
+def set_cache_mode(item, mode):
+    """
+    Set the cache mode of an item and its children.
+
+    :param QtGui.QGraphicsItem item: graphics item.
+    :param QtGui.QGraphicsItem.CacheMode mode: cache mode.
+    """
+    if item.cacheMode() != mode:
+        item.setCacheMode(mode)
+    for child in item.childItems():
+        set_cache_mode(child, mode)
+
+
+def invalidate_cache(item):
+    """
+    Invalidate the cached pixmaps of an item and its children. Each 
+    child has its own cache, so updating the parent alone won't 
+    re-render them.
+
+    :param QtGui.QGraphicsItem item: graphics item.
+    """
+    item.update()
+    for child in item.childItems():
+        invalidate_cache(child)
+
+
+# cached drop shadow pixmaps
+SHADOW_CACHE        = OrderedDict()
+SHADOW_CACHE_SIZE   = 128
+
+
+def zoom_bucket(zoom):
+    """
+    Round a zoom level to the nearest power of two (0.25 - 4.0), so 
+    that cached pixmaps are only re-rendered at significant zoom changes.
+
+    :param float zoom: zoom level.
+
+    :returns: zoom bucket.
+    :rtype: float
+    """
+    if zoom <= 0:
+        return 1.0
+    return 2.0 ** max(-2, min(2, int(round(math.log(zoom, 2)))))
+
+
+def shadow_pixmap(width, height, color, radius=16, corner=7, zoom=1.0):
+    """
+    Returns a blurred rounded rect pixmap to draw as a drop shadow. Pixmaps are 
+    cached by (size, color, zoom bucket), so each shadow is only blurred once.
+
+    The pixmap is padded by the blur radius on each side, and rendered at the 
+    zoom bucket scale.
+
+    :param float width: shadow width.
+    :param float height: shadow height.
+    :param QtGui.QColor color: shadow color.
+    :param int radius: blur radius.
+    :param int corner: rounded corner radius.
+    :param float zoom: view zoom level.
+
+    :returns: shadow pixmap.
+    :rtype: QtGui.QPixmap
+    """
+    scale = zoom_bucket(zoom)
+    key = (int(width), int(height), color.rgba(), radius, corner, scale)
+
+    pixmap = SHADOW_CACHE.pop(key, None)
+    if pixmap is None:
+        w = int(math.ceil((int(width) + radius*2) * scale))
+        h = int(math.ceil((int(height) + radius*2) * scale))
+
+        # draw the shape
+        source = QtGui.QImage(w, h, QtGui.QImage.Format_ARGB32_Premultiplied)
+        source.fill(0)
+        painter = QtGui.QPainter(source)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.scale(scale, scale)
+        painter.setPen(QtCore.Qt.NoPen)
+        painter.setBrush(QtGui.QBrush(color))
+        painter.drawRoundedRect(QtCore.QRectF(radius, radius, int(width), int(height)), corner, corner)
+        painter.end()
+
+        # blur it
+        scene = QtGui.QGraphicsScene()
+        item = QtGui.QGraphicsPixmapItem(QtGui.QPixmap.fromImage(source))
+        blur = QtGui.QGraphicsBlurEffect()
+        blur.setBlurRadius(radius * scale)
+        item.setGraphicsEffect(blur)
+        scene.addItem(item)
+
+        result = QtGui.QImage(w, h, QtGui.QImage.Format_ARGB32_Premultiplied)
+        result.fill(0)
+        painter = QtGui.QPainter(result)
+        scene.render(painter, QtCore.QRectF(0, 0, w, h), QtCore.QRectF(0, 0, w, h))
+        painter.end()
+        pixmap = QtGui.QPixmap.fromImage(result)
+
+    # most recently used pixmaps are at the end
+    SHADOW_CACHE[key] = pixmap
+    while len(SHADOW_CACHE) > SHADOW_CACHE_SIZE:
+        SHADOW_CACHE.popitem(last=False)
+    return pixmap
+
+
+class NodeCacheMixin(object):
+    """
+    Re-renders the cached pixmaps of a node widget when its dag node 
+    changes. Shared by the node, dot & note widgets.
+    """
+    def nodeAttributeUpdatedEvent(self, dagnode, *args, **kwargs):
+        """
+        Called when a dag node attribute (color, enabled, etc.) changes.
+        """
+        self.invalidateCache()
+
+    def nodeNameChangedEvent(self, dagnode, *args, **kwargs):
+        """
+        Called when the dag node is renamed. The name is validated 
+        by the graph, so nothing is returned.
+        """
+        self.invalidateCache()
+
+    def invalidateCache(self):
+        """
+        Re-render the cached pixmaps of this node (see :func:`invalidate_cache`).
+        """
+        invalidate_cache(self)
+
+
+class NodeWidget(QtGui.QGraphicsObject, NodeCacheMixin):
 
     Type           = QtGui.QGraphicsObject.UserType + 1
     doubleClicked  = QtCore.Signal()
@@ -50,6 +239,10 @@ class NodeWidget(QtGui.QGraphicsObject):
         self.is_hover        = False                  # indicates that the node is under the cursor
         self._render_effects = True                   # enable fx
         self._label_coord    = [0,0]                  # default coordiates of label
+        self._lod            = LOD_FULL               # current level of detail tier
+        self._effects        = False                  # effects currently applied
+        self.shadow_offset   = 8                      # background shadow offset
+        self.shadow_radius   = 16                     # background shadow blur radius
 
         # tags
         self._evaluate_tag   = False                  # indicates the node is set to "evaluate" (a la Houdini)
@@ -77,15 +270,21 @@ class NodeWidget(QtGui.QGraphicsObject):
 
         # signals/slots
         self.label.doubleClicked.connect(self.labelDoubleClickedEvent)
+        self.dagnode.nodeLayoutChanged += self.nodeLayoutChangedEvent
+        self.dagnode.nodeAttributeUpdated += self.nodeAttributeUpdatedEvent
+        self.dagnode.nodeNameChanged += self.nodeNameChangedEvent
 
         # set node position
         self.setPos(QtCore.QPointF(self.dagnode.pos[0], self.dagnode.pos[1]))
-        self.drawConnections()
+        self.updateLayout()
 
     def close(self):
         """
         Cleanup and delete the node and children.
         """
+        self.dagnode.nodeLayoutChanged.discard(self.nodeLayoutChangedEvent)
+        self.dagnode.nodeAttributeUpdated.discard(self.nodeAttributeUpdatedEvent)
+        self.dagnode.nodeNameChanged.discard(self.nodeNameChangedEvent)
         for item in [self.background, self.label]:
             if item is not None:
                 if item.scene() is not None:
@@ -204,8 +403,20 @@ class NodeWidget(QtGui.QGraphicsObject):
         """
         if change == self.ItemPositionHasChanged:
             self.nodeChanged.emit(self)
+            self.setToolTip(self.dagnode.docstring)
+        elif change == self.ItemSelectedHasChanged:
+            self.is_selected = self.isSelected()
+            self.updateStyle()
         return super(NodeWidget, self).itemChange(change, value)
 
+    def hoverEnterEvent(self, event):
+        QtGui.QGraphicsObject.hoverEnterEvent(self, event)
+        self.invalidateCache()
+
+    def hoverLeaveEvent(self, event):
+        QtGui.QGraphicsObject.hoverLeaveEvent(self, event)
+        self.invalidateCache()
+
     def mouseDoubleClickEvent(self, event):
         """
         translate Y: height_expanded - base_height/2
@@ -488,6 +699,7 @@ class NodeWidget(QtGui.QGraphicsObject):
 
             if conn_widget is None:
                 conn_widget = Connection(self, conn_dag, conn_name)
+                conn_widget.setVisible(self._lod != LOD_FLAT)
                 self.connections[conn_name] = conn_widget
 
             if conn_widget.is_input:
@@ -502,6 +714,12 @@ class NodeWidget(QtGui.QGraphicsObject):
                 conn_widget.setX(out_start.x())
                 out_count += 1
 
+            conn_widget.updateLabel()
+
+            # the terminal moved, update the edge geometry
+            for edge in conn_widget.connected_edges():
+                edge.invalidateGeometry()
+
     def paint(self, painter, option, widget):
         """
         Paint the widget container and all of the child widgets.
@@ -518,47 +736,6 @@ class NodeWidget(QtGui.QGraphicsObject):
         if option.state & QtGui.QStyle.State_MouseOver:
             self.is_hover = True
 
-        # translate the label
-        self.label.setPos(self.label_pos)        
-        self.drawConnections()
-
-        # adjust size, if necessary
-        if self.label.width > self.width:
-            self.width = self.label.width + 14
-
-        """
-        if self.label.height > (self.dagnode.base_height * 2):
-            self.dagnode.base_height = self.label.height
-        """
-
-        # set the tooltip to the current node's documentation string.
-        self.setToolTip(self.dagnode.docstring)
-
-        # render fx
-        if self._render_effects:
-            # background
-            self.bgshd = QtGui.QGraphicsDropShadowEffect()
-            self.bgshd.setBlurRadius(16)
-            self.bgshd.setColor(self.shadow_color)
-            self.bgshd.setOffset(8,8)
-            self.background.setGraphicsEffect(self.bgshd)
-
-            # label
-            self.lblshd = QtGui.QGraphicsDropShadowEffect()
-            self.lblshd.setBlurRadius(8)
-            self.lblshd.setColor(self.shadow_color)
-            self.lblshd.setOffset(4,4)
-            self.label.setGraphicsEffect(self.lblshd)
-
-        else:
-            if self.background.graphicsEffect():
-                self.background.graphicsEffect().deleteLater()
-                self.bgshd = QtGui.QGraphicsDropShadowEffect()
-
-            if self.label.graphicsEffect():
-                self.label.graphicsEffect().deleteLater()
-                self.lblshd = QtGui.QGraphicsDropShadowEffect()
-
         if self._debug:
             debug_color = QtGui.QColor(*[0, 0, 0])
             painter.setBrush(QtCore.Qt.NoBrush)
@@ -589,6 +766,101 @@ class NodeWidget(QtGui.QGraphicsObject):
             painter.drawLine(vline)
 
 
+    def nodeLayoutChangedEvent(self, dagnode, *args, **kwargs):
+        """
+        Called when the dag node's size or connections change.
+        """
+        self.updateLayout()
+
+    def updateLayout(self):
+        """
+        Update the node size, label position and connection terminals. This 
+        is called when the node changes (see :meth:`DagNode.nodeLayoutChanged`), 
+        rather than during paint.
+        """
+        if getattr(self, '_updating_layout', False):
+            return
+
+        self._updating_layout = True
+        try:
+            self.prepareGeometryChange()
+            self.label.updateLabel()
+
+            # adjust size, if necessary
+            if self.label.width > self.width:
+                self.width = self.label.width + 14
+
+            # translate the label
+            self.label.setPos(self.label_pos)        
+            self.drawConnections()
+
+            # set the tooltip to the current node's documentation string.
+            self.setToolTip(self.dagnode.docstring)
+
+            # update the effect colors
+            self.updateEffects(self._render_effects and self._lod == LOD_FULL)
+        finally:
+            self._updating_layout = False
+        self.invalidateCache()
+
+    def updateStyle(self):
+        """
+        Update the label, terminal & effect colors when the node state 
+        (selection, debug) changes. The node size is unchanged.
+        """
+        self.label.updateLabel()
+        for conn in self.connections.values():
+            conn.updateLabelState()
+        self.updateEffects(self._render_effects and self._lod == LOD_FULL)
+        self.invalidateCache()
+
+    def updateEffects(self, enabled):
+        """
+        Update the node effects. The background shadow is drawn from a cached 
+        pixmap by the :class:`NodeBackground`, the label shadow effect is only 
+        created (or removed) when the effects are toggled.
+
+        :param bool enabled: effects are enabled.
+        """
+        if enabled == self._effects:
+            if enabled and self.label.graphicsEffect():
+                color = self.shadow_color
+                if self.label.graphicsEffect().color() != color:
+                    self.label.graphicsEffect().setColor(color)
+            return
+
+        self._effects = enabled
+        self.background.updateShadow()
+        if enabled:
+            lblshd = QtGui.QGraphicsDropShadowEffect()
+            lblshd.setBlurRadius(8)
+            lblshd.setColor(self.shadow_color)
+            lblshd.setOffset(4,4)
+            self.label.setGraphicsEffect(lblshd)
+        else:
+            # deletes the current effect
+            self.label.setGraphicsEffect(None)
+
+    def setLevelOfDetail(self, tier):
+        """
+        Set the level of detail tier. Labels & terminals are hidden
+        at the lowest tier, effects are only rendered at full detail. 
+        Called by the scene when the zoom level changes 
+        (see :meth:`GraphicsScene.updateLevelOfDetail`).
+
+        :param int tier: level of detail tier.
+        """
+        self.updateEffects(self._render_effects and tier == LOD_FULL)
+        if tier == self._lod:
+            return
+
+        self._lod = tier
+        visible = tier != LOD_FLAT
+        self.label.setVisible(visible)
+        for conn in self.connections.values():
+            conn.setVisible(visible)
+            conn.updateLabelState()
+
     def setDebug(self, value):
         """
         Set the debug value of all child nodes.
@@ -599,6 +871,9 @@ class NodeWidget(QtGui.QGraphicsObject):
             for item in self.childItems():
                 if hasattr(item, '_debug'):
                     item._debug = value
+            for conn in self.connections.values():
+                conn.updateLabel()
+            self.updateStyle()
 
     @classmethod
     def ParentClasses(cls, p=None):
@@ -614,51 +889,29 @@ class NodeWidget(QtGui.QGraphicsObject):
         return base_classes
 
 
-class EdgeWidget(QtGui.QGraphicsObject):
-    
-    Type          = QtGui.QGraphicsObject.UserType + 2
-    adjustment    = 5
-    nodeDeleted   = QtCore.Signal(object)
-    node_class    = 'edge'
+class EdgeBase(object):
     """
-    class EdgeWidget:
-
-        Widget represention of an graph edge.
-
-    params:
-        edge (dict)              - nx edge: (id, id, {attributes})
-        source_item (Connection) - source node connection
-        dest_item (Connection)   - destination node connection
+    Terminal connections & cached geometry shared by edge widgets and 
+    the lightweight edges drawn by the batched edge layer (see 
+    :class:`~ui.virtual.LayerEdge`). Geometry is in scene coordinates.
+
+    :param dict edge: nx edge attributes.
+    :param Connection source_item: source node connection.
+    :param Connection dest_item: destination node connection.
+    :param float weight: edge weight.
     """
-    def __init__(self, edge, source_item, dest_item, weight=1.0, *args, **kwargs):
-        QtGui.QGraphicsObject.__init__(self)
+    def __init__(self, edge, source_item, dest_item, weight=1.0):
 
-        #edge: (id, id, {attributes})
         # edge attributes
         self.src_id          = edge.get('src_id')
         self.dest_id         = edge.get('dest_id')
         self.edge_data       = edge                   # nx edge: (id, id, {attributes})  
 
-        # globals
         self._l_color        = [224, 224, 224]        # line color
-        self._p_color        = [10, 10, 10, 255]      # pen color (outer rim)
-        self._h_color        = [90, 245, 60]          # highlight color
-        self._s_color        = [0, 0, 0, 60]          # shadow color
-        
-        self.visible         = True
         self._debug          = False
-        self.is_enabled      = True                   # node is enabled (will eval)  
-        self.is_selected     = False                  # indicates that the node is selected
-        self.is_hover        = False                  # indicates that the node is under the cursor
-        self.alt_modifier    = False                  # indicates that the alt key is pressed  
-        self._render_effects = True                   # enable fx
-
         self.weight          = weight
         self.arrow_size      = 8.0
-        self.cp_size         = 3.0                    # debug: control point size
-        self.show_conn       = False                  # show connection string
-        self.multi_conn      = False                  # multiple connections (future)
-        self.edge_type       = edge.get('edge_type', 'bezier')
+        self._edge_type      = edge.get('edge_type', 'bezier')
         self.style           = edge.get('style', 'solid')  
 
         # Connection widgets
@@ -669,21 +922,16 @@ class EdgeWidget(QtGui.QGraphicsObject):
         self.source_point    = QtCore.QPointF(0,0)
         self.dest_point      = QtCore.QPointF(0,0)
         self.center_point    = QtCore.QPointF(0,0)  
-        
-        # geometry
-        self.gline           = QtGui.QGraphicsLineItem(self)
+
+        # cached geometry (see EdgeBase.updateGeometry)
         self.bezier_path     = QtGui.QPainterPath()
         self.poly_line       = QtGui.QPolygonF()
-
-        # flags
-        self.setFlag(QtGui.QGraphicsItem.ItemIsSelectable, True)
-        self.setFlag(QtGui.QGraphicsItem.ItemIsFocusable, True)
-
-        self.setFlag(QtGui.QGraphicsObject.ItemSendsGeometryChanges, True)
-        self.setFlag(QtGui.QGraphicsObject.ItemSendsScenePositionChanges, True)
-        self.setAcceptsHoverEvents(True)
-        self.setZValue(-1.0)
-
+        self._geometry_valid = False
+        self._line           = QtCore.QLineF()
+        self._arrowhead      = None
+        self._shape          = QtGui.QPainterPath()
+        self._rect           = QtCore.QRectF()
+        self._layer          = None                   # batched edge layer (see virtual.EdgeLayer)
 
     def __str__(self):
         return 'Edge("%s")' % self.name
@@ -691,21 +939,6 @@ class EdgeWidget(QtGui.QGraphicsObject):
     def __repr__(self):
         return 'Edge("%s")' % self.name
 
-    def __del__(self):
-        self.breakConnections()
-
-    def close(self):
-        """
-        Delete the edge and child items.
-        """
-        self.breakConnections()
-        for item in [self.gline]:
-            if item.scene() is not None:
-                item.scene().removeItem(item)
-
-        if self.scene() is not None:
-            self.scene().removeItem(self)
-
     @property 
     def ids(self):
         """
@@ -737,6 +970,17 @@ class EdgeWidget(QtGui.QGraphicsObject):
         conn.connections[self.ids] = self
         return True
 
+    def updateTerminals(self):
+        """
+        Update the connection terminals of the source & destination
+        nodes (ie: rotate dot node terminals to face the edge).
+        """
+        for conn in [self.source_item(), self.dest_item()]:
+            if conn is None:
+                continue
+            if hasattr(conn.node, 'updateConnections'):
+                conn.node.updateConnections()
+
     def disconnect_terminal(self, conn):
         """
         Disconnect the edge widget from the connection.
@@ -750,7 +994,7 @@ class EdgeWidget(QtGui.QGraphicsObject):
             log.warning('invalid connection.')
             return False
 
-        if self.ids in conn.connections:
+        if conn.connections.get(self.ids) is self:
             conn.connections.pop(self.ids)
             return True
         return False
@@ -768,6 +1012,8 @@ class EdgeWidget(QtGui.QGraphicsObject):
 
         if not self.disconnect_terminal(self.dest_item()):
             result = False
+
+        self.updateTerminals()
         return result
 
     def callback_source_deleted(self):
@@ -839,74 +1085,96 @@ class EdgeWidget(QtGui.QGraphicsObject):
         return "%s,%s" % (self.source_connection, self.dest_connection)
 
     @property
-    def line_color(self):
+    def edge_type(self):
         """
-        :returns: current line color.
-        :rtype: QtGui.QColor
+        :returns: edge type (bezier or polygon).
+        :rtype: str
         """
-        if self._debug:
-            if self.is_selected:
-                return QtGui.QColor(*[199, 255, 200, 125])
+        return self._edge_type
 
-            if self.is_hover:
-                return QtGui.QColor(*[199, 227, 255, 125])
+    @edge_type.setter
+    def edge_type(self, value):
+        if value != self._edge_type:
+            self._edge_type = value
+            self.invalidateGeometry()
 
-            return QtGui.QColor(*[200, 200, 200, 125])
-
-        if self.is_selected:
-            return QtGui.QColor(*self._h_color)           
-
-        if self.is_hover:
-            if self.alt_modifier:
-                return QtGui.QColor(*[164, 224, 255])
-            return QtGui.QColor(*[109, 205, 255])
+    #- Geometry ----
+    def invalidateGeometry(self):
+        """
+        Clear the cached edge geometry. Called when one of the 
+        endpoint nodes moves, or the edge type changes.
+        """
+        if not self._geometry_valid:
+            return
+        self._geometry_valid = False
 
-        return QtGui.QColor(*self._l_color)
+        if self._layer is not None:
+            self._layer.edgeChanged(self)
 
-    #- Events -----
-    def hoverEnterEvent(self, event):
-        QtGui.QGraphicsObject.hoverEnterEvent(self, event)
+    def updateGeometry(self):
+        """
+        Rebuild the cached line, path, arrowhead & shape if 
+        they've been invalidated.
+        """
+        if self._geometry_valid:
+            return
 
-    def hoverLeaveEvent(self, event):
-        self.alt_modifier = False
-        QtGui.QGraphicsObject.hoverLeaveEvent(self, event)
+        line = self._computeLine()
+        self._line = line
+        self.bezier_path = self._computeBezierPath(line)
+        self._arrowhead = self._computeArrowhead(line)
 
-    def hoverMoveEvent(self, event):
-        QtGui.QGraphicsObject.hoverMoveEvent(self, event)
+        # selection shape
+        path = QtGui.QPainterPath()
+        stroker = QtGui.QPainterPathStroker()
+        stroker.setWidth(30)
+        path.moveTo(line.p1())
+        path.lineTo(line.p2())
+        self._shape = stroker.createStroke(path)
 
-    def mouseMoveEvent(self, event):
-        QtGui.QGraphicsObject.mouseMoveEvent(self, event)
+        # bounding rect
+        extra = (self._penWidth() + 100)  / 2.0
+        p1 = line.p1()
+        p2 = line.p2()
+        self._rect = QtCore.QRectF(p1, QtCore.QSizeF(p2.x() - p1.x(), p2.y() - p1.y())).normalized().adjusted(-extra, -extra, extra, extra)
+        self._geometry_valid = True
 
-    def boundingRect(self):
+    def _penWidth(self):
         """
-        Create a bounding rect for the line.
-
-        :returns: line bounding rect.
-        :rtype: QtCore.QRectF
+        Returns the pen width used to pad the bounding rect.
         """
-        extra = (self.gline.pen().width() + 100)  / 2.0
-        line = self.getLine()
-        p1 = line.p1()
-        p2 = line.p2()
-        return QtCore.QRectF(p1, QtCore.QSizeF(p2.x() - p1.x(), p2.y() - p1.y())).normalized().adjusted(-extra, -extra, extra, extra)
+        return float(self.weight)
 
     def getLine(self):
         """
         Return the line between two points.
         """
+        self.updateGeometry()
+        return QtCore.QLineF(self._line)
+
+    def _computeLine(self):
+        """
+        Build the line between the source & destination terminals.
+        """
         p1 = self.source_item().sceneBoundingRect().center()
         p2 = self.dest_item().sceneBoundingRect().center()
 
         # offset the end point a few pixels
         p2 = QtCore.QPointF(p2.x(), p2.y())
-        return QtCore.QLineF(self.mapFromScene(p1), self.mapFromScene(p2))
+        return QtCore.QLineF(p1, p2)
 
     def getBezierPath(self, poly=False):
         """
         Returns a bezier path based on the current line.
+        """
+        self.updateGeometry()
+        return QtGui.QPainterPath(self.bezier_path)
+
+    def _computeBezierPath(self, line):
+        """
+        Build a bezier path from the given line.
         Crude, but works.
         """
-        line = self.getLine()
         path = QtGui.QPainterPath()
         path.moveTo(line.p1().x(), line.p1().y())
 
@@ -943,19 +1211,49 @@ class EdgeWidget(QtGui.QGraphicsObject):
         #path.quadTo(line.p1(), line.p2())
         return path
 
+    def _computeArrowhead(self, line):
+        """
+        Build the arrowhead polygon at the center of the line.
+
+        :returns: arrowhead polygon (or None if the line has no length).
+        :rtype: QtGui.QPolygonF
+        """
+        if not line.length() > 0.0:
+            return None
+
+        angle = math.acos(line.dx() / line.length())
+        if self.edge_type == 'bezier':
+            bline = QtCore.QLineF(self.bezier_path.pointAtPercent(0.47), self.bezier_path.pointAtPercent(0.53))  
+            if bline.length() > 0.0:
+                angle = math.acos(bline.dx() / bline.length())
+
+        if line.dy() >= 0:
+            angle = (math.pi * 2.0) - angle
+
+        revArrow = -1
+        center_point = line.pointAt(0.5)
+
+        arrow_p1 = center_point + QtCore.QPointF(math.sin(angle + math.pi / 3.0) * self.arrow_size * revArrow,
+                                    math.cos(angle + math.pi / 3.0) * self.arrow_size * revArrow)
+        arrow_p2 = center_point + QtCore.QPointF(math.sin(angle + math.pi - math.pi / 3.0) * self.arrow_size * revArrow,
+                                    math.cos(angle + math.pi - math.pi / 3.0) * self.arrow_size * revArrow)
+
+        # build the arrowhead
+        arrowhead = QtGui.QPolygonF()
+
+        # set the polygon points
+        for point in [center_point, arrow_p1, arrow_p2]:
+            arrowhead.append(point)
+        return arrowhead
+
     def getCenterPoint(self):
         """
         Returns the node center point.
         """ 
-        line = self.getLine()
-        centerX = (line.p1().x() + line.p2().x())/2
-        centerY = (line.p1().y() + line.p2().y())/2
-        return QtCore.QPointF(centerX, centerY)
+        return self.getLine().pointAt(0.5)
 
     def getEndPoint(self):
-        line = self.getLine()
-        ep = line.p2()
-        return QtCore.QPointF(ep.x(), ep.y())
+        return self.getLine().p2()
 
     def getStartItem(self):
         """
@@ -975,18 +1273,162 @@ class EdgeWidget(QtGui.QGraphicsObject):
         """
         return self.dest_item().parentItem()
 
+
+class EdgeWidget(QtGui.QGraphicsObject, EdgeBase):
+    
+    Type          = QtGui.QGraphicsObject.UserType + 2
+    adjustment    = 5
+    nodeDeleted   = QtCore.Signal(object)
+    node_class    = 'edge'
+    """
+    class EdgeWidget:
+
+        Widget represention of an graph edge.
+
+    params:
+        edge (dict)              - nx edge: (id, id, {attributes})
+        source_item (Connection) - source node connection
+        dest_item (Connection)   - destination node connection
+    """
+    def __init__(self, edge, source_item, dest_item, weight=1.0, *args, **kwargs):
+        QtGui.QGraphicsObject.__init__(self)
+        EdgeBase.__init__(self, edge, source_item, dest_item, weight=weight)
+
+        # globals
+        self._p_color        = [10, 10, 10, 255]      # pen color (outer rim)
+        self._h_color        = [90, 245, 60]          # highlight color
+        self._s_color        = [0, 0, 0, 60]          # shadow color
+        
+        self.visible         = True
+        self.is_enabled      = True                   # node is enabled (will eval)  
+        self.is_selected     = False                  # indicates that the node is selected
+        self.is_hover        = False                  # indicates that the node is under the cursor
+        self.alt_modifier    = False                  # indicates that the alt key is pressed  
+        self._render_effects = True                   # enable fx
+
+        self.cp_size         = 3.0                    # debug: control point size
+        self.show_conn       = False                  # show connection string
+        self.multi_conn      = False                  # multiple connections (future)
+        
+        # geometry
+        self.gline           = QtGui.QGraphicsLineItem(self)
+        self._layer_edge     = None                   # edge layer record this widget was realized from
+
+        # flags
+        self.setFlag(QtGui.QGraphicsItem.ItemIsSelectable, True)
+        self.setFlag(QtGui.QGraphicsItem.ItemIsFocusable, True)
+
+        self.setFlag(QtGui.QGraphicsObject.ItemSendsGeometryChanges, True)
+        self.setFlag(QtGui.QGraphicsObject.ItemSendsScenePositionChanges, True)
+        self.setAcceptsHoverEvents(True)
+        self.setZValue(-1.0)
+
+    def __str__(self):
+        return 'Edge("%s")' % self.name
+
+    def __repr__(self):
+        return 'Edge("%s")' % self.name
+
+    def __del__(self):
+        self.breakConnections()
+
+    def close(self):
+        """
+        Delete the edge and child items. If the widget was realized 
+        from the edge layer, the layer edge is removed as well.
+        """
+        layer_edge = self._layer_edge
+        self._layer_edge = None
+        self.breakConnections()
+        for item in [self.gline]:
+            if item.scene() is not None:
+                item.scene().removeItem(item)
+
+        if self.scene() is not None:
+            self.scene().removeItem(self)
+
+        if layer_edge is not None:
+            layer_edge.widget = None
+            layer_edge.close()
+
+    @property
+    def line_color(self):
+        """
+        :returns: current line color.
+        :rtype: QtGui.QColor
+        """
+        if self._debug:
+            if self.is_selected:
+                return QtGui.QColor(*[199, 255, 200, 125])
+
+            if self.is_hover:
+                return QtGui.QColor(*[199, 227, 255, 125])
+
+            return QtGui.QColor(*[200, 200, 200, 125])
+
+        if self.is_selected:
+            return QtGui.QColor(*self._h_color)           
+
+        if self.is_hover:
+            if self.alt_modifier:
+                return QtGui.QColor(*[164, 224, 255])
+            return QtGui.QColor(*[109, 205, 255])
+
+        return QtGui.QColor(*self._l_color)
+
+    #- Events -----
+    def hoverEnterEvent(self, event):
+        QtGui.QGraphicsObject.hoverEnterEvent(self, event)
+
+    def hoverLeaveEvent(self, event):
+        self.alt_modifier = False
+        QtGui.QGraphicsObject.hoverLeaveEvent(self, event)
+
+    def hoverMoveEvent(self, event):
+        QtGui.QGraphicsObject.hoverMoveEvent(self, event)
+
+    def mouseMoveEvent(self, event):
+        QtGui.QGraphicsObject.mouseMoveEvent(self, event)
+
+    def boundingRect(self):
+        """
+        Create a bounding rect for the line.
+
+        :returns: line bounding rect.
+        :rtype: QtCore.QRectF
+        """
+        self.updateGeometry()
+        return QtCore.QRectF(self._rect)
+
+    #- Geometry ----
+    def invalidateGeometry(self):
+        """
+        Clear the cached edge geometry. Called when one of the 
+        endpoint nodes moves, or the edge type changes.
+        """
+        if not self._geometry_valid:
+            return
+        self.prepareGeometryChange()
+        EdgeBase.invalidateGeometry(self)
+        self.update()
+
+    def _penWidth(self):
+        return self.gline.pen().width()
+
+    def _computeLine(self):
+        """
+        Build the line between the source & destination terminals.
+        """
+        line = EdgeBase._computeLine(self)
+        return QtCore.QLineF(self.mapFromScene(line.p1()), self.mapFromScene(line.p2()))
+
     def shape(self):
         """
          .. todo::
             - add some adjustments to the line to make it more selectable.
         """
-        path = QtGui.QPainterPath()
-        stroker = QtGui.QPainterPathStroker()
-        stroker.setWidth(30)
-        line = self.getLine()
-        path.moveTo(line.p1())
-        path.lineTo(line.p2())
-        return stroker.createStroke(path)
+        self.updateGeometry()
+        return self._shape
 
     def paint(self, painter, option, widget=None):
         """
@@ -1006,7 +1448,8 @@ class EdgeWidget(QtGui.QGraphicsObject):
 
         painter.setRenderHints(QtGui.QPainter.Antialiasing | QtGui.QPainter.TextAntialiasing | QtGui.QPainter.HighQualityAntialiasing)
 
-        line = self.getLine()
+        self.updateGeometry()
+        line = self._line
         painter.setBrush(self.line_color)
 
         epen = self.gline.pen()
@@ -1017,35 +1460,9 @@ class EdgeWidget(QtGui.QGraphicsObject):
         #self.cp.visible = False
         draw_arrowhead = True
 
-        # get the bezier line center        
-        self.bezier_path = self.getBezierPath()
-
-        # calculate the arrowhead geometry
-        if line.length() > 0.0:
-            angle = math.acos(line.dx() / line.length())
-            if self.edge_type == 'bezier':
-                bline = QtCore.QLineF(self.bezier_path.pointAtPercent(0.47), self.bezier_path.pointAtPercent(0.53))  
-                angle = math.acos(bline.dx() / bline.length())
-
-            if line.dy() >= 0:
-                angle = (math.pi * 2.0) - angle
-
-            revArrow = -1
-            center_point = self.getCenterPoint()
-            end_point = self.getEndPoint()
-
-            arrow_p1 = center_point + QtCore.QPointF(math.sin(angle + math.pi / 3.0) * self.arrow_size * revArrow,
-                                        math.cos(angle + math.pi / 3.0) * self.arrow_size * revArrow)
-            arrow_p2 = center_point + QtCore.QPointF(math.sin(angle + math.pi - math.pi / 3.0) * self.arrow_size * revArrow,
-                                        math.cos(angle + math.pi - math.pi / 3.0) * self.arrow_size * revArrow)
-
-            # build the arrowhead
-            arrowhead = QtGui.QPolygonF()
-
-            # set the polygon points
-            for point in [center_point, arrow_p1, arrow_p2]:
-                arrowhead.append(point)
-
+        # cached arrowhead geometry (see EdgeWidget.updateGeometry)
+        arrowhead = self._arrowhead
+        if arrowhead is not None:
             if line:
                 if not self.alt_modifier:
                     if draw_arrowhead:
@@ -1085,6 +1502,7 @@ class EdgeWidget(QtGui.QGraphicsObject):
                 painter.drawEllipse(self.dest_point, self.cp_size, self.cp_size)
 
 
+
 class Connection(QtGui.QGraphicsObject):
     
     Type                = QtGui.QGraphicsObject.UserType + 4
@@ -1376,7 +1794,12 @@ class Connection(QtGui.QGraphicsObject):
         if option.state & QtGui.QStyle.State_MouseOver:
             self.is_hover = True
 
-        self.setToolTip('%s.%s (%s)' % (self.dagnode.name, self.name, self.dagconn.attr_type))
+        # simplified: flat circle, no label
+        if getattr(self.node, '_lod', LOD_FULL) != LOD_FULL:
+            painter.setPen(QtCore.Qt.NoPen)
+            painter.setBrush(QtGui.QBrush(self.bg_color))
+            painter.drawEllipse(QtCore.QPointF(0,0), self.draw_radius, self.draw_radius)
+            return
 
         # background
         gradient = QtGui.QLinearGradient(0, - self.draw_radius, 0, self.draw_radius)
@@ -1396,32 +1819,6 @@ class Connection(QtGui.QGraphicsObject):
             if self.isOutputConnection():
                 start_angle = start_angle * -1
             painter.drawPie(self.drawRect(), start_angle, 16*180)
-        
-        # label
-        label_color = self.label_color
-        if self._debug:
-            label_color = QtGui.QColor(*[170, 170, 170])
-        
-        # user attributes display in italics
-        italic = False
-        if self.dagnode.get_attr(self.name).user:
-            italic = True
-
-        label_font = QtGui.QFont(self.node._cfont, self.node._cfont_size, italic=italic)
-        self.label.hide()
-        if self.is_expanded:
-            self.label.setBrush(label_color)
-            self.label.setFont(label_font)
-            self.label.show()
-            self.label.setText(self.name)
-            # set the positions
-            if self.isInputConnection():
-                self.label.setPos(self.input_label_pos)
-
-            if self.isOutputConnection():
-                self.label.setPos(self.output_label_pos)
-
-            self.label.setToolTip(self.dagconn.desc)
 
         # visualize the bounding rect if _debug attribute is true
         if self._debug:
@@ -1431,17 +1828,71 @@ class Connection(QtGui.QGraphicsObject):
 
             if self.is_expanded:
                 painter.setPen(QtGui.QPen(QtGui.QColor(*[140, 140, 140]), 0.5, QtCore.Qt.DashLine))
-                self.label.setToolTip("(%.2f, %.2f)" % (self.label.pos().x(), self.label.pos().y()))
                 rect = self.label.sceneBoundingRect()
                 rect.moveTo(self.label.pos().x(), self.label.pos().y())
                 painter.drawRect(rect)
 
+    def updateLabel(self):
+        """
+        Update the label text, font & position. Called when the 
+        node layout changes.
+        """
+        self.setToolTip('%s.%s (%s)' % (self.dagnode.name, self.name, self.dagconn.attr_type))
+
+        # user attributes display in italics
+        italic = False
+        if self.dagnode.get_attr(self.name).user:
+            italic = True
+
+        self.label.setFont(QtGui.QFont(self.node._cfont, self.node._cfont_size, italic=italic))
+        self.label.setText(self.name)
+
+        # set the positions
+        if self.isInputConnection():
+            self.label.setPos(self.input_label_pos)
+
+        if self.isOutputConnection():
+            self.label.setPos(self.output_label_pos)
+
+        self.label.setToolTip(self.dagconn.desc)
+        if self._debug:
+            self.label.setToolTip("(%.2f, %.2f)" % (self.label.pos().x(), self.label.pos().y()))
+        self.updateLabelState()
+
+    def updateLabelState(self):
+        """
+        Update the label visibility & color. Called when the node layout, 
+        selection or level of detail changes.
+        """
+        # if the entire node is selected, ignore
+        self.is_selected = self.isSelected() and not self.node.isSelected()
+
+        label_color = self.label_color
+        if self._debug:
+            label_color = QtGui.QColor(*[170, 170, 170])
+
+        visible = self.is_expanded and getattr(self.node, '_lod', LOD_FULL) == LOD_FULL
+        if self.label.isVisible() != visible:
+            self.label.setVisible(visible)
+
+        if self.label.brush().color() != label_color:
+            self.label.setBrush(label_color)
+
+    def itemChange(self, change, value):
+        """
+        Update the label color when the connection is selected.
+        """
+        if change == self.ItemSelectedHasChanged:
+            self.updateLabelState()
+        return super(Connection, self).itemChange(change, value)
+
     def setDebug(self, value):
         """
         Set the widget debug mode.
         """
         if value != self._debug:
             self._debug = value
+            self.updateLabel()
 
 
 #- Builtins ----
@@ -1454,7 +1905,7 @@ class DefaultWidget(NodeWidget):
 
 
 
-class DotWidget(QtGui.QGraphicsObject): 
+class DotWidget(QtGui.QGraphicsObject, NodeCacheMixin): 
 
     widget_type    = 'dot'
     node_class     = 'dagnode' 
@@ -1485,6 +1936,7 @@ class DotWidget(QtGui.QGraphicsObject):
         self.is_selected     = False                  # indicates that the node is selected
         self.is_hover        = False                  # indicates that the node is under the cursor
         self._render_effects = True                   # enable fx
+        self._debug_lines    = []                     # edge direction lines (debug)
 
         # tags
         self._evaluate_tag   = False                  # indicates the node is set to "evaluate" (a la Houdini)
@@ -1508,12 +1960,18 @@ class DotWidget(QtGui.QGraphicsObject):
 
         # set node position
         self.setPos(QtCore.QPointF(self.dagnode.pos[0], self.dagnode.pos[1]))
+        self.dagnode.nodeLayoutChanged += self.nodeLayoutChangedEvent
+        self.dagnode.nodeAttributeUpdated += self.nodeAttributeUpdatedEvent
+        self.dagnode.nodeNameChanged += self.nodeNameChangedEvent
         self.drawConnections()
 
     def close(self):
         """
         Cleanup and delete the node and children.
         """
+        self.dagnode.nodeLayoutChanged.discard(self.nodeLayoutChangedEvent)
+        self.dagnode.nodeAttributeUpdated.discard(self.nodeAttributeUpdatedEvent)
+        self.dagnode.nodeNameChanged.discard(self.nodeNameChangedEvent)
         for conn_name in self.connections:
             conn_widget = self.connections.get(conn_name)
             if conn_widget:
@@ -1556,11 +2014,21 @@ class DotWidget(QtGui.QGraphicsObject):
             self.connections[conn_name] = conn_widget
             conn_widget.setZValue(-1)
     
-    def updateConnections(self, painter):
+    def nodeLayoutChangedEvent(self, dagnode, *args, **kwargs):
+        """
+        Called when the dag node's size or connections change.
+        """
+        self.prepareGeometryChange()
+        self.updateConnections()
+        self.invalidateCache()
+
+    def updateConnections(self):
         """
         Update the connection widget's rotation values
-        if they're connected to existing edges.
+        if they're connected to existing edges. Called when 
+        the node (or a connected node) moves, rather than during paint.
         """
+        self._debug_lines = []
         for conn_name in self.connections:
             conn_dag = self.dagnode.get_connection(conn_name)
             conn_widget = self.connections.get(conn_name)
@@ -1618,9 +2086,7 @@ class DotWidget(QtGui.QGraphicsObject):
 
                 # draw a label to show the angle
                 if conn_widget._debug:
-                    painter.setBrush(QtCore.Qt.NoBrush)
-                    painter.setPen(QtGui.QPen(conn_widget.bg_color, 0.5, QtCore.Qt.DashLine))
-                    painter.drawLine(line)
+                    self._debug_lines.append((line, conn_widget.bg_color))
                     qfont = QtGui.QFont("Monospace")
                     qfont.setPointSize(10)
                     conn_widget.debug_label = QtGui.QGraphicsTextItem(conn_widget)
@@ -1634,6 +2100,11 @@ class DotWidget(QtGui.QGraphicsObject):
                 # rotate the connector
                 conn_widget.setRotation(90+(float(angle)*-1) )
 
+            # the terminal moved, update the edge geometry
+            for edge in conn_widget.connected_edges():
+                edge.invalidateGeometry()
+        self.update()
+
     #- Attributes ----
     @property
     def id(self):
@@ -1709,8 +2180,18 @@ class DotWidget(QtGui.QGraphicsObject):
         if change == self.ItemPositionHasChanged:
             self.nodeChanged.emit(self)
             #self.updateConnections()
+        elif change == self.ItemSelectedHasChanged:
+            self.invalidateCache()
         return super(DotWidget, self).itemChange(change, value)
 
+    def hoverEnterEvent(self, event):
+        QtGui.QGraphicsObject.hoverEnterEvent(self, event)
+        self.invalidateCache()
+
+    def hoverLeaveEvent(self, event):
+        QtGui.QGraphicsObject.hoverLeaveEvent(self, event)
+        self.invalidateCache()
+
     def mouseDoubleClickEvent(self, event):
         """
         translate Y: height_expanded - base_height/2
@@ -1958,7 +2439,11 @@ class DotWidget(QtGui.QGraphicsObject):
         painter.setBrush(qbrush)
         painter.drawEllipse(self.boundingRect())
 
-        self.updateConnections(painter)
+        # edge direction lines (see DotWidget.updateConnections)
+        for line, color in self._debug_lines:
+            painter.setBrush(QtCore.Qt.NoBrush)
+            painter.setPen(QtGui.QPen(color, 0.5, QtCore.Qt.DashLine))
+            painter.drawLine(line)
 
     def setDebug(self, val):
         """
@@ -1973,6 +2458,7 @@ class DotWidget(QtGui.QGraphicsObject):
             for item in self.childItems():
                 if hasattr(item, '_debug'):
                     item._debug = val
+            self.updateConnections()
 
     @classmethod
     def ParentClasses(cls, p=None):
@@ -1990,7 +2476,7 @@ class DotWidget(QtGui.QGraphicsObject):
 
 
 
-class NoteWidget(QtGui.QGraphicsObject): 
+class NoteWidget(QtGui.QGraphicsObject, NodeCacheMixin): 
 
     widget_type    = 'note'
     node_class     = 'dagnode' 
@@ -2059,11 +2545,15 @@ class NoteWidget(QtGui.QGraphicsObject):
 
         # set node position
         self.setPos(QtCore.QPointF(self.dagnode.pos[0], self.dagnode.pos[1]))
+        self.dagnode.nodeAttributeUpdated += self.nodeAttributeUpdatedEvent
+        self.dagnode.nodeNameChanged += self.nodeNameChangedEvent
 
     def close(self):
         """
         Cleanup and delete the node and children.
         """
+        self.dagnode.nodeAttributeUpdated.discard(self.nodeAttributeUpdatedEvent)
+        self.dagnode.nodeNameChanged.discard(self.nodeNameChangedEvent)
         if self is not None:
             if self.scene() is not None:
                 self.scene().removeItem(self)
@@ -2122,6 +2612,10 @@ class NoteWidget(QtGui.QGraphicsObject):
         return False
 
     #- Events ----
+    def hoverEnterEvent(self, event):
+        QtGui.QGraphicsObject.hoverEnterEvent(self, event)
+        self.invalidateCache()
+
     def hoverMoveEvent(self,event):
         QtGui.QGraphicsItem.hoverMoveEvent(self, event)
         scene_pos = event.scenePos()
@@ -2132,6 +2626,7 @@ class NoteWidget(QtGui.QGraphicsObject):
     def hoverLeaveEvent(self,event):
         self.handle_selected = False
         QtGui.QGraphicsItem.hoverLeaveEvent(self, event)
+        self.invalidateCache()
 
     def mouseMoveEvent(self, event):
         """
@@ -2205,6 +2700,8 @@ class NoteWidget(QtGui.QGraphicsObject):
         if change == self.ItemPositionHasChanged:
             self.nodeChanged.emit(self)
             #self.updateConnections()
+        elif change == self.ItemSelectedHasChanged:
+            self.invalidateCache()
         return super(NoteWidget, self).itemChange(change, value)
 
     def boundingRect(self):
@@ -2482,6 +2979,7 @@ class NoteWidget(QtGui.QGraphicsObject):
             for item in self.childItems():
                 if hasattr(item, '_debug'):
                     item._debug = val
+            self.invalidateCache()
 
     @classmethod
     def ParentClasses(cls, p=None):
@@ -2558,6 +3056,10 @@ class NodeLabel(QtGui.QGraphicsObject):
         bounds = self.boundingRect()
         self.label.setPos(bounds.width()/2. - self.label.boundingRect().width()/2, 0)
 
+        # the label size changed, update the node
+        if hasattr(self.node, 'updateLayout'):
+            self.node.updateLayout()
+
     @property
     def is_editable(self):
         return self.label.textInteractionFlags() == QtCore.Qt.TextEditorInteraction
@@ -2618,9 +3120,10 @@ class NodeLabel(QtGui.QGraphicsObject):
         path.addPolygon(polyon)
         return path
 
-    def paint(self, painter, option, widget):
+    def updateLabel(self):
         """
-        Draw the label.
+        Update the label text, font & color from the node. Called 
+        when the node layout or style changes, rather than during paint.
         """
         label_color = self.node.label_color
         label_italic = self.node._font_italic
@@ -2629,25 +3132,35 @@ class NodeLabel(QtGui.QGraphicsObject):
         if not self.node.is_enabled:
             label_italic = True
 
-        #painter.setRenderHints(QtGui.QPainter.Antialiasing | QtGui.QPainter.TextAntialiasing)
         qfont = QtGui.QFont(self.node._font)
         qfont.setPointSize(self.node._font_size)
         qfont.setBold(self.node._font_bold)
         qfont.setItalic(label_italic)
-        self.label.setFont(qfont)
+        if self.label.font() != qfont:
+            self.label.setFont(qfont)
 
-        # debug
         if self._debug:
             label_color = QtGui.QColor(*[200, 200, 200])
+
+        if self.label.defaultTextColor() != label_color:
+            self.label.setDefaultTextColor(label_color)
+
+        # only update the text if the node was renamed
+        if self.text != self.node.dagnode.name:
+            self.text = self.node.dagnode.name
+
+    def paint(self, painter, option, widget):
+        """
+        Draw the label.
+        """
+        # debug
+        if self._debug:
             qpen = QtGui.QPen(QtGui.QColor(125,125,125))
             qpen.setWidthF(0.5)
             qpen.setStyle(QtCore.Qt.DashLine)
             painter.setPen(qpen)
             painter.drawPolygon(self.boundingRect())
 
-        self.label.setDefaultTextColor(label_color)
-        self.text = self.node.dagnode.name
-
 
 class NodeBackground(QtGui.QGraphicsItem):
     def __init__(self, parent=None, scene=None):
@@ -2669,9 +3182,41 @@ class NodeBackground(QtGui.QGraphicsItem):
 
     def boundingRect(self):
         if self.node:
-            return self.node.boundingRect()
+            rect = self.node.boundingRect()
+            if self.node._effects:
+                # include the drop shadow
+                r = self.node.shadow_radius
+                o = self.node.shadow_offset
+                rect = rect.adjusted(min(0, o - r), min(0, o - r), o + r, o + r)
+            return rect
         return QtCore.QRectF(0,0,0,0)
 
+    def shape(self):
+        path = QtGui.QPainterPath()
+        if self.node:
+            path.addRect(self.node.boundingRect())
+        return path
+
+    def updateShadow(self):
+        """
+        Call when the shadow is toggled, the bounding rect changes.
+        """
+        self.prepareGeometryChange()
+        self.update()
+
+    def drawShadow(self, painter, option):
+        """
+        Draw the cached drop shadow pixmap.
+        """
+        rect = self.node.boundingRect()
+        r = self.node.shadow_radius
+        o = self.node.shadow_offset
+        zoom = option.levelOfDetailFromTransform(painter.worldTransform())
+        pixmap = shadow_pixmap(rect.width(), rect.height(), self.node.shadow_color, radius=r, zoom=zoom)
+
+        target = QtCore.QRectF(rect.x() - r + o, rect.y() - r + o, int(rect.width()) + r*2, int(rect.height()) + r*2)
+        painter.drawPixmap(target, pixmap, QtCore.QRectF(pixmap.rect()))
+
     def labelLine(self, offset=0):
         """
         Draw a line for the node label area
@@ -2696,8 +3241,27 @@ class NodeBackground(QtGui.QGraphicsItem):
         """
         # setup colors
         bg_clr1 = self.node.bg_color
+
+        # low detail tiers: flat rect, or a plain box
+        lod = getattr(self.node, '_lod', LOD_FULL)
+        if lod != LOD_FULL and not self._debug:
+            painter.setRenderHint(QtGui.QPainter.Antialiasing, False)
+            if lod == LOD_FLAT:
+                painter.fillRect(self.boundingRect(), bg_clr1)
+                return
+
+            qpen = QtGui.QPen(self.node.pen_color)
+            qpen.setWidthF(self.pen_width)
+            painter.setPen(qpen)
+            painter.setBrush(QtGui.QBrush(bg_clr1))
+            painter.drawRect(self.boundingRect())
+            return
+
         bg_clr2 = bg_clr1.darker(150)
 
+        if self.node._effects:
+            self.drawShadow(painter, option)
+
         # background gradient
         gradient = QtGui.QLinearGradient(0, -self.node.height/2, 0, self.node.height/2)
         gradient.setColorAt(0, bg_clr1)
@@ -0,0 +1,625 @@
+#!/usr/bin/env python
+import math
+from collections import OrderedDict
+from PySide import QtCore, QtGui
+from SceneGraph.ui.node_widgets import EdgeBase
+
+
+# scene units added around the visible rect when realizing node widgets
+VIRTUAL_MARGIN      = 200.0
+
+# placeholder colors
+PLACEHOLDER_PEN     = [10, 10, 10, 255]
+PLACEHOLDER_EDGE    = [160, 160, 160, 255]
+
+# edge layer grid index cell size (scene units)
+EDGE_CELL_SIZE      = 256.0
+
+
+class WidgetPool(object):
+    """
+    Holds node widgets that have scrolled out of view in a virtualized
+    scene, keyed by dag node id. Widgets are reused when their node scrolls
+    back into view, and the least recently used widgets are destroyed once
+    the pool is full.
+
+    :param int max_size: maximum number of pooled widgets.
+    """
+    def __init__(self, max_size=512):
+
+        self.max_size       = max_size
+        self._widgets       = OrderedDict()
+
+    def __len__(self):
+        return len(self._widgets)
+
+    def __contains__(self, dag_id):
+        return dag_id in self._widgets
+
+    def put(self, widget):
+        """
+        Add a widget to the pool.
+
+        :param NodeWidget widget: node widget (removed from the scene).
+        """
+        dag_id = widget.dagnode.id
+        self._widgets.pop(dag_id, None)
+        self._widgets[dag_id] = widget
+
+        while len(self._widgets) > self.max_size:
+            dag_id, old = self._widgets.popitem(last=False)
+            old.close()
+
+    def take(self, dag_id):
+        """
+        Remove and return a pooled widget.
+
+        :param str dag_id: dag node id.
+
+        :returns: node widget (or None).
+        :rtype: NodeWidget
+        """
+        return self._widgets.pop(dag_id, None)
+
+    def discard(self, dag_id):
+        """
+        Destroy the pooled widget of a dag node (ie: when the node is 
+        deleted), so that it no longer references the dag node.
+
+        :param str dag_id: dag node id.
+
+        :returns: a widget was removed.
+        :rtype: bool
+        """
+        widget = self._widgets.pop(dag_id, None)
+        if widget is None:
+            return False
+        widget.close()
+        return True
+
+    def keys(self):
+        """
+        Returns the dag node ids of the pooled widgets.
+
+        :returns: list of dag node ids.
+        :rtype: list
+        """
+        return self._widgets.keys()
+
+    def clear(self):
+        """
+        Destroy all pooled widgets.
+        """
+        for widget in self._widgets.values():
+            widget.close()
+        self._widgets = OrderedDict()
+
+
+class PlaceholderLayer(QtGui.QGraphicsItem):
+    """
+    Draws lightweight placeholder rects (and edges) for the dag nodes of
+    a virtualized scene that don't currently have a widget. Nodes & edges
+    in the exposed rect are queried with :meth:`Graph.nodes_in_rect` and
+    :meth:`Graph.edges_in_rect`, which use the graph's layout store as a 
+    spatial index.
+
+    :param GraphicsScene scene: parent scene.
+    """
+    Type = QtGui.QGraphicsItem.UserType + 10
+
+    def __init__(self, scene):
+        QtGui.QGraphicsItem.__init__(self)
+
+        self._scene         = scene
+        self._rect          = QtCore.QRectF()
+
+        self.setFlag(QtGui.QGraphicsItem.ItemUsesExtendedStyleOption, True)
+        self.setAcceptedMouseButtons(QtCore.Qt.NoButton)
+        self.setAcceptHoverEvents(False)
+        self.setZValue(-2.0)
+
+    def type(self):
+        return self.Type
+
+    @property
+    def graph(self):
+        return self._scene.graph
+
+    def updateBounds(self):
+        """
+        Update the layer bounds from the graph node bounds.
+        """
+        bounds = self.graph.bounds()
+        rect = QtCore.QRectF()
+        if bounds is not None:
+            x1, y1, x2, y2 = bounds
+            rect = QtCore.QRectF(x1, y1, x2 - x1, y2 - y1).adjusted(-VIRTUAL_MARGIN, -VIRTUAL_MARGIN, VIRTUAL_MARGIN, VIRTUAL_MARGIN)
+
+        if rect != self._rect:
+            self.prepareGeometryChange()
+            self._rect = rect
+        self.update()
+
+    def boundingRect(self):
+        return QtCore.QRectF(self._rect)
+
+    def paint(self, painter, option, widget):
+        """
+        Draw placeholder rects, batched by node color.
+        """
+        rect = option.exposedRect
+        realized = self._scene._node_widgets
+
+        # edges without a widget, including edges crossing the rect
+        lines = []
+        for edge_id in self.graph.edges_in_rect(rect.left(), rect.top(), rect.right(), rect.bottom()):
+            if self._scene._hasEdge(edge_id):
+                continue
+
+            src = self.graph.dagnodes.get(edge_id[0])
+            dest = self.graph.dagnodes.get(edge_id[1])
+            if src is None or dest is None:
+                continue
+            lines.append(QtCore.QLineF(QtCore.QPointF(*src.pos), QtCore.QPointF(*dest.pos)))
+
+        if lines:
+            painter.setPen(QtGui.QPen(QtGui.QColor(*PLACEHOLDER_EDGE), 0))
+            painter.drawLines(lines)
+
+        dagnodes = self.graph.nodes_in_rect(rect.left(), rect.top(), rect.right(), rect.bottom())
+        if not dagnodes:
+            return
+
+        # node rects, grouped by color
+        rects = dict()
+        for dag in dagnodes:
+            if dag.id in realized:
+                continue
+
+            x, y = dag.pos
+            w, h = float(dag.width), float(dag.height)
+            rects.setdefault(tuple(dag.color), []).append(QtCore.QRectF(x - w/2, y - h/2, w, h))
+
+        painter.setPen(QtGui.QPen(QtGui.QColor(*PLACEHOLDER_PEN), 0))
+        for color, color_rects in rects.iteritems():
+            painter.setBrush(QtGui.QColor(*color))
+            painter.drawRects(color_rects)
+
+    def shape(self):
+        # placeholders are never picked, so that clicks fall through to the scene
+        return QtGui.QPainterPath()
+
+
+class LayerEdge(EdgeBase):
+    """
+    A graph edge drawn by the :class:`EdgeLayer`, rather than by its own 
+    graphics item. Layer edges are connected to the node terminals like 
+    edge widgets, so node & terminal updates invalidate them the same way. 
+    An :class:`~ui.node_widgets.EdgeWidget` is only created for the edge 
+    while it is hovered or selected (see :func:`EdgeLayer.realize`).
+
+    :param dict edge: nx edge attributes.
+    :param Connection source_item: source node connection.
+    :param Connection dest_item: destination node connection.
+    :param float weight: edge weight.
+    """
+    node_class = 'layer_edge'
+
+    def __init__(self, edge, source_item, dest_item, weight=1.0):
+        EdgeBase.__init__(self, edge, source_item, dest_item, weight=weight)
+        self.widget         = None                  # edge widget, while realized
+
+    @property
+    def is_valid(self):
+        """
+        Returns true if both terminals still exist.
+
+        :rtype: bool
+        """
+        return self.source_item() is not None and self.dest_item() is not None
+
+    def close(self):
+        """
+        Disconnect the edge and remove it from the layer.
+        """
+        self.breakConnections()
+        if self._layer is not None:
+            self._layer.removeEdge(self)
+
+
+class EdgeLayer(QtGui.QGraphicsItem):
+    """
+    Draws all of the scene edges in a single pass, as a few combined paths 
+    grouped by pen. Edges are stored as :class:`LayerEdge` objects rather 
+    than graphics items, and are picked through a grid index instead of 
+    the scene index. An edge widget is only created (and drawn 
+    individually) while its edge is hovered or selected.
+
+    :param GraphicsScene scene: parent scene.
+    """
+    Type = QtGui.QGraphicsItem.UserType + 11
+
+    def __init__(self, scene):
+        QtGui.QGraphicsItem.__init__(self)
+
+        self._scene         = scene
+        self._rect          = QtCore.QRectF()
+        self._edges         = dict()        # edge ids -> layer edge
+        self._cells         = dict()        # grid cell -> set of layer edges
+        self._edge_rects    = dict()        # layer edge -> indexed scene rect
+        self._realized      = set()         # layer edges with an edge widget
+        self._hover_edge    = None
+
+        self.setFlag(QtGui.QGraphicsItem.ItemUsesExtendedStyleOption, True)
+        self.setAcceptedMouseButtons(QtCore.Qt.NoButton)
+        self.setAcceptHoverEvents(False)
+        self.setZValue(-1.5)
+
+    def type(self):
+        return self.Type
+
+    def __len__(self):
+        return len(self._edges)
+
+    def __contains__(self, ids):
+        return ids in self._edges
+
+    #- Index ----
+    def _cellKeys(self, rect):
+        """
+        Returns the grid cells covered by a rect.
+
+        :param QtCore.QRectF rect: scene rect.
+
+        :returns: list of cell keys.
+        :rtype: list
+        """
+        x1 = int(math.floor(rect.left() / EDGE_CELL_SIZE))
+        x2 = int(math.floor(rect.right() / EDGE_CELL_SIZE))
+        y1 = int(math.floor(rect.top() / EDGE_CELL_SIZE))
+        y2 = int(math.floor(rect.bottom() / EDGE_CELL_SIZE))
+        return [(x, y) for x in range(x1, x2 + 1) for y in range(y1, y2 + 1)]
+
+    def _index(self, edge):
+        """
+        Add an edge to the grid index.
+
+        :param LayerEdge edge: layer edge.
+
+        :returns: indexed scene rect.
+        :rtype: QtCore.QRectF
+        """
+        if not edge.is_valid:
+            return QtCore.QRectF()
+
+        edge.updateGeometry()
+        rect = QtCore.QRectF(edge._rect)
+        self._edge_rects[edge] = rect
+        for key in self._cellKeys(rect):
+            self._cells.setdefault(key, set()).add(edge)
+
+        # grow the layer bounds
+        if not self._rect.contains(rect):
+            self.prepareGeometryChange()
+            self._rect = self._rect.united(rect)
+        return rect
+
+    def _unindex(self, edge):
+        """
+        Remove an edge from the grid index.
+
+        :param LayerEdge edge: layer edge.
+
+        :returns: previously indexed scene rect.
+        :rtype: QtCore.QRectF
+        """
+        rect = self._edge_rects.pop(edge, None)
+        if rect is None:
+            return QtCore.QRectF()
+
+        for key in self._cellKeys(rect):
+            cell = self._cells.get(key)
+            if cell is not None:
+                cell.discard(edge)
+                if not cell:
+                    self._cells.pop(key)
+        return rect
+
+    def edgesInRect(self, rect):
+        """
+        Returns the edges intersecting a scene rect.
+
+        :param QtCore.QRectF rect: scene rect.
+
+        :returns: set of layer edges.
+        :rtype: set
+        """
+        result = set()
+        for key in self._cellKeys(rect):
+            for edge in self._cells.get(key, ()):
+                if edge not in result and self._edge_rects[edge].intersects(rect):
+                    result.add(edge)
+        return result
+
+    def edgesInPath(self, path):
+        """
+        Returns the edges whose shape intersects a scene path 
+        (ie: a rubber band selection area).
+
+        :param QtGui.QPainterPath path: scene path.
+
+        :returns: list of layer edges.
+        :rtype: list
+        """
+        return [e for e in self.edgesInRect(path.boundingRect()) if e._shape.intersects(path)]
+
+    def edgeAt(self, pos):
+        """
+        Returns the edge under a scene position.
+
+        :param QtCore.QPointF pos: scene position.
+
+        :returns: layer edge (or None).
+        :rtype: LayerEdge
+        """
+        key = (int(math.floor(pos.x() / EDGE_CELL_SIZE)), int(math.floor(pos.y() / EDGE_CELL_SIZE)))
+        for edge in self._cells.get(key, ()):
+            if edge._shape.contains(pos):
+                return edge
+
+    #- Edges ----
+    def edges(self, realized=True):
+        """
+        Returns the layer edges.
+
+        :param bool realized: include edges that currently have a widget.
+
+        :returns: list of layer edges.
+        :rtype: list
+        """
+        if realized:
+            return self._edges.values()
+        return [e for e in self._edges.values() if e.widget is None]
+
+    def addEdge(self, edge, widget=None):
+        """
+        Add an edge to the layer.
+
+        :param LayerEdge edge: layer edge.
+        :param EdgeWidget widget: existing widget for the edge (ie: a selected edge).
+        """
+        edge._layer = self
+        self._edges[edge.ids] = edge
+        if widget is not None:
+            widget._layer_edge = edge
+            edge.widget = widget
+            self._realized.add(edge)
+        self.update(self._index(edge))
+
+    def removeEdge(self, edge):
+        """
+        Remove an edge from the layer, and delete its widget.
+
+        :param LayerEdge edge: layer edge.
+        """
+        if edge._layer is not self:
+            return
+
+        edge._layer = None
+        if self._edges.get(edge.ids) is edge:
+            self._edges.pop(edge.ids)
+
+        self._realized.discard(edge)
+        if self._hover_edge is edge:
+            self._hover_edge = None
+
+        widget = edge.widget
+        edge.widget = None
+        if widget is not None:
+            widget._layer_edge = None
+            widget.close()
+        self.update(self._unindex(edge))
+
+    def removeMissing(self, network):
+        """
+        Remove the edges that are no longer in the graph.
+
+        :param networkx.MultiDiGraph network: graph network.
+        """
+        for edge in self._edges.values():
+            if not edge.is_valid or not network.has_edge(*edge.ids):
+                edge.close()
+
+    def edgeChanged(self, edge):
+        """
+        Re-index an edge whose geometry has changed.
+
+        :param LayerEdge edge: layer edge.
+        """
+        self.update(self._unindex(edge))
+        self.update(self._index(edge))
+
+    def clear(self):
+        """
+        Remove all edges from the layer. Returns the edge widgets that 
+        were realized, and disconnects the remaining edges.
+
+        :returns: list of edge widgets.
+        :rtype: list
+        """
+        widgets = []
+        for edge in self._edges.values():
+            edge._layer = None
+            widget = edge.widget
+            edge.widget = None
+            if widget is not None:
+                widget._layer_edge = None
+                widgets.append(widget)
+            else:
+                edge.breakConnections()
+
+        self._edges = dict()
+        self._cells = dict()
+        self._edge_rects = dict()
+        self._realized = set()
+        self._hover_edge = None
+        self.update()
+        return widgets
+
+    #- Widgets ----
+    def realize(self, edge):
+        """
+        Create an edge widget for a layer edge. The layer edge is 
+        disconnected from its terminals while the widget exists.
+
+        :param LayerEdge edge: layer edge.
+
+        :returns: edge widget (or None).
+        :rtype: EdgeWidget
+        """
+        if edge.widget is not None:
+            return edge.widget
+
+        if not edge.is_valid:
+            return
+
+        src_conn, dest_conn = edge.source_item(), edge.dest_item()
+        edge.breakConnections()
+        widget = self._scene._newEdgeWidget(edge.edge_data, src_conn, dest_conn)
+        if widget is None:
+            edge.connect_terminal(src_conn)
+            edge.connect_terminal(dest_conn)
+            return
+
+        widget._debug = edge._debug
+        widget.edge_type = edge.edge_type
+        widget._layer_edge = edge
+        edge.widget = widget
+        self._realized.add(edge)
+        self.update(self._edge_rects.get(edge, QtCore.QRectF()))
+        return widget
+
+    def release(self, edge):
+        """
+        Delete the widget of a layer edge, and draw the edge in the layer again.
+
+        :param LayerEdge edge: layer edge.
+        """
+        self._realized.discard(edge)
+        widget = edge.widget
+        if widget is None:
+            return
+
+        edge.widget = None
+        widget._layer_edge = None
+        src_conn, dest_conn = widget.source_item(), widget.dest_item()
+        widget.close()
+
+        if src_conn is None or dest_conn is None:
+            self.removeEdge(edge)
+            return
+
+        edge.connect_terminal(src_conn)
+        edge.connect_terminal(dest_conn)
+        edge.invalidateGeometry()
+        self.edgeChanged(edge)
+
+    def setHoverEdge(self, edge):
+        """
+        Realize the hovered edge (and release the previous one, 
+        unless it's selected).
+
+        :param LayerEdge edge: layer edge (or None).
+
+        :returns: hovered edge widget.
+        :rtype: EdgeWidget
+        """
+        if edge is self._hover_edge:
+            return edge.widget if edge is not None else None
+
+        old = self._hover_edge
+        self._hover_edge = edge
+        widget = None
+        if edge is not None:
+            widget = self.realize(edge)
+
+        if old is not None and old.widget is not None and not old.widget.isSelected():
+            self.release(old)
+        return widget
+
+    def selectEdges(self, path):
+        """
+        Select the edges in a scene path (ie: a rubber band 
+        selection area), realizing their widgets.
+
+        :param QtGui.QPainterPath path: scene path.
+
+        :returns: selected edge widgets.
+        :rtype: list
+        """
+        widgets = []
+        for edge in self.edgesInPath(path):
+            widget = self.realize(edge)
+            if widget is not None:
+                widget.setSelected(True)
+                widgets.append(widget)
+        return widgets
+
+    def selectionChangedEvent(self):
+        """
+        Release the edge widgets that are no longer selected or hovered.
+        """
+        for edge in list(self._realized):
+            if edge is self._hover_edge:
+                continue
+            if edge.widget is None or not edge.widget.isSelected():
+                self.release(edge)
+
+    #- Drawing ----
+    def boundingRect(self):
+        return QtCore.QRectF(self._rect)
+
+    def shape(self):
+        # the layer is never picked, see EdgeLayer.edgeAt
+        return QtGui.QPainterPath()
+
+    def paint(self, painter, option, widget):
+        """
+        Draw the edges without widgets, batched by pen.
+        """
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+
+        groups = dict()
+        for edge in self.edgesInRect(option.exposedRect):
+            if edge.widget is not None:
+                continue
+
+            color = edge._l_color
+            if edge._debug:
+                color = [200, 200, 200, 125]
+
+            key = (tuple(color), float(edge.weight))
+            if key not in groups:
+                groups[key] = (QtGui.QPainterPath(), QtGui.QPainterPath())
+            lines, arrows = groups.get(key)
+
+            if edge.edge_type == 'bezier':
+                lines.addPath(edge.bezier_path)
+            else:
+                line = edge._line
+                lines.moveTo(line.p1())
+                lines.lineTo(line.p2())
+
+            if edge._arrowhead is not None:
+                arrows.addPolygon(edge._arrowhead)
+                arrows.closeSubpath()
+
+        for (color, weight), (lines, arrows) in groups.iteritems():
+            pen = QtGui.QPen(QtGui.QColor(*color))
+            pen.setWidthF(weight)
+            painter.setPen(pen)
+            painter.setBrush(QtCore.Qt.NoBrush)
+            painter.drawPath(lines)
+
+            painter.setBrush(QtGui.QColor(*color))
+            painter.drawPath(arrows)
@@ -184,8 +184,7 @@ def is_dict(s):
     """
     Returns true if the object is a dict type.
     """
-    from collections import OrderedDict
-    return type(s) in [dict, OrderedDict]
+    return isinstance(s, dict)
 
 
 def is_newer(file1, file2):